@@ -0,0 +1,53 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Images and sounds loaded once for the whole program. Modes and new apps
+# made when the game restarts all get the same objects from here, so no file
+# is read, scaled or turned into a PhotoImage twice. PhotoImages stay usable
+# across apps since cmu_112_graphics keeps one Tk root for every app.
+
+# CITATION: Referenced 15-112 website for caching technique:
+# https://www.cs.cmu.edu/~112/notes/notes-animations-part2.html#imageMethods
+
+# CITATION: Referenced simpleaudio docs https://simpleaudio.readthedocs.io/en/latest/
+
+from PIL import Image, ImageTk
+import simpleaudio as sa
+
+# Images by path, scaled images by (path, scale, resample) and sounds by path.
+images = dict()
+scaledImages = dict()
+sounds = dict()
+
+# Returns the image at path, only read from the file the first time.
+def loadImage(path):
+    if path not in images:
+        image = Image.open(path)
+        image.load()
+        images[path] = image
+    return images[path]
+
+# Returns the image at path scaled like App.scaleImage does, with its
+# PhotoImage in cachedPhotoImage. Images returned are shared, so they
+# shouldn't be changed.
+def getImage(path, scale=1, resample=Image.NEAREST):
+    key = (path, scale, resample)
+    if key not in scaledImages:
+        image = loadImage(path)
+        image = image.resize((round(image.width*scale),
+                              round(image.height*scale)), resample=resample)
+        image.cachedPhotoImage = ImageTk.PhotoImage(image)
+        scaledImages[key] = image
+    return scaledImages[key]
+
+# Returns the image at path scaled to be width pixels wide.
+def getImageWithWidth(path, width, resample=Image.NEAREST):
+    return getImage(path, width/loadImage(path).size[0], resample)
+
+# Returns simpleaudio WaveObject for the wave file at path.
+def getSound(path):
+    if path not in sounds:
+        sounds[path] = sa.WaveObject.from_wave_file(path)
+    return sounds[path]
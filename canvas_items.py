@@ -0,0 +1,87 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Keeps canvas items between frames for modes with retainCanvas set (see
+# cmu_112_graphics). Each thing drawn has a key, and drawing it again only
+# moves or changes the item that is already on the canvas, and only if
+# something about it changed. Items whose key isn't drawn in a frame are
+# deleted at the end of it. The first value of each key is the item's layer,
+# and layers stay stacked in the order they are drawn in.
+
+# CITATION: Referenced Tkinter canvas docs
+# https://tkdocs.com/shipman/canvas-methods.html
+
+class CanvasItems(object):
+    def __init__(self):
+        # Maps key to [item id, coords, options].
+        self.items = dict()
+        self.drawn = set([])
+        self.layers = []
+        self.created = False
+
+        # Canvas calls made last frame and items it kept without any.
+        self.lastCalls = 0
+        self.lastKept = 0
+        self.calls = 0
+        self.kept = 0
+
+    # Forgets every item, after the canvas was cleared.
+    def clear(self):
+        self.items = dict()
+
+    # Draws an item of the given kind ("oval", "image", ...) at coords with
+    # options, like canvas.create_<kind>(*coords, **options) would.
+    def draw(self, canvas, key, kind, coords, options):
+        if key in self.drawn: return
+        self.drawn.add(key)
+        layer = key[0]
+        if layer not in self.layers: self.layers.append(layer)
+
+        item = self.items.get(key)
+        if item == None:
+            create = getattr(canvas, "create_" + kind)
+            itemId = create(*coords, tags=layer, **options)
+            self.items[key] = [itemId, coords, options]
+            self.created = True
+            self.calls += 1
+            return
+        changed = False
+        if coords != item[1]:
+            canvas.coords(item[0], *coords)
+            item[1] = coords
+            changed = True
+        if options != item[2]:
+            newOptions = dict()
+            for option in options:
+                if item[2].get(option) != options[option]:
+                    newOptions[option] = options[option]
+            canvas.itemconfigure(item[0], **newOptions)
+            item[2] = options
+            changed = True
+        if changed: self.calls += 1
+        else: self.kept += 1
+
+    # Deletes items that weren't drawn this frame and puts the layers back
+    # in order if any items were made.
+    def finish(self, canvas):
+        for key in list(self.items.keys()):
+            if key not in self.drawn:
+                canvas.delete(self.items.pop(key)[0])
+                self.calls += 1
+        if self.created:
+            for layer in self.layers:
+                canvas.tag_raise(layer)
+                self.calls += 1
+
+        self.lastCalls, self.lastKept = self.calls, self.kept
+        self.calls = self.kept = 0
+        self.drawn = set([])
+        self.layers = []
+        self.created = False
+
+    # Returns (items on the canvas, canvas calls last frame, items kept
+    # without any call last frame).
+    def getStats(self):
+        return (len(self.items), self.lastCalls, self.lastKept)
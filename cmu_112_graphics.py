@@ -142,7 +142,7 @@ LAST_UPDATED  = datetime.date(year=2020, month=2, day=24)
 
 from tkinter import *
 from tkinter import messagebox, simpledialog, filedialog
-import inspect, copy, traceback
+import inspect, copy, traceback, time
 import sys, os
 from io import BytesIO
 
@@ -167,6 +167,18 @@ else:
 try: import requests
 except ModuleNotFoundError: failedImport('requests')
 
+# Attributes of each object, without looking inside them. Used for the
+# 'shallow' MVC check, which only catches attributes being reassigned.
+def getShallowState(objs):
+    return [dict(obj.__dict__) for obj in objs]
+
+def isSameShallowState(state1, state2):
+    for (dict1, dict2) in zip(state1, state2):
+        if (dict1.keys() != dict2.keys()): return False
+        for key in dict1:
+            if (dict1[key] is not dict2[key]): return False
+    return True
+
 def getHash(obj):
     # This is used to detect MVC violations in redrawAll
     # @TODO: Make this more robust and efficient
@@ -186,11 +198,13 @@ class WrappedCanvas(Canvas):
     def __init__(wrappedCanvas, app):
         wrappedCanvas.loggedDrawingCalls = [ ]
         wrappedCanvas.logDrawingCalls = True
+        wrappedCanvas.checkDrawing = True
         wrappedCanvas.inRedrawAll = False
         wrappedCanvas.app = app
         super().__init__(app._root, width=app.width, height=app.height)
 
     def log(self, methodName, args, kwargs):
+        if (not self.checkDrawing): return
         if (not self.inRedrawAll):
             self.app._mvcViolation('you may not use the canvas (the view) outside of redrawAll')
         if (self.logDrawingCalls):
@@ -234,6 +248,9 @@ class App(object):
     version = f'{majorVersion}.{minorVersion}'
     lastUpdated = LAST_UPDATED
     _theRoot = None # singleton Tkinter root object
+    # If True, the canvas is not cleared before redrawAll, so items drawn in
+    # earlier frames stay until they are moved, changed or deleted.
+    retainCanvas = False
 
     ####################################
     # User Methods:
@@ -250,18 +267,29 @@ class App(object):
     def mouseDragged(app, event): pass  # use event.x and event.y
     def timerFired(app): pass           # respond to timer events
     def sizeChanged(app): pass          # respond to window size changes
+    def canvasCleared(app): pass        # retained canvas items were deleted
 
     ####################################
     # Implementation:
     ####################################
 
-    def __init__(app, width=300, height=300, x=0, y=0, title=None, autorun=True, mvcCheck=True, logDrawingCalls=True):
+    # mvcCheck is True (hash the whole model), 'shallow' (only check that
+    # attributes of the app and active mode weren't reassigned) or False, and
+    # is only done every mvcCheckEvery redraws. production turns off every
+    # check and all logging on the draw path.
+    def __init__(app, width=300, height=300, x=0, y=0, title=None, autorun=True, mvcCheck=True, logDrawingCalls=True, mvcCheckEvery=1, production=False):
         app.winx, app.winy, app.width, app.height = x, y, width, height
         app.timerDelay = 100     # milliseconds
         app.mouseMovedDelay = 50 # ditto
         app._title = title
+        if (production): mvcCheck = logDrawingCalls = False
+        app._production = production
         app._mvcCheck = mvcCheck
+        app._mvcCheckEvery = mvcCheckEvery
         app._logDrawingCalls = logDrawingCalls
+        app._redrawCount = 0
+        app._redrawTime = app._mvcCheckTime = 0
+        app._loggedCallCount = 0
         app._running = app._paused = False
         app._mousePressedOutsideWindow = False
         if autorun: app.run()
@@ -371,6 +399,9 @@ class App(object):
                 app.showMessage(f'Exception: {e}\nClick ok then see console for details.')
         return m
 
+    def _getCanvasRetainer(app):
+        return app if app.retainCanvas else None
+
     def _methodIsOverridden(app, methodName):
         return (getattr(type(app), methodName) is not getattr(App, methodName))
 
@@ -378,25 +409,59 @@ class App(object):
         app._running = False
         raise Exception('MVC Violation: ' + errMsg)
 
+    # Objects whose attributes make up the model, for the shallow MVC check.
+    def _getModelObjects(app):
+        return [app]
+
+    def _getModelState(app, mvcCheck):
+        if (not mvcCheck): return None
+        elif (mvcCheck == 'shallow'): return getShallowState(app._getModelObjects())
+        else: return getHash(app)
+
+    def _isSameModelState(app, mvcCheck, state1, state2):
+        if (mvcCheck == 'shallow'): return isSameShallowState(state1, state2)
+        else: return state1 == state2
+
+    # Returns (redraws, average ms per redraw, average ms per redraw spent on
+    # MVC checks, average draw calls logged per redraw).
+    def getRedrawStats(app):
+        redraws = max(1, app._redrawCount)
+        return (app._redrawCount, app._redrawTime * 1000 / redraws,
+                app._mvcCheckTime * 1000 / redraws, app._loggedCallCount / redraws)
+
     @_safeMethod
     def _redrawAllWrapper(app):
         if (not app._running): return
         if ('deferredRedrawAll' in app._afterIdMap): return # wait for pending call
+        startTime = time.perf_counter()
+        app._redrawCount += 1
+        mvcCheck = app._mvcCheck if (app._redrawCount % app._mvcCheckEvery == 0) else False
         app._canvas.inRedrawAll = True
-        app._canvas.delete(ALL)
-        width,outline = (10,'red') if app._paused else (0,'white')
-        app._canvas.create_rectangle(0, 0, app.width, app.height, fill='white', width=width, outline=outline)
+        retainer = app._getCanvasRetainer()
+        if (retainer is None) or (retainer is not app._canvasRetainer):
+            app._canvas.delete(ALL)
+            width,outline = (10,'red') if app._paused else (0,'white')
+            app._canvas.create_rectangle(0, 0, app.width, app.height, fill='white', width=width, outline=outline)
+            if (app._canvasRetainer is not None): app._canvasRetainer.canvasCleared()
+            app._canvasRetainer = retainer
         app._canvas.loggedDrawingCalls = [ ]
         app._canvas.logDrawingCalls = app._logDrawingCalls
-        hash1 = getHash(app) if app._mvcCheck else None
+        checkStartTime = time.perf_counter()
+        state1 = app._getModelState(mvcCheck)
+        app._mvcCheckTime += time.perf_counter() - checkStartTime
         try:
             app.redrawAll(app._canvas)
-            hash2 = getHash(app) if app._mvcCheck else None
-            if (hash1 != hash2):
+            checkStartTime = time.perf_counter()
+            state2 = app._getModelState(mvcCheck)
+            isSame = app._isSameModelState(mvcCheck, state1, state2)
+            app._mvcCheckTime += time.perf_counter() - checkStartTime
+            if (not isSame):
                 app._mvcViolation('you may not change the app state (the model) in redrawAll (the view)')
         finally:
             app._canvas.inRedrawAll = False
+        app._loggedCallCount += len(app._canvas.loggedDrawingCalls)
         app._canvas.update()
+        app._redrawTime += time.perf_counter() - startTime
 
     def _deferredMethodCall(app, afterId, afterDelay, afterFn, replace=False):
         def afterFnWrapper():
@@ -587,6 +652,7 @@ class App(object):
         app._lastMousePosn = (-1, -1)
         app._lastWindowDims= None # set in sizeChangedWrapper
         app._afterIdMap = dict()
+        app._canvasRetainer = None # app or mode whose items are on the canvas
         # create the singleton root window
         if (App._theRoot is None):
             App._theRoot = Tk()
@@ -605,6 +671,7 @@ class App(object):
         app.updateTitle()
         # create the canvas
         root.canvas = app._canvas = WrappedCanvas(app)
+        app._canvas.checkDrawing = not app._production
         app._canvas.pack(fill=BOTH, expand=YES)
         # initialize, start the timer, and launch the app
         app._running = True
@@ -687,6 +754,12 @@ class ModalApp(App):
 
     def redrawAll(app, canvas):
         if (app._activeMode != None): app._activeMode.redrawAll(canvas)
+    def _getModelObjects(app):
+        if (app._activeMode == None): return [app]
+        return [app, app._activeMode]
+    def _getCanvasRetainer(app):
+        mode = app._activeMode
+        return mode if ((mode != None) and mode.retainCanvas) else None
     def appStarted(app):
         if (app._activeMode != None): app.startActiveMode()
     def appStopped(app):
@@ -0,0 +1,107 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Finding walls near a point by looking at the board cells around it, so
+# collision checks cost the same no matter how many walls the level has.
+
+import math
+
+# Returns (startRow, endRow, startCol, endCol) of the cells overlapped by the
+# box from (x0, y0) to (x1, y1) in pixels, limited to a board with rows rows
+# and cols columns. End row and col are included.
+def getCellsInBox(x0, y0, x1, y1, cellSize, rows, cols):
+    startRow = max(0, math.floor(y0/cellSize))
+    endRow = min(rows - 1, math.floor(y1/cellSize))
+    startCol = max(0, math.floor(x0/cellSize))
+    endCol = min(cols - 1, math.floor(x1/cellSize))
+    return startRow, endRow, startCol, endCol
+
+# Returns list of (row, col) for every wall on board in a cell that overlaps
+# the square of half-width reach around (x, y).
+def getWallsNear(board, x, y, reach, cellSize, obstacle="o"):
+    startRow, endRow, startCol, endCol = getCellsInBox(x - reach, y - reach,
+                                                       x + reach, y + reach,
+                                                       cellSize, len(board),
+                                                       len(board[0]))
+    walls = []
+    for row in range(startRow, endRow + 1):
+        for col in range(startCol, endCol + 1):
+            if board[row][col] == obstacle:
+                walls.append((row, col))
+    return walls
+
+# Returns True if the square of half-width r around (x, y) overlaps the
+# square of half-width squareR around (squareX, squareY). Squares exactly
+# lined up in x or y don't count as overlapping.
+def rectsOverlap(x, y, r, squareX, squareY, squareR):
+    xCollides = False
+    yCollides = False
+    if x < squareX:
+        if squareX - x < squareR + r:
+            xCollides = True
+    elif x > squareX:
+        if x - squareX < squareR + r:
+            xCollides = True
+
+    if y < squareY:
+        if squareY - y < squareR + r:
+            yCollides = True
+    elif y > squareY:
+        if y - squareY < squareR + r:
+            yCollides = True
+
+    return xCollides and yCollides
+
+# Cuts the move (dx, dy) of a square of half-width r at (x, y) short so it
+# stops at walls, and returns the new (dx, dy). For each wall, if moving in x
+# would hit it, dx stops at the wall; otherwise if moving in y would hit it,
+# dy does. Only walls within a cell of the move are looked at. The result can
+# depend on the order walls are checked in when they meet at a corner, so
+# walls are sorted by order (a dict of wall cell to number) if it is given.
+def slide(board, x, y, r, dx, dy, cellSize, order=None, obstacle="o"):
+    squareR = cellSize/2
+    reach = r + abs(dx) + abs(dy) + cellSize
+    walls = getWallsNear(board, x, y, reach, cellSize, obstacle)
+    if order != None:
+        walls.sort(key=lambda cell: order[cell])
+    for row, col in walls:
+        obX, obY = (col+.5)*cellSize, (row+.5)*cellSize
+        if rectsOverlap(x+dx, y, r, obX, obY, squareR):
+            if dx > 0:
+                dx = min(dx, (obX-squareR)-(x+r))
+            else:
+                dx = max(dx, (obX+squareR)-(x-r))
+        elif rectsOverlap(x, y+dy, r, obX, obY, squareR):
+            if dy > 0:
+                dy = min(dy, (obY-squareR)-(y+r))
+            else:
+                dy = max(dy, (obY+squareR)-(y-r))
+    return dx, dy
+
+# Groups items by the cell they're in so the ones near a cell can be found
+# without looking at all of them. Meant to be rebuilt every tick.
+class SpatialHash(object):
+    def __init__(self, cellSize):
+        self.cellSize = cellSize
+        # Maps (row, col) to list of items in that cell.
+        self.cells = dict()
+        # Biggest radius of any item added.
+        self.maxR = 0
+
+    # Adds item with radius r at (x, y).
+    def add(self, item, x, y, r=0):
+        cell = (int(y // self.cellSize), int(x // self.cellSize))
+        self.cells[cell] = self.cells.get(cell, [])
+        self.cells[cell].append(item)
+        self.maxR = max(self.maxR, r)
+
+    # Returns list of items in cell (row, col) and the cells up to size cells
+    # away from it.
+    def getNearby(self, row, col, size=1):
+        items = []
+        for drow in range(-size, size + 1):
+            for dcol in range(-size, size + 1):
+                items += self.cells.get((row + drow, col + dcol), [])
+        return items
@@ -0,0 +1,108 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Player collision test
+# Replays recorded movement keys through the way GameMode.movePlayer used to
+# check every obstacle and through collision.slide, and checks the player
+# ends up in exactly the same place every tick.
+
+import collision
+
+# One letter per tick: w, a, s, d, or q, e, z, c for diagonals, or . for none.
+INPUTS = ("d" * 40 + "c" * 25 + "s" * 30 + "z" * 40 + "a" * 35 + "q" * 30 +
+          "." * 12 + "w" * 45 + "e" * 50 + "d" * 20 + "c" * 60 + "." * 5 +
+          "z" * 25 + "s" * 15 + "q" * 70 + "e" * 15 + "a" * 25 + "w" * 10 +
+          "dcsz" * 30 + "qe" * 40 + "." * 8 + "c" * 80 + "ad" * 25)
+
+DIRECTIONS = {"w": (0, -1), "a": (-1, 0), "s": (0, 1), "d": (1, 0),
+              "q": (-1, -1), "e": (1, -1), "z": (-1, 1), "c": (1, 1),
+              ".": (0, 0)}
+
+# Returns map with walls around the edge, pillars and a corner pocket.
+def setup():
+    board = [[""] * 12 for i in range(10)]
+    for row in range(10):
+        for col in range(12):
+            if row == 0 or col == 0 or row == 9 or col == 11:
+                board[row][col] = "o"
+    for row, col in [(4, 5), (4, 6), (4, 7), (5, 7), (2, 3), (7, 2), (7, 3),
+                     (6, 9), (2, 8), (3, 9)]:
+        board[row][col] = "o"
+    return board
+
+# Old Entity.rectCollidesWithObstacle.
+def rectCollidesOld(r, playerX, playerY, squareX, squareY, squareR):
+    xCollides = False
+    yCollides = False
+    if playerX < squareX:
+        if squareX - playerX < squareR + r:
+            xCollides = True
+    elif playerX > squareX:
+        if playerX - squareX < squareR + r:
+            xCollides = True
+
+    if playerY < squareY:
+        if squareY - playerY < squareR + r:
+            yCollides = True
+    elif playerY > squareY:
+        if playerY - squareY < squareR + r:
+            yCollides = True
+
+    return xCollides and yCollides
+
+# Old GameMode.movePlayer loop over every obstacle.
+def slideOld(obstacles, x, y, r, dx, dy, cellSize):
+    for (row, col) in obstacles:
+        obX, obY = (col+.5)*cellSize, (row+.5)*cellSize
+        result1 = rectCollidesOld(r, x+dx, y, obX, obY, cellSize/2)
+        result2 = rectCollidesOld(r, x, y+dy, obX, obY, cellSize/2)
+        if result1:
+            if dx > 0:
+                dx = min(dx, (obX-cellSize/2)-(x+r))
+            else:
+                dx = max(dx, (obX+cellSize/2)-(x-r))
+        elif result2:
+            if dy > 0:
+                dy = min(dy, (obY-cellSize/2)-(y+r))
+            else:
+                dy = max(dy, (obY+cellSize/2)-(y-r))
+    return dx, dy
+
+# Plays INPUTS from (x, y) with both and checks they match. timeScale
+# changes like in the game so moves aren't all the same length.
+def replay(board, x, y, cellSize=50, r=20, speed=10):
+    obstacles = set([])
+    for row in range(len(board)):
+        for col in range(len(board[0])):
+            if board[row][col] == "o": obstacles.add((row, col))
+    order = dict()
+    for cell in obstacles:
+        order[cell] = len(order)
+
+    oldX, oldY = x, y
+    timeScale = 1
+    for key in INPUTS:
+        keyX, keyY = DIRECTIONS[key]
+        mag = (keyX**2 + keyY**2)**.5
+        if mag != 0: a = 1/mag
+        else: a = 1
+        dx, dy = a*keyX*speed*timeScale, a*keyY*speed*timeScale
+        oldDx, oldDy = slideOld(obstacles, oldX, oldY, r, dx, dy, cellSize)
+        newDx, newDy = collision.slide(board, x, y, r, dx, dy, cellSize, order)
+        oldX, oldY = oldX + oldDx, oldY + oldDy
+        x, y = x + newDx, y + newDy
+        assert((x, y) == (oldX, oldY))
+        if mag == 0: timeScale = max(.1, timeScale - .1)
+        else: timeScale = min(1, timeScale + .1)
+    return x, y
+
+def test():
+    board = setup()
+    for row, col in [(1, 1), (5, 5), (8, 10), (3, 4)]:
+        replay(board, (col+.5)*50, (row+.5)*50)
+    # Player bigger than half a cell, and not centered in a cell.
+    replay(board, 130, 90, r=30, speed=15)
+
+test()
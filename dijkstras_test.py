@@ -10,6 +10,8 @@
 # CITATION: print2dList and helper from 112 course website 
 # https://www.cs.cmu.edu/~112/notes/notes-2d-lists.html#printing
 
+import pathfinding
+
 # Helper function for print2dList.
 # This finds the maximum length of the string
 # representation of any item in the 2d list
@@ -71,70 +73,7 @@ def setup():
 
 # Takes 2d list of empty spaces (_) and obstacles (#)
 def dijkstras(board, start, end):
-    distances = [[-1] * len(board[0]) for i in range(len(board))]
-    distances[start[0]][start[1]] = 0
-    paths = [[0] * len(board[0]) for i in range(len(board))]
-
-    unvisited = set([])
-    for i in range(len(distances)):
-        for j in range(len(distances[0])):
-            if board[i][j] != "#":
-                unvisited.add((i, j))
-    current = start
-    
-    while True:
-        result = doStep(board, distances, paths, unvisited, end)
-        if result or result == False: break
-    if not result: return False
-    return result, distances, getPath(board, distances, paths, start, end), paths
-
-# Determines current cell, then visits cell.
-def doStep(board, distances, paths, unvisited, end):
-    
-    # Determine current cell.
-    shortest = None
-    shortestDistance = -1
-    for row, col in unvisited:
-        if distances[row][col] != -1:
-            if shortest == None or distances[row][col] < shortestDistance:
-                shortest = (row, col)
-                shortestDistance = distances[row][col]
-    current = shortest
-    if current == None: return False
-
-    visitCell(board, distances, paths, unvisited, current)
-    if end not in unvisited: return True
-    elif len(unvisited) == 0: return False
-
-# Marks all neighbors of a given cell with distances from the start.
-def visitCell(board, distances, paths, unvisited, current):
-    # Check up, down, left right
-    row, col = current
-    for drow in (-1, 0, 1):
-        for dcol in (-1, 0, 1):
-            newRow, newCol = row + drow, col + dcol
-            if (abs(drow) + abs(dcol) == 1 and 0 <= newRow < len(board) and
-                0 <= newCol < len(board[0])):
-                if ((distances[newRow][newCol] == -1 or 
-                    distances[newRow][newCol] > distances[row][col] + 1) and
-                    board[newRow][newCol] != "#"):
-
-                    distances[newRow][newCol] = distances[row][col] + 1
-                    paths[newRow][newCol] = (-drow, -dcol)
-                    
-    unvisited.remove(current)
-
-# CHECK FOR DIAGONAL ISSUE
-def getPath(board, distance, paths, start, end):
-    path = [end]
-    row, col = end
-    while True:
-        drow = paths[row][col][0]
-        dcol = paths[row][col][1]
-        row += drow
-        col += dcol
-        path = [(row, col)] + path
-        if start == (row, col): return path
+    return pathfinding.findPath(board, start, end, "#")
 
 def test():
     board = setup()
@@ -147,6 +86,10 @@ def test():
         print("No path found")
         return
     path = result[2]
+    assert(len(path) == result[1][end[0]][end[1]] + 1 == 20)
+
+    # A* should find a path of the same length.
+    assert(len(pathfinding.aStar(board, start, end, "#")[2]) == len(path))
     for i in range(len(path)):
         step = path[i]
         board[step[0]][step[1]] = i
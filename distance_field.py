@@ -0,0 +1,157 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Signed distance from the walls, sampled a few times per cell when the level
+# loads. Looking up how far a point is from the nearest wall is then a few
+# array reads, whatever the number of walls. Distances are negative inside
+# walls, and the gradient points away from the nearest wall, which is the way
+# to push something out of one.
+
+# CITATION: Referenced NumPy docs https://numpy.org/doc/stable/reference/index.html
+
+# CITATION: Referenced bilinear interpolation from
+# https://en.wikipedia.org/wiki/Bilinear_interpolation
+
+import math
+import numpy as np
+
+# Samples per cell along each side.
+RESOLUTION = 5
+
+# Distances are only worked out up to this many cells. Anything further away
+# is stored as this distance.
+MAX_DISTANCE = 2
+
+# Fields bigger than this aren't made.
+MAX_BYTES = 4 * 1024 * 1024
+
+class DistanceField(object):
+    # walls is a 2d boolean array that is True for walls. The field keeps it
+    # and rereads it in update. Cells off the board count as open.
+    def __init__(self, walls, cellSize, resolution=RESOLUTION,
+                 maxDistance=MAX_DISTANCE):
+        self.walls = walls
+        self.cellSize = cellSize
+        self.resolution = resolution
+        self.spacing = cellSize / resolution
+        self.maxDistance = maxDistance * cellSize
+        # Interpolated distances are never off by more than the diagonal of
+        # the square between four samples.
+        self.error = self.spacing * 2**.5
+        # Walls further than this many cells away can't be within maxDistance.
+        self.reach = math.ceil(maxDistance) + 1
+        rows, cols = walls.shape
+        self.field = np.empty((rows * resolution + 1, cols * resolution + 1))
+
+    def getSize(self):
+        return self.field.nbytes
+
+    # Works out the samples in rows startRow to endRow and cols startCol to
+    # endCol (samples, not cells, ends not included).
+    def build(self, startRow=0, endRow=None, startCol=0, endCol=None):
+        if endRow == None: endRow = self.field.shape[0]
+        if endCol == None: endCol = self.field.shape[1]
+        rows, cols = self.walls.shape
+        cellSize, reach = self.cellSize, self.reach
+        walls = np.pad(self.walls, reach, constant_values=False)
+
+        y = np.arange(startRow, endRow) * self.spacing
+        x = np.arange(startCol, endCol) * self.spacing
+        # Cell each sample is in, moved up by reach for the padded arrays.
+        cellRows = np.minimum(np.arange(startRow, endRow) // self.resolution,
+                              rows - 1) + reach
+        cellCols = np.minimum(np.arange(startCol, endCol) // self.resolution,
+                              cols - 1) + reach
+
+        # Distance to the nearest wall and to the nearest open cell.
+        toWall = np.full((len(y), len(x)), self.maxDistance)
+        toSpace = np.full((len(y), len(x)), self.maxDistance)
+        for drow in range(-reach, reach + 1):
+            top = (cellRows + drow - reach) * cellSize
+            dy = np.maximum(np.maximum(top - y, y - (top + cellSize)), 0)
+            for dcol in range(-reach, reach + 1):
+                left = (cellCols + dcol - reach) * cellSize
+                dx = np.maximum(np.maximum(left - x, x - (left + cellSize)), 0)
+                distance = np.sqrt(dy[:, None]**2 + dx[None, :]**2)
+                isWall = walls[np.ix_(cellRows + drow, cellCols + dcol)]
+                toWall = np.where(isWall, np.minimum(toWall, distance), toWall)
+                toSpace = np.where(isWall, toSpace, np.minimum(toSpace, distance))
+        self.field[startRow:endRow, startCol:endCol] = toWall - toSpace
+
+    # Updates the samples around cell (row, col) after it changed in walls.
+    def update(self, row, col):
+        resolution = self.resolution
+        self.build(max(0, (row - self.reach) * resolution),
+                   (row + self.reach + 1) * resolution + 1,
+                   max(0, (col - self.reach) * resolution),
+                   (col + self.reach + 1) * resolution + 1)
+
+    # Returns (row, col, ty, tx): the sample above and left of (x, y) and how
+    # far (x, y) is towards the next sample down and right, from 0 to 1.
+    # Points off the board are moved onto its edge first.
+    def locate(self, x, y):
+        rows, cols = self.field.shape
+        y = min(max(y / self.spacing, 0), rows - 1)
+        x = min(max(x / self.spacing, 0), cols - 1)
+        row, col = min(int(y), rows - 2), min(int(x), cols - 2)
+        return row, col, y - row, x - col
+
+    # Returns the distance from (x, y) to the nearest wall, or how deep in a
+    # wall it is as a negative number. Can be off by up to self.error.
+    def getDistance(self, x, y):
+        row, col, ty, tx = self.locate(x, y)
+        field = self.field
+        top = field[row, col] + (field[row, col+1] - field[row, col]) * tx
+        bottom = (field[row+1, col] +
+                  (field[row+1, col+1] - field[row+1, col]) * tx)
+        return top + (bottom - top) * ty
+
+    # Same as getDistance for arrays of x and y.
+    def getDistances(self, x, y):
+        rows, cols = self.field.shape
+        y = np.clip(np.asarray(y) / self.spacing, 0, rows - 1)
+        x = np.clip(np.asarray(x) / self.spacing, 0, cols - 1)
+        row = np.minimum(y.astype(int), rows - 2)
+        col = np.minimum(x.astype(int), cols - 2)
+        ty, tx = y - row, x - col
+        field = self.field
+        top = field[row, col] + (field[row, col+1] - field[row, col]) * tx
+        bottom = (field[row+1, col] +
+                  (field[row+1, col+1] - field[row+1, col]) * tx)
+        return top + (bottom - top) * ty
+
+    # Returns (dx, dy), the direction away from the nearest wall at (x, y),
+    # with length 1. Returns (0, 0) where there isn't one, like far from any
+    # wall.
+    def getGradient(self, x, y):
+        row, col, ty, tx = self.locate(x, y)
+        field = self.field
+        dx = ((field[row, col+1] - field[row, col]) * (1 - ty) +
+              (field[row+1, col+1] - field[row+1, col]) * ty)
+        dy = ((field[row+1, col] - field[row, col]) * (1 - tx) +
+              (field[row+1, col+1] - field[row, col+1]) * tx)
+        mag = (dx**2 + dy**2)**.5
+        if mag == 0: return (0, 0)
+        return (dx/mag, dy/mag)
+
+    # Returns True if there is certainly no wall within clearance of (x, y).
+    def isClear(self, x, y, clearance):
+        return self.getDistance(x, y) - self.error > clearance
+
+    # Returns (dx, dy) that moves a circle of radius r at (x, y) about out of
+    # the walls it overlaps, or (0, 0) if it doesn't overlap any.
+    def getPushOut(self, x, y, r):
+        depth = r - self.getDistance(x, y)
+        if depth <= 0: return (0, 0)
+        dx, dy = self.getGradient(x, y)
+        return (dx * depth, dy * depth)
+
+# Returns DistanceField for walls, or None if it would take more than
+# maxBytes.
+def makeDistanceField(walls, cellSize, maxBytes=MAX_BYTES):
+    field = DistanceField(walls, cellSize)
+    if field.getSize() > maxBytes: return None
+    field.build()
+    return field
@@ -0,0 +1,56 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Distance field test
+
+import random
+import numpy as np
+import distance_field
+
+# Returns the exact distance from (x, y) to the nearest wall.
+def getExactDistance(walls, x, y, cellSize):
+    best = None
+    for row, col in np.argwhere(walls):
+        dx = max(col*cellSize - x, 0, x - (col+1)*cellSize)
+        dy = max(row*cellSize - y, 0, y - (row+1)*cellSize)
+        distance = (dx**2 + dy**2)**.5
+        if best == None or distance < best: best = distance
+    return best
+
+def test():
+    random.seed(112)
+    cellSize = 50
+    walls = np.array([[random.random() < .2 for col in range(15)]
+                      for row in range(12)])
+    field = distance_field.makeDistanceField(walls, cellSize)
+    for i in range(300):
+        x, y = random.uniform(0, 15*cellSize), random.uniform(0, 12*cellSize)
+        exact = min(getExactDistance(walls, x, y, cellSize), field.maxDistance)
+        distance = field.getDistance(x, y)
+        if exact > 0: assert(abs(distance - exact) <= field.error)
+        else: assert(distance <= field.error)
+        if field.isClear(x, y, 10): assert(exact > 10)
+
+    # Adding and removing a wall gives back the same field.
+    before = field.field.copy()
+    walls[5, 5] = not walls[5, 5]
+    field.update(5, 5)
+    assert(not np.array_equal(before, field.field))
+    walls[5, 5] = not walls[5, 5]
+    field.update(5, 5)
+    assert(np.array_equal(before, field.field))
+
+    # A circle half in a lone wall gets pushed out of it.
+    walls = np.zeros((5, 5), dtype=bool)
+    walls[2, 2] = True
+    field = distance_field.makeDistanceField(walls, cellSize)
+    x, y = 3*cellSize - 5, 2.5*cellSize
+    dx, dy = field.getPushOut(x, y, 20)
+    assert(dx > 0 and abs(dy) < 1)
+    assert(field.getDistance(x + dx, y + dy) >= 20 - field.error)
+    assert(field.getPushOut(4.5*cellSize, 4.5*cellSize, 20) == (0, 0))
+    print("passed")
+
+test()
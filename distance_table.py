@@ -0,0 +1,194 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Precomputed distances between every pair of open cells in a level. Walls
+# never change during a game, so after this is built (or loaded from the
+# cache) every path is just a walk through the table.
+
+# CITATION: Referenced array docs https://docs.python.org/3/library/array.html
+
+# CITATION: Referenced hashlib docs https://docs.python.org/3/library/hashlib.html
+
+# CITATION: Referenced NumPy docs on packbits/unpackbits
+# https://numpy.org/doc/stable/reference/generated/numpy.packbits.html
+
+import os, hashlib
+from array import array
+import numpy as np
+import pathfinding
+
+# Stored for pairs of cells that can't reach each other.
+UNREACHABLE = 65535
+
+# Tables bigger than this (in bytes) aren't built; the game searches on demand
+# instead. 2 bytes per pair of open cells, so this fits about 2000 open cells,
+# which takes around 0.2 seconds to build.
+MAX_BYTES = 8 * 1024 * 1024
+
+# Length of the hash at the start of a saved table.
+HASH_LENGTH = 40
+
+# Distance table for one board. distances is a flat uint16 array where the
+# distance between open cells i and j is at i*len(cells) + j.
+class DistanceTable(object):
+    def __init__(self, board, obstacle="o"):
+        self.board = board
+        self.obstacle = obstacle
+        self.cells = []
+        self.index = dict()
+        for row in range(len(board)):
+            for col in range(len(board[0])):
+                if board[row][col] != obstacle:
+                    self.index[(row, col)] = len(self.cells)
+                    self.cells.append((row, col))
+        self.distances = None
+
+    # Returns number of bytes the table takes up once built.
+    def getSize(self):
+        return len(self.cells)**2 * 2
+
+    # Returns a hash of where the walls are, so the cache is shared by levels
+    # with the same walls even if enemies and weapons are placed differently.
+    def getHash(self):
+        walls = ""
+        for row in self.board:
+            for cell in row:
+                if cell == self.obstacle: walls += "o"
+                else: walls += "-"
+            walls += "\n"
+        return hashlib.sha1(walls.encode()).hexdigest()
+
+    # Breadth-first search from every open cell at once. Each cell has a
+    # bitset with bit j set for every cell j whose search reached it in the
+    # last step, so one step of all n searches is four lookups and an or of
+    # n bitsets. Bit b of each distance is kept in its own bitsets and
+    # they're only unpacked into the table at the end.
+    def build(self):
+        n = len(self.cells)
+        # Open cells next to each cell, or n (bitsets that are always empty)
+        # if there isn't one in that direction.
+        neighbors = np.full((n, len(pathfinding.DIRECTIONS)), n)
+        for i in range(n):
+            row, col = self.cells[i]
+            for k in range(len(pathfinding.DIRECTIONS)):
+                drow, dcol = pathfinding.DIRECTIONS[k]
+                neighbors[i, k] = self.index.get((row + drow, col + dcol), n)
+
+        words = (n + 63) // 64
+        frontier = np.zeros((n + 1, words * 8), np.uint8)
+        frontier[:n, :(n + 7) // 8] = np.packbits(np.eye(n, dtype=bool),
+                                                  axis=1, bitorder="little")
+        frontier = frontier.view(np.uint64)
+        reached = frontier[:n].copy()
+        distanceBits = []
+        distance = 0
+        while True:
+            distance += 1
+            new = frontier[neighbors[:, 0]]
+            for k in range(1, neighbors.shape[1]):
+                new |= frontier[neighbors[:, k]]
+            new &= ~reached
+            if not new.any(): break
+            reached |= new
+            frontier[:n] = new
+            for bit in range(distance.bit_length()):
+                if bit == len(distanceBits):
+                    distanceBits.append(np.zeros_like(reached))
+                if (distance >> bit) & 1: distanceBits[bit] |= new
+
+        distances = np.zeros((n, n), np.uint16)
+        for bit in range(len(distanceBits)):
+            distances |= self.unpack(distanceBits[bit]).astype(np.uint16) << bit
+        distances[self.unpack(reached) == 0] = UNREACHABLE
+        self.distances = array("H", distances.tobytes())
+
+    # Turns n bitsets into an n by n array of 0s and 1s.
+    def unpack(self, bitsets):
+        return np.unpackbits(bitsets.view(np.uint8), axis=1,
+                             count=len(self.cells), bitorder="little")
+
+    # Saves table to path, after the hash of the board it's for.
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory != "" and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, "wb") as tableFile:
+            tableFile.write(self.getHash().encode())
+            self.distances.tofile(tableFile)
+
+    # Loads table from path. Returns False if there is no usable file there,
+    # including tables saved for a different board or of the wrong size.
+    def load(self, path):
+        n = len(self.cells)
+        try:
+            with open(path, "rb") as tableFile:
+                if tableFile.read(HASH_LENGTH) != self.getHash().encode():
+                    return False
+                distances = array("H")
+                distances.fromfile(tableFile, n*n)
+                if len(tableFile.read(1)) > 0: return False
+        except (OSError, EOFError):
+            return False
+        self.distances = distances
+        return True
+
+    # Returns distance between two cells, or -1 if there is no path.
+    def getDistance(self, start, end):
+        if start not in self.index or end not in self.index: return -1
+        distance = self.distances[self.index[start]*len(self.cells) +
+                                  self.index[end]]
+        if distance == UNREACHABLE: return -1
+        return distance
+
+    # Returns the next cell on the way from cell to goal, or None if cell is
+    # the goal or can't reach it.
+    def getNextCell(self, cell, goal):
+        if cell not in self.index or goal not in self.index: return None
+        n = len(self.cells)
+        base = self.index[goal] * n
+        distance = self.distances[base + self.index[cell]]
+        if distance == 0 or distance == UNREACHABLE: return None
+        row, col = cell
+        for drow, dcol in pathfinding.DIRECTIONS:
+            neighbor = (row + drow, col + dcol)
+            if (neighbor in self.index and
+                self.distances[base + self.index[neighbor]] == distance - 1):
+                return neighbor
+
+    # Same return value as pathfinding.findPath, except distances and paths
+    # are None since no search is done.
+    def findPath(self, start, end):
+        if self.getDistance(start, end) == -1: return False
+        path = [start]
+        nextCell = self.getNextCell(start, end)
+        while nextCell != None:
+            path.append(nextCell)
+            nextCell = self.getNextCell(nextCell, end)
+        return True, None, path, None
+
+    # Returns list of cells from cell to goal, or False if cell can't reach
+    # it. The whole path is known, so this is the path from findPath.
+    def getPathStart(self, cell, goal):
+        result = self.findPath(cell, goal)
+        if not result: return False
+        return result[2]
+
+# Returns the distance table for board, loading it from cacheDir if it was
+# saved there before. Returns None if the table would be bigger than maxBytes.
+# If the table can't be saved (read-only folder, full disk, ...) it is still
+# returned, just built again next time.
+def makeDistanceTable(board, obstacle="o", cacheDir=None, maxBytes=MAX_BYTES):
+    table = DistanceTable(board, obstacle)
+    if table.getSize() > maxBytes: return None
+    if cacheDir != None:
+        path = os.path.join(cacheDir, table.getHash() + ".dist")
+        if table.load(path): return table
+    table.build()
+    if cacheDir != None:
+        try:
+            table.save(path)
+        except OSError:
+            pass
+    return table
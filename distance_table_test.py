@@ -0,0 +1,89 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Distance table test
+# Checks the table against breadth-first search from the pathfinding module,
+# and that saved tables are only loaded back for the board they were made for.
+
+import os, random, tempfile
+import pathfinding, distance_table
+
+# Returns map with walls around the edge, some random walls inside and a
+# closed off pocket in the bottom right corner.
+def setup(rows=12, cols=16):
+    board = [["-"] * cols for i in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            if (row == 0 or col == 0 or row == rows-1 or col == cols-1 or
+                random.random() < .2):
+                board[row][col] = "#"
+    for row in range(rows-4, rows-1):
+        board[row][cols-4] = "#"
+    board[rows-4] = board[rows-4][:cols-4] + ["#"] * 4
+    board[rows-2][cols-2] = "-"
+    return board
+
+def test():
+    random.seed(112)
+    board = setup()
+    table = distance_table.makeDistanceTable(board, "#")
+    for goal in table.cells:
+        field = pathfinding.FlowField(board, goal, "#")
+        for cell in table.cells:
+            distance = field.getDistance(cell)
+            assert(table.getDistance(cell, goal) == distance)
+            nextCell = table.getNextCell(cell, goal)
+            if distance <= 0:
+                assert(nextCell == None)
+            else:
+                assert(pathfinding.manhattan(cell, nextCell) == 1)
+                assert(field.getDistance(nextCell) == distance - 1)
+        start = random.choice(table.cells)
+        result = table.findPath(start, goal)
+        if field.getDistance(start) == -1:
+            assert(result == False)
+        else:
+            path = result[2]
+            assert(path[0] == start and path[-1] == goal)
+            assert(len(path) == field.getDistance(start) + 1)
+    assert(table.getDistance((0, 0), table.cells[0]) == -1)
+
+    # Saved tables load back, but not for other boards or when cut short.
+    with tempfile.TemporaryDirectory() as cacheDir:
+        cached = distance_table.makeDistanceTable(board, "#", cacheDir)
+        path = os.path.join(cacheDir, cached.getHash() + ".dist")
+        assert(os.path.isfile(path))
+        loaded = distance_table.DistanceTable(board, "#")
+        assert(loaded.load(path))
+        assert(loaded.distances == table.distances)
+
+        # Same number of open cells, but in different places.
+        otherBoard = [list(row) for row in board]
+        row, col = table.cells[0]
+        otherBoard[row][col] = "#"
+        otherBoard[len(board)-4][len(board[0])-2] = "-"
+        other = distance_table.DistanceTable(otherBoard, "#")
+        assert(len(other.cells) == len(table.cells))
+        assert(not other.load(path))
+
+        with open(path, "rb") as tableFile:
+            data = tableFile.read()
+        with open(path, "wb") as tableFile:
+            tableFile.write(data[:-2])
+        assert(not loaded.load(path))
+        with open(path, "wb") as tableFile:
+            tableFile.write(data + data[-2:])
+        assert(not loaded.load(path))
+
+        # A cache folder that can't be made (a file is in the way) still
+        # gives a working table.
+        notDir = os.path.join(cacheDir, "file")
+        open(notDir, "w").close()
+        unsaved = distance_table.makeDistanceTable(board, "#", notDir)
+        assert(unsaved.distances == table.distances)
+    assert(distance_table.makeDistanceTable(board, "#", None, 100) == None)
+    print("passed")
+
+test()
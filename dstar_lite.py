@@ -0,0 +1,173 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Incremental pathfinding (D* Lite) so a path can be repaired instead of
+# rebuilt from nothing when the player moves a cell or a wall changes.
+
+# CITATION: Referenced D* Lite paper by Koenig and Likhachev at
+# http://idm-lab.org/bib/abstracts/papers/aaai02b.pdf
+
+# CITATION: Referenced Moving Target D* Lite paper by Sun, Yeoh and Koenig for
+# handling a goal that moves http://idm-lab.org/bib/abstracts/papers/aamas10a.pdf
+
+import heapq
+import pathfinding
+
+INF = float("inf")
+
+# Keeps g and rhs values between calls. The search is rooted at goal (the
+# player) and runs towards start (the enemy), so g is the distance to goal.
+# Moving start only bumps km, and moving goal or changing a wall only updates
+# the cells whose values are no longer right.
+class DStarLite(object):
+    def __init__(self, board, start, goal, obstacle="o"):
+        self.board = board
+        self.start = start
+        self.goal = goal
+        self.obstacle = obstacle
+        self.km = 0
+        self.g = dict()
+        self.rhs = dict()
+        self.queue = []
+        self.queued = dict()
+
+        # Counters for how much work each update did.
+        self.expanded = 0
+        self.totalExpanded = 0
+        self.updates = 0
+
+        self.rhs[goal] = 0
+        self.push(goal, self.calculateKey(goal))
+        self.computeShortestPath()
+
+    def getG(self, cell):
+        return self.g.get(cell, INF)
+
+    def getRhs(self, cell):
+        return self.rhs.get(cell, INF)
+
+    def isOpen(self, cell):
+        return pathfinding.isOpen(self.board, cell[0], cell[1], self.obstacle)
+
+    # Returns the open cells next to cell.
+    def getNeighbors(self, cell):
+        row, col = cell
+        neighbors = []
+        for drow, dcol in pathfinding.DIRECTIONS:
+            neighbor = (row + drow, col + dcol)
+            if self.isOpen(neighbor):
+                neighbors.append(neighbor)
+        return neighbors
+
+    def calculateKey(self, cell):
+        value = min(self.getG(cell), self.getRhs(cell))
+        return (value + pathfinding.manhattan(self.start, cell) + self.km, value)
+
+    # Queue entries are removed lazily: an entry is only live if its key
+    # still matches the one stored in self.queued.
+    def push(self, cell, key):
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key, cell))
+
+    def topKey(self):
+        while len(self.queue) > 0:
+            key, cell = self.queue[0]
+            if self.queued.get(cell) == key: return key
+            heapq.heappop(self.queue)
+        return (INF, INF)
+
+    def pop(self):
+        self.topKey()
+        key, cell = heapq.heappop(self.queue)
+        del self.queued[cell]
+        return key, cell
+
+    # Recalculates rhs for cell and puts it in the queue if it is inconsistent.
+    def updateVertex(self, cell):
+        if cell == self.goal:
+            self.rhs[cell] = 0
+        elif not self.isOpen(cell):
+            self.rhs[cell] = INF
+        else:
+            best = INF
+            for neighbor in self.getNeighbors(cell):
+                best = min(best, self.getG(neighbor) + 1)
+            self.rhs[cell] = best
+        self.queued.pop(cell, None)
+        if self.getG(cell) != self.getRhs(cell):
+            self.push(cell, self.calculateKey(cell))
+
+    # Expands cells until start is consistent.
+    def computeShortestPath(self):
+        while (self.topKey() < self.calculateKey(self.start) or
+               self.getRhs(self.start) != self.getG(self.start)):
+            if len(self.queued) == 0: break
+            oldKey, cell = self.pop()
+            self.expanded += 1
+            newKey = self.calculateKey(cell)
+            if oldKey < newKey:
+                self.push(cell, newKey)
+            elif self.getG(cell) > self.getRhs(cell):
+                self.g[cell] = self.getRhs(cell)
+                for neighbor in self.getNeighbors(cell):
+                    self.updateVertex(neighbor)
+            else:
+                self.g[cell] = INF
+                self.updateVertex(cell)
+                for neighbor in self.getNeighbors(cell):
+                    self.updateVertex(neighbor)
+
+    # Moves start and/or goal and repairs the search. Returns how many cells
+    # were expanded.
+    def update(self, start, goal):
+        self.expanded = 0
+        if start != self.start:
+            self.km += pathfinding.manhattan(self.start, start)
+            self.start = start
+        if goal != self.goal:
+            oldGoal = self.goal
+            self.goal = goal
+            self.updateVertex(goal)
+            self.updateVertex(oldGoal)
+        self.computeShortestPath()
+        self.updates += 1
+        self.totalExpanded += self.expanded
+        return self.expanded
+
+    # Call after the board changes at cell (for example a wall is added or
+    # removed). Returns how many cells were expanded.
+    def updateCell(self, cell):
+        self.expanded = 0
+        self.updateVertex(cell)
+        row, col = cell
+        for drow, dcol in pathfinding.DIRECTIONS:
+            neighbor = (row + drow, col + dcol)
+            if self.isOpen(neighbor):
+                self.updateVertex(neighbor)
+        self.computeShortestPath()
+        self.updates += 1
+        self.totalExpanded += self.expanded
+        return self.expanded
+
+    # Returns the next cell on the way from cell to goal, or None if cell is
+    # the goal or can't reach it.
+    def getNextCell(self, cell):
+        if cell == self.goal or self.getG(cell) == INF: return None
+        best = None
+        for neighbor in self.getNeighbors(cell):
+            if best == None or self.getG(neighbor) < self.getG(best):
+                best = neighbor
+        if best == None or self.getG(best) >= self.getG(cell): return None
+        return best
+
+    # Returns the full path from start to goal, or False if there isn't one.
+    def getPath(self):
+        if self.getG(self.start) == INF: return False
+        path = [self.start]
+        nextCell = self.getNextCell(self.start)
+        while nextCell != None:
+            path.append(nextCell)
+            nextCell = self.getNextCell(nextCell)
+        return path
@@ -0,0 +1,89 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# D* Lite test
+# Checks paths from DStarLite against A* from the pathfinding module after
+# it's built, after the goal and start move, and after walls change.
+
+import random
+import pathfinding, dstar_lite
+
+# Returns map with walls around the edge and some random walls inside.
+def setup(rows=15, cols=20):
+    board = [["-"] * cols for i in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            if (row == 0 or col == 0 or row == rows-1 or col == cols-1 or
+                random.random() < .25):
+                board[row][col] = "#"
+    return board
+
+# Returns list of every open cell on board.
+def getOpenCells(board):
+    return [(row, col) for row in range(len(board))
+            for col in range(len(board[0])) if board[row][col] != "#"]
+
+# Checks planner's path is a real path on board and as short as A*'s.
+def checkPath(board, planner):
+    path = planner.getPath()
+    result = pathfinding.aStar(board, planner.start, planner.goal, "#")
+    if not result:
+        assert(path == False)
+        return
+    assert(path[0] == planner.start and path[-1] == planner.goal)
+    assert(len(path) == len(result[2]))
+    for i in range(len(path) - 1):
+        assert(board[path[i+1][0]][path[i+1][1]] != "#")
+        assert(pathfinding.manhattan(path[i], path[i+1]) == 1)
+
+def test():
+    random.seed(112)
+    board = setup()
+    cells = getOpenCells(board)
+    for i in range(20):
+        start, goal = random.sample(cells, 2)
+        planner = dstar_lite.DStarLite(board, start, goal, "#")
+        checkPath(board, planner)
+
+        # The player walks a few cells and the enemy follows its path.
+        for j in range(5):
+            row, col = planner.goal
+            neighbors = [(row + drow, col + dcol)
+                         for drow, dcol in pathfinding.DIRECTIONS
+                         if board[row + drow][col + dcol] != "#"]
+            if len(neighbors) == 0: break
+            nextCell = planner.getNextCell(planner.start)
+            if nextCell == None: nextCell = planner.start
+            planner.update(nextCell, random.choice(neighbors))
+            checkPath(board, planner)
+
+    # Walls added on the path and then taken away again get repaired.
+    board = setup()
+    board[7] = ["#"] + ["-"] * 18 + ["#"]
+    planner = dstar_lite.DStarLite(board, (7, 1), (7, 18), "#")
+    checkPath(board, planner)
+    for i in range(10):
+        path = planner.getPath()
+        if path == False: break
+        row, col = path[len(path)//2]
+        board[row][col] = "#"
+        planner.updateCell((row, col))
+        checkPath(board, planner)
+    cells = [cell for cell in getOpenCells(board)
+             if cell != planner.start and cell != planner.goal]
+    for row, col in random.sample(cells, 10):
+        board[row][col] = "#"
+        planner.updateCell((row, col))
+    checkPath(board, planner)
+    for row in range(1, 14):
+        for col in range(1, 19):
+            if board[row][col] == "#":
+                board[row][col] = "-"
+                planner.updateCell((row, col))
+    checkPath(board, planner)
+    assert(len(planner.getPath()) == 18)
+    print("passed")
+
+test()
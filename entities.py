@@ -0,0 +1,316 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Players, enemies and their weapons. Every class lists its attributes in
+# __slots__, so objects don't carry a __dict__ and take a little less memory
+# (see entity_benchmark.py). Reading attributes isn't any faster. Setting an
+# attribute that isn't listed raises AttributeError, so new attributes have
+# to be added to __slots__ too.
+
+# CITATION: Referenced Python data model docs on __slots__
+# https://docs.python.org/3/reference/datamodel.html#slots
+
+import math
+import dstar_lite, collision
+
+# Parent class of Person.
+class Entity(object):
+    __slots__ = ("x", "y", "dx", "dy", "r", "speedScale")
+
+    def __init__(self, x, y, r):
+        self.x = x
+        self.y = y
+        self.dx = 0
+        self.dy = 0
+        self.r = r
+        self.speedScale = 0
+
+    # Moves entity in direction specified by dx and dy, scaled by timeScale and 
+    # the speed of the entity (speedScale).
+    def move(self, timeScale):
+        mag = (self.dx**2 + self.dy**2)**.5
+        if mag != 0: a = 1/mag
+        else: a = 1
+        self.x += a*self.dx*self.speedScale*timeScale
+        self.y += a*self.dy*self.speedScale*timeScale
+
+    # Similar to the move method, except it returns (dx, dy) instead of actually
+    # the move.
+    def getMove(self, timeScale):
+        mag = (self.dx**2 + self.dy**2)**.5
+        if mag != 0: a = 1/mag
+        else: a = 1
+        return (a*self.dx*self.speedScale*timeScale,a*self.dy*self.speedScale*timeScale)
+
+    # Checks if entity collides with square at given location.
+    def checkObstacleCollision(self, squareX, squareY, squareR):
+        xLeft = squareX - (self.x + self.r)
+        xRight = (self.x - self.r) - (2 * squareR + squareX)
+        yTop = squareY - (self.y + self.r)
+        yBottom = (self.y - self.r) - (2 * squareR + squareY)
+        
+        minDistance = min(abs(xLeft), abs(xRight), abs(yTop), abs(yBottom))
+
+        if abs(xLeft) == minDistance:
+            return xLeft < 0
+        elif abs(xRight) == minDistance:
+            return xRight < 0
+        elif abs(yTop) == minDistance:
+            return yTop < 0
+        elif abs(yBottom) == minDistance:
+            return yBottom < 0
+
+    # Collision detection for circular entity and square obstacle.
+    # squareX and squareY should be center of square.
+    def collidesWithObstacle(self, squareX, squareY, squareR):
+        r = ((squareX-self.x)**2 + (squareY-self.y)**2)**.5
+        if r < squareR: return True
+        elif r > self.r + squareR*(2)**.5: return False
+
+        if abs(squareX - self.x) > abs(squareY - self.y):
+            a = math.cos(math.acos(abs(squareX-self.x)/r))
+        else:
+            a = math.cos(math.acos(abs(squareY-self.y)/r))
+        d = squareR/a
+        return r < d + self.r
+
+    # Collision detection for square entity and square obstacle.
+    # Returns (True/False, sideOfCollision).
+    def rectCollidesWithObstacle(self, playerX, playerY, squareX, squareY, squareR):
+        return (collision.rectsOverlap(playerX, playerY, self.r, squareX,
+                                       squareY, squareR), None)
+
+# Parent class of Enemy and Player
+class Person(Entity):
+    __slots__ = ("weapon",)
+
+    def __init__(self, x, y, r, weapon):
+        super().__init__(x, y, r)
+        self.weapon = weapon
+
+# Class to represent the player.
+class Player(Person):
+    __slots__ = ("startX", "startY", "row", "col")
+
+    def __init__(self, x, y, weapon):
+        super().__init__(x, y, 20, weapon)
+        self.startX = x
+        self.startY = y
+        self.speedScale = 10
+        self.row = -1
+        self.col = -1
+
+    # Moves player, and updates paths for enemies.
+    # FIX: only check for new paths when player changes cells.
+    def move(self, timeScale, app):
+        super().move(timeScale)
+        newRow, newCol = app.getCell(self.x, self.y)
+        if newRow != self.row or newCol != self.col:
+            app.calculateEnemyPaths()
+            self.row, self.col = newRow, newCol
+
+# Class to represent enemies.
+class Enemy(Person):
+    __slots__ = ("triggered", "foundPlayer", "seesPlayer", "planner",
+                 "path", "goal")
+
+    def __init__(self, x, y, weapon):
+        super().__init__(x, y, 20, weapon)
+        self.triggered = False
+        self.speedScale = 10*.75
+        self.foundPlayer = False
+        self.seesPlayer = False
+        self.planner = None
+        self.path = []
+        # Player's cell when the path was last planned, or None if the
+        # player couldn't be reached from there.
+        self.goal = None
+
+    # Move function for Enemy class.
+    # Moves entity in direction specified by dx and dy, scaled by timeScale and 
+    # the speed of the entity (speedScale).
+    # Assumes enemy will only be moving horizontally or vertically.
+    def move(self, timeScale, app):
+        if self.foundPlayer: return
+        if self.triggered:
+            self.followPath(app)
+        mag = (self.dx**2 + self.dy**2)**.5
+        if mag != 0: a = 1/mag
+        else: a = 1
+        dx = a*self.dx*self.speedScale*timeScale
+        dy = a*self.dy*self.speedScale*timeScale
+
+        if len(self.path) < 2: 
+            self.x += dx
+            self.y += dy
+            return
+
+        # Ensure enemy doesn't move beyond center of next square on path
+        targetX, targetY = app.getCoords(self.path[1][0], self.path[1][1])
+        if (dx != 0 and (self.x <= targetX <= self.x + dx or 
+            self.x >= targetX >= self.x +dx)):
+            self.x = targetX
+            self.path.pop(0)
+            self.followPath(app)
+        elif (dy != 0 and (self.y <= targetY <= self.y + dy or 
+            self.y >= targetY >= self.y + dy)):
+            self.y = targetY
+            self.path.pop(0)
+            self.followPath(app)
+        else:
+            self.x += dx
+            self.y += dy
+    
+    # Find path to player. Called by the app's replan scheduler, so any
+    # searching happens within the AI budget. With a pathfinder the enemy
+    # gets as much of the path as is known without more searching, and
+    # queues itself again if it gets to the end of that before the player.
+    # On large boards each enemy keeps an incremental planner that is
+    # repaired instead of rebuilt when the player moves. When planning in the
+    # background, the enemy keeps its old path until the app hands it the
+    # new one.
+    def findPlayer(self, app):
+        row, col = app.getCell(self.x, self.y)
+        playerCell = app.getCell(app.player.x, app.player.y)
+        self.goal = playerCell
+        if app.backgroundPlanner != None:
+            app.backgroundPlanner.submit(self, (row, col), playerCell)
+            if len(self.path) == 0:
+                self.path = [(row, col)]
+            return self.path
+        elif app.pathfinder != None:
+            self.path = app.pathfinder.getPathStart((row, col), playerCell)
+            if not self.path:
+                self.path = [(row, col)]
+                self.goal = None
+            return self.path
+        elif app.useIncrementalPaths:
+            if self.planner == None:
+                self.planner = dstar_lite.DStarLite(app.board, (row, col),
+                                                    playerCell, "o")
+            else:
+                self.planner.update((row, col), playerCell)
+        self.path = [(row, col)]
+        nextCell = self.getNextCell(app, (row, col))
+        if nextCell != None:
+            self.path.append(nextCell)
+        return self.path
+
+    # Returns the next cell on the way to the player from cell, using this
+    # enemy's planner if it has one and the app's flow field otherwise. Both
+    # are already up to date, so this never searches. Paths planned in the
+    # background or from the app's pathfinder are extended by findPlayer
+    # instead.
+    def getNextCell(self, app, cell):
+        if app.backgroundPlanner != None or app.pathfinder != None:
+            return None
+        elif self.planner != None:
+            return self.planner.getNextCell(cell)
+        return app.flowField.getNextCell(cell)
+
+    # Sets the enemy's dx and dy to follow path. Extends the path when the
+    # enemy reaches the end of it. An enemy at the end of the part of its
+    # path the pathfinder knew waits for the replan scheduler to find the
+    # rest.
+    def followPath(self, app):
+        if len(self.path) < 2:
+            nextCell = self.getNextCell(app, self.path[-1])
+            if nextCell != None:
+                self.path.append(nextCell)
+        if len(self.path) < 2:
+            self.dx, self.dy = 0, 0
+            if (app.pathfinder != None and self.goal != None and
+                self.path[-1] != self.goal):
+                app.replanScheduler.add(self)
+            else:
+                self.foundPlayer = True
+        else:
+            self.dx = self.path[1][1] - self.path[0][1]
+            self.dy = self.path[1][0] - self.path[0][0]
+
+    # Function to check whether enemy has a line of sight to player.
+    # Uses the level's visibility table when there is one, and otherwise
+    # the player's field of view, which is shared by every enemy.
+    def canSeePlayer(self, app):
+        if app.visibilityTable != None:
+            return app.visibilityTable.canSee((self.x, self.y),
+                                              (app.player.x, app.player.y),
+                                              app.cellSize)
+        return app.getCell(self.x, self.y) in app.fieldOfView
+
+    # Function called to shoot weapon at player.
+    # FIX: Make firing weapons general/object-oriented.
+    def fireAtPlayer(self, app):
+        if self.weapon.fire(app):
+            if self.weapon.name == "shotgun":
+                self.weapon.createBullets(app,(self.x,self.y),(app.player.x,app.player.y),True)
+            else:
+                dx = app.player.x - self.x
+                dy = app.player.y - self.y
+                app.projectiles.add(self.x, self.y, dx, dy, 10, True)
+            
+
+# Parent class of all weapons.
+class Weapon(object):
+    __slots__ = ("name", "reloadTime", "ammo", "lastFired")
+
+    def __init__(self, name, reloadTime, ammo):
+        self.name = name
+        self.reloadTime = reloadTime
+        self.ammo = ammo
+        self.lastFired = -reloadTime
+
+    # Fires weapon and returns True if successful and False otherwise.
+    def fire(self, app):
+        if app.timeCounter >= self.lastFired + self.reloadTime and self.ammo > 0:
+            self.ammo -= 1
+            self.lastFired = app.timeCounter
+            # app.playFiringSound()
+            app.playSound(app.shootSlow, app.shootFast, False)
+            return True
+        else:
+            return False
+
+# Subclass of Weapon to represent pistol.
+class Pistol(Weapon):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__("pistol", 10, 6)
+
+# Subclass of Weapon to represent machine gun.
+class MachineGun(Weapon):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__("machineGun", 5, 30)
+
+# Subclass of Weapon to represent shotgun.
+class Shotgun(Weapon):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__("shotgun", 20, 6)
+
+    # Adds bullets from shot to list of projectiles.
+    # Takes tuples of (x, y).
+    def createBullets(self, app, fromCoords, toCoords, harmful):
+        x1, y1 = fromCoords
+        x2, y2 = toCoords
+        dx, dy = x2 - x1, y2 - y1
+        r = (dx**2 + dy**2)**.5
+
+        angle1 = math.acos(dx/r)
+        if dx < 0 and dy < 0: angle1 += 2*(math.pi-angle1)
+        elif dx > 0 and dy < 0: angle1 = -angle1 + math.pi*2
+        angle2 = angle1 + math.pi/8
+        angle3 = angle1 - math.pi/8
+
+        dx2, dy2 = r*math.cos(angle2), r*math.sin(angle2)
+        dx3, dy3 = r*math.cos(angle3), r*math.sin(angle3)
+
+        app.projectiles.add(x1, y1, dx, dy, 5, harmful)
+        app.projectiles.add(x1, y1, dx2, dy2, 5, harmful)
+        app.projectiles.add(x1, y1, dx3, dy3, 5, harmful)
@@ -0,0 +1,85 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Entity layout benchmark
+# Compares enemies stored the old way (attributes in a __dict__) with the
+# __slots__ classes in entities.py, for 1000 and 10000 enemies: memory per
+# enemy, and time for one pass of the loops that read and write enemy
+# attributes every tick.
+
+# CITATION: Referenced tracemalloc docs https://docs.python.org/3/library/tracemalloc.html
+
+import random, time, tracemalloc
+import entities
+
+# Enemy with the same attributes as entities.Enemy, but without __slots__.
+class DictEnemy(object):
+    def __init__(self, x, y, weapon):
+        self.x = x
+        self.y = y
+        self.dx = 0
+        self.dy = 0
+        self.r = 20
+        self.speedScale = 10*.75
+        self.weapon = weapon
+        self.triggered = False
+        self.foundPlayer = False
+        self.seesPlayer = False
+        self.planner = None
+        self.path = []
+        self.goal = None
+
+# Returns average bytes per enemy made by makeEnemy.
+def measureMemory(makeEnemy, count):
+    weapon = entities.Pistol()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    enemies = [makeEnemy(i, i, weapon) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+# Same attribute reads and writes as Entity.move and the checks in
+# moveEnemies and drawEnemies.
+def tick(enemies, timeScale):
+    for enemy in enemies:
+        if enemy.foundPlayer or not enemy.triggered: continue
+        mag = (enemy.dx**2 + enemy.dy**2)**.5
+        if mag != 0: a = 1/mag
+        else: a = 1
+        enemy.x += a*enemy.dx*enemy.speedScale*timeScale
+        enemy.y += a*enemy.dy*enemy.speedScale*timeScale
+        enemy.seesPlayer = enemy.x < enemy.y
+
+# Returns average seconds per tick over repeats ticks.
+def timeTicks(enemies, repeats):
+    startTime = time.perf_counter()
+    for i in range(repeats):
+        tick(enemies, 1)
+    return (time.perf_counter() - startTime) / repeats
+
+def makeEnemies(makeEnemy, count):
+    random.seed(112)
+    weapon = entities.Pistol()
+    enemies = []
+    for i in range(count):
+        enemy = makeEnemy(random.uniform(0, 5000), random.uniform(0, 5000),
+                          weapon)
+        enemy.triggered = True
+        enemy.dx, enemy.dy = random.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+        enemies.append(enemy)
+    return enemies
+
+def benchmark(repeats=50):
+    print("enemies  layout  bytes/enemy  ms/tick")
+    for count in [1000, 10000]:
+        for name, makeEnemy in [("dict", DictEnemy), ("slots", entities.Enemy)]:
+            memory = measureMemory(makeEnemy, count)
+            enemies = makeEnemies(makeEnemy, count)
+            seconds = timeTicks(enemies, repeats)
+            print("%7d  %6s  %11.0f  %7.3f" % (count, name, memory,
+                                               seconds * 1000))
+
+benchmark()
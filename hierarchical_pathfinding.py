@@ -0,0 +1,278 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Hierarchical pathfinding (HPA*) for boards too big to search cell by cell.
+# The board is split into square clusters. Cells on either side of an opening
+# between two clusters become entrance nodes, and the distances between
+# entrances of the same cluster are found once when the board is loaded.
+# Cells in the same or neighboring clusters are searched for directly.
+# Otherwise searches run over the entrances only. findPath turns every leg of
+# the result back into cells. getNextCell only needs the next step, so it
+# only turns the first leg into cells and keeps that in an LRU path cache,
+# where enemies walking along it (or standing on it) reuse it. The rest of
+# the search result is kept too, and the next leg is turned into cells when
+# an enemy gets to the end of this one.
+
+# CITATION: Referenced HPA* paper by Botea, Muller and Schaeffer at
+# https://webdocs.cs.ualberta.ca/~mmueller/ps/hpastar.pdf
+
+import heapq
+from collections import deque, OrderedDict
+import pathfinding
+
+# Openings at least this long get an entrance at each end instead of one in
+# the middle, like in the HPA* paper.
+MAX_SINGLE_ENTRANCE = 6
+
+class HierarchicalPathfinder(object):
+    def __init__(self, board, obstacle="o", clusterSize=10):
+        self.board = board
+        self.obstacle = obstacle
+        self.clusterSize = clusterSize
+        # Maps entrance cell to dict of {other entrance cell: cost}.
+        self.edges = dict()
+        # Maps cluster (clusterRow, clusterCol) to list of its entrance cells.
+        self.clusterNodes = dict()
+        self.findEntrances()
+        self.connectClusters()
+        # Legs found by getNextCell.
+        self.pathCache = pathfinding.PathCache(self.findFirstLeg)
+        # Maps (leg end, goal) to the rest of the abstract path the leg came
+        # from, least recently used first.
+        self.nextLegs = OrderedDict()
+
+    # Call after a cell of the board changes. Finds the entrances again and
+    # forgets cached paths and legs, which may go through the cell.
+    def updateCell(self, cell):
+        self.edges = dict()
+        self.clusterNodes = dict()
+        self.findEntrances()
+        self.connectClusters()
+        self.pathCache.clear()
+        self.nextLegs.clear()
+
+    def isOpen(self, cell):
+        return pathfinding.isOpen(self.board, cell[0], cell[1], self.obstacle)
+
+    def getCluster(self, cell):
+        return (cell[0] // self.clusterSize, cell[1] // self.clusterSize)
+
+    def addNode(self, cell):
+        if cell not in self.edges:
+            self.edges[cell] = dict()
+            cluster = self.getCluster(cell)
+            self.clusterNodes[cluster] = self.clusterNodes.get(cluster, [])
+            self.clusterNodes[cluster].append(cell)
+
+    # Connects two cells on either side of a cluster border.
+    def addTransition(self, cell1, cell2):
+        self.addNode(cell1)
+        self.addNode(cell2)
+        self.edges[cell1][cell2] = 1
+        self.edges[cell2][cell1] = 1
+
+    # Turns one run of open cell pairs along a border into entrance nodes.
+    def addEntrance(self, pairs):
+        if len(pairs) < MAX_SINGLE_ENTRANCE:
+            self.addTransition(*pairs[len(pairs)//2])
+        else:
+            self.addTransition(*pairs[0])
+            self.addTransition(*pairs[-1])
+
+    # Finds openings along every border between two clusters.
+    def findEntrances(self):
+        rows, cols = len(self.board), len(self.board[0])
+        size = self.clusterSize
+
+        # Borders between clusters on top of each other.
+        for row in range(size, rows, size):
+            for startCol in range(0, cols, size):
+                pairs = []
+                for col in range(startCol, min(startCol + size, cols)):
+                    cell1, cell2 = (row - 1, col), (row, col)
+                    if self.isOpen(cell1) and self.isOpen(cell2):
+                        pairs.append((cell1, cell2))
+                    elif len(pairs) > 0:
+                        self.addEntrance(pairs)
+                        pairs = []
+                if len(pairs) > 0: self.addEntrance(pairs)
+
+        # Borders between clusters next to each other.
+        for col in range(size, cols, size):
+            for startRow in range(0, rows, size):
+                pairs = []
+                for row in range(startRow, min(startRow + size, rows)):
+                    cell1, cell2 = (row, col - 1), (row, col)
+                    if self.isOpen(cell1) and self.isOpen(cell2):
+                        pairs.append((cell1, cell2))
+                    elif len(pairs) > 0:
+                        self.addEntrance(pairs)
+                        pairs = []
+                if len(pairs) > 0: self.addEntrance(pairs)
+
+    # Breadth-first search from start that stays inside start's cluster, or
+    # inside the set clusters if it's given. Returns (distances, paths) where
+    # paths holds each cell's previous cell.
+    def searchCluster(self, start, clusters=None):
+        if clusters == None: clusters = set([self.getCluster(start)])
+        distances = {start: 0}
+        paths = {start: None}
+        toVisit = deque([start])
+        while len(toVisit) > 0:
+            row, col = toVisit.popleft()
+            for drow, dcol in pathfinding.DIRECTIONS:
+                cell = (row + drow, col + dcol)
+                if (cell not in distances and self.isOpen(cell) and
+                    self.getCluster(cell) in clusters):
+                    distances[cell] = distances[(row, col)] + 1
+                    paths[cell] = (row, col)
+                    toVisit.append(cell)
+        return distances, paths
+
+    # Finds the cost between every pair of entrances in the same cluster.
+    def connectClusters(self):
+        for cluster in self.clusterNodes:
+            nodes = self.clusterNodes[cluster]
+            for node in nodes:
+                distances = self.searchCluster(node)[0]
+                for other in nodes:
+                    if other != node and other in distances:
+                        self.edges[node][other] = distances[other]
+
+    # Returns dict of {entrance cell: cost} for entrances (and goal, if given)
+    # that cell can reach inside its own cluster.
+    def getLocalEdges(self, cell, goal=None):
+        distances = self.searchCluster(cell)[0]
+        localEdges = dict()
+        for node in self.clusterNodes.get(self.getCluster(cell), []):
+            if node in distances:
+                localEdges[node] = distances[node]
+        if goal != None and goal in distances:
+            localEdges[goal] = distances[goal]
+        return localEdges
+
+    # A* over the entrance nodes, with start and goal connected to the
+    # entrances of their clusters. Returns the list of nodes from start to
+    # goal, or False if there isn't a path.
+    def findAbstractPath(self, start, goal):
+        startEdges = self.getLocalEdges(start, goal)
+        goalEdges = self.getLocalEdges(goal)
+        distances = {start: 0}
+        previous = {start: None}
+        toVisit = [(pathfinding.manhattan(start, goal), start)]
+        visited = set([])
+        while len(toVisit) > 0:
+            priority, node = heapq.heappop(toVisit)
+            if node in visited: continue
+            visited.add(node)
+            if node == goal:
+                path = []
+                while node != None:
+                    path.append(node)
+                    node = previous[node]
+                path.reverse()
+                return path
+
+            neighbors = dict(self.edges.get(node, {}))
+            if node == start: neighbors.update(startEdges)
+            if node in goalEdges: neighbors[goal] = goalEdges[node]
+
+            for neighbor in neighbors:
+                newDistance = distances[node] + neighbors[neighbor]
+                if neighbor not in distances or newDistance < distances[neighbor]:
+                    distances[neighbor] = newDistance
+                    previous[neighbor] = node
+                    priority = newDistance + pathfinding.manhattan(neighbor, goal)
+                    heapq.heappush(toVisit, (priority, neighbor))
+        return False
+
+    # Turns one step of an abstract path into cells, from start to end.
+    def refineLeg(self, start, end):
+        if self.getCluster(start) != self.getCluster(end):
+            return [start, end]
+        paths = self.searchCluster(start)[1]
+        leg = [end]
+        while leg[-1] != start:
+            leg.append(paths[leg[-1]])
+        leg.reverse()
+        return leg
+
+    # Returns the next cell on the way from cell to goal, or None if cell is
+    # the goal or can't reach it. Goes through the path cache, so each step
+    # an enemy takes along a leg is a cache hit, and only the end of each
+    # leg is searched from again.
+    def getNextCell(self, cell, goal):
+        if cell == goal: return None
+        path = self.pathCache.getPath(cell, goal)
+        if not path: return None
+        return path[1]
+
+    # Returns list of cells from cell to the end of the leg it's on towards
+    # goal (or to goal, if the path doesn't go through entrances), or False
+    # if cell can't reach goal. Goes through the path cache like getNextCell.
+    def getPathStart(self, cell, goal):
+        return self.pathCache.getPath(cell, goal)
+
+    # Returns a shortest path from start to end that stays in the clusters
+    # between the two, or False if they aren't in the same or neighboring
+    # clusters or there is no path there. Entrances are spread out, so for
+    # cells this close going through them can be several times longer.
+    def findLocalPath(self, start, end):
+        row0, col0 = self.getCluster(start)
+        row1, col1 = self.getCluster(end)
+        if abs(row1 - row0) > 1 or abs(col1 - col0) > 1: return False
+        clusters = set([])
+        for row in range(min(row0, row1), max(row0, row1) + 1):
+            for col in range(min(col0, col1), max(col0, col1) + 1):
+                clusters.add((row, col))
+        paths = self.searchCluster(start, clusters)[1]
+        if end not in paths: return False
+        path = [end]
+        while path[-1] != start:
+            path.append(paths[path[-1]])
+        path.reverse()
+        return path
+
+    # Same return value as pathfinding.findPath, except distances and paths
+    # are None. Doesn't use the path cache.
+    def findPath(self, start, end):
+        result = self.findNearPath(start, end)
+        if result != None: return result
+        abstractPath = self.findAbstractPath(start, end)
+        if not abstractPath: return False
+        path = [start]
+        for i in range(len(abstractPath) - 1):
+            path += self.refineLeg(abstractPath[i], abstractPath[i+1])[1:]
+        return True, None, path, None
+
+    # Same as findPath, but when the path goes through entrances it stops at
+    # the end of the first leg. If start is the end of a leg found earlier,
+    # the next leg of that path is used without searching again, so enemies
+    # following legs one at a time walk the same path findPath would give.
+    # Used by the path cache.
+    def findFirstLeg(self, start, end):
+        if (start, end) in self.nextLegs:
+            self.nextLegs.move_to_end((start, end))
+            abstractPath = self.nextLegs[(start, end)]
+        else:
+            result = self.findNearPath(start, end)
+            if result != None: return result
+            abstractPath = self.findAbstractPath(start, end)
+            if not abstractPath: return False
+        if len(abstractPath) > 2:
+            self.nextLegs[(abstractPath[1], end)] = abstractPath[1:]
+            if len(self.nextLegs) > self.pathCache.maxSize:
+                self.nextLegs.popitem(last=False)
+        return True, None, self.refineLeg(start, abstractPath[1]), None
+
+    # Returns what findPath does when it doesn't need the entrances: False
+    # if start or end is a wall, the path if they're the same cell or
+    # findLocalPath finds one, and None otherwise.
+    def findNearPath(self, start, end):
+        if not (self.isOpen(start) and self.isOpen(end)): return False
+        if start == end: return True, None, [start], None
+        path = self.findLocalPath(start, end)
+        if path: return True, None, path, None
+        return None
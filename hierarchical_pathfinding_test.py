@@ -0,0 +1,132 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Hierarchical pathfinding test
+# Checks paths from HierarchicalPathfinder are real paths and close to as
+# short as the ones A* finds, on boards split into several clusters.
+
+import random
+import pathfinding, hierarchical_pathfinding
+
+# Returns map with walls around the edge and some random walls inside.
+def setup(rows=23, cols=31):
+    board = [["-"] * cols for i in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            if (row == 0 or col == 0 or row == rows-1 or col == cols-1 or
+                random.random() < .25):
+                board[row][col] = "#"
+    return board
+
+# Checks path goes from start to end one open cell at a time.
+def checkPath(board, path, start, end):
+    assert(path[0] == start and path[-1] == end)
+    for i in range(len(path) - 1):
+        assert(board[path[i+1][0]][path[i+1][1]] != "#")
+        assert(pathfinding.manhattan(path[i], path[i+1]) == 1)
+
+def test():
+    random.seed(112)
+    ratios = []
+    for i in range(3):
+        board = setup()
+        pathfinder = hierarchical_pathfinding.HierarchicalPathfinder(board,
+                                                                     "#", 5)
+        cells = [(row, col) for row in range(len(board))
+                 for col in range(len(board[0])) if board[row][col] != "#"]
+        for j in range(200):
+            start, end = random.sample(cells, 2)
+            result = pathfinding.aStar(board, start, end, "#")
+            path = pathfinder.findPath(start, end)
+            if not result:
+                assert(path == False)
+                assert(pathfinder.getNextCell(start, end) == None)
+                continue
+            path = path[2]
+            checkPath(board, path, start, end)
+            ratios.append((len(path) - 1) / (len(result[2]) - 1))
+
+            # Following getNextCell gets there too, though it can reuse the
+            # rest of a path found earlier instead of this one.
+            cell, steps = start, [start]
+            while cell != end and len(steps) <= len(cells):
+                cell = pathfinder.getNextCell(cell, end)
+                steps.append(cell)
+            checkPath(board, steps, start, end)
+    assert(sum(ratios) / len(ratios) < 1.1)
+    assert(max(ratios) <= 2)
+    hits, suffixHits, misses, evictions = pathfinder.pathCache.getStats()
+    assert(suffixHits > 0)
+
+    # Enemies stepping to the same goal at the same time share legs and
+    # paths in the cache, and still all get there.
+    goal = random.choice(cells)
+    field = pathfinding.FlowField(board, goal, "#")
+    walkers = [cell for cell in random.sample(cells, 60)
+               if field.getDistance(cell) != -1]
+    for step in range(len(cells)):
+        walkers = [pathfinder.getNextCell(cell, goal) or cell
+                   for cell in walkers]
+    assert(walkers == [goal] * len(walkers))
+
+    # A step that misses the cache turns only the first leg into cells, while
+    # findPath turns all of them.
+    legs = []
+    refineLeg = pathfinder.refineLeg
+    def countLeg(start, end):
+        legs.append((start, end))
+        return refineLeg(start, end)
+    pathfinder.refineLeg = countLeg
+    for start, end in [random.sample(cells, 2) for j in range(200)]:
+        abstractPath = pathfinder.findAbstractPath(start, end)
+        if (abstractPath and len(abstractPath) > 3 and
+            not pathfinder.findLocalPath(start, end)):
+            break
+    pathfinder.pathCache.clear()
+    legs.clear()
+    nextCell = pathfinder.getNextCell(start, end)
+    assert(legs == [(start, abstractPath[1])])
+    # The next step is on the same leg unless the leg was one step long.
+    if nextCell != abstractPath[1]:
+        assert(pathfinder.getNextCell(nextCell, end) != None)
+        assert(len(legs) == 1)
+    legs.clear()
+    pathfinder.findPath(start, end)
+    assert(len(legs) == len(abstractPath) - 1)
+
+    # Goal in the start's cluster, first with a path inside the cluster and
+    # then with a wall across the cluster so the path has to leave it.
+    board = [["-"] * 15 for i in range(15)]
+    pathfinder = hierarchical_pathfinding.HierarchicalPathfinder(board, "#", 5)
+    path = pathfinder.findPath((5, 5), (9, 9))[2]
+    checkPath(board, path, (5, 5), (9, 9))
+    assert(len(path) == 9)
+    for row in range(5, 10):
+        board[row][7] = "#"
+    pathfinder = hierarchical_pathfinding.HierarchicalPathfinder(board, "#", 5)
+    path = pathfinder.findPath((5, 5), (9, 9))[2]
+    checkPath(board, path, (5, 5), (9, 9))
+    assert(len(path) - 1 <= 2 * (len(pathfinding.aStar(board, (5, 5), (9, 9),
+                                                        "#")[2]) - 1))
+
+    # A wall added across a cached path: the cache keeps handing out the old
+    # path until updateCell, and afterwards steps go around the wall.
+    board = [["-"] * 15 for i in range(15)]
+    pathfinder = hierarchical_pathfinding.HierarchicalPathfinder(board, "#", 5)
+    start, goal = (7, 1), (7, 13)
+    path = pathfinder.getPathStart(start, goal)
+    wall = path[len(path)//2]
+    board[wall[0]][wall[1]] = "#"
+    assert(pathfinder.getPathStart(start, goal) == path)
+    pathfinder.updateCell(wall)
+    assert(wall not in pathfinder.getPathStart(start, goal))
+    cell, steps = start, [start]
+    while cell != goal and len(steps) <= 15 * 15:
+        cell = pathfinder.getNextCell(cell, goal)
+        steps.append(cell)
+    checkPath(board, steps, start, goal)
+    print("passed")
+
+test()
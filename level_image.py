@@ -0,0 +1,123 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# The parts of a level that don't move (background and walls) drawn once
+# into one big image when the level loads. Each frame only the part on
+# screen is cut out and drawn as a single image, instead of one image per
+# wall, and the same PhotoImage is reused while the view doesn't move. The
+# minimap's walls are drawn into an image the same way.
+
+# CITATION: Referenced Pillow docs https://pillow.readthedocs.io/en/stable/reference/Image.html
+
+import math
+import numpy as np
+from PIL import Image, ImageTk
+
+# Tkinter's "grey", which the board used to be filled with.
+BACKGROUND = (190, 190, 190)
+
+# Tkinter's "white", "black" and "brown", which the minimap used.
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BROWN = (165, 42, 42)
+
+# Levels bigger than this many pixels aren't drawn into an image.
+MAX_PIXELS = 16 * 1000 * 1000
+
+class LevelImage(object):
+    # walls is a 2d boolean array that is True for walls and wallImage is a
+    # cellSize by cellSize PIL image of one wall.
+    def __init__(self, walls, cellSize, wallImage, background=BACKGROUND):
+        rows, cols = walls.shape
+        self.cellSize = cellSize
+        self.wallImage = wallImage.convert("RGB")
+        self.background = background
+        self.image = Image.new("RGB", (cols * cellSize, rows * cellSize),
+                               background)
+        for row, col in zip(*walls.nonzero()):
+            self.setCell(row, col, True)
+        # Last view drawn and its PhotoImage.
+        self.view = None
+        self.photoImage = None
+
+    # Redraws cell (row, col) as a wall or as background.
+    def setCell(self, row, col, isWall):
+        x, y = int(col) * self.cellSize, int(row) * self.cellSize
+        if isWall:
+            self.image.paste(self.wallImage, (x, y))
+        else:
+            self.image.paste(self.background, (x, y, x + self.cellSize,
+                                               y + self.cellSize))
+        self.view = None
+
+    # Returns PIL image of the width by height part of the level with its
+    # top left corner at (left, top). Parts off the level are background.
+    def getView(self, left, top, width, height):
+        if (left >= 0 and top >= 0 and left + width <= self.image.width and
+            top + height <= self.image.height):
+            return self.image.crop((left, top, left + width, top + height))
+        view = Image.new("RGB", (width, height), self.background)
+        x0, y0 = max(left, 0), max(top, 0)
+        x1 = min(left + width, self.image.width)
+        y1 = min(top + height, self.image.height)
+        if x0 < x1 and y0 < y1:
+            view.paste(self.image.crop((x0, y0, x1, y1)), (x0 - left, y0 - top))
+        return view
+
+    # Same as getView but returns a PhotoImage, which is only made again if
+    # the view changed since the last call.
+    def getPhotoImage(self, left, top, width, height):
+        view = (math.floor(left), math.floor(top), int(width), int(height))
+        if view != self.view:
+            self.photoImage = ImageTk.PhotoImage(self.getView(*view))
+            self.view = view
+        return self.photoImage
+
+# Returns LevelImage, or None if the level is bigger than maxPixels.
+def makeLevelImage(walls, cellSize, wallImage, maxPixels=MAX_PIXELS):
+    rows, cols = walls.shape
+    if rows * cols * cellSize**2 > maxPixels: return None
+    return LevelImage(walls, cellSize, wallImage)
+
+# Minimap with one cellSize block per cell: a white box with a black outline
+# and each wall a brown square with a black outline, the same as drawing
+# them with create_rectangle.
+class MinimapImage(object):
+    def __init__(self, walls, cellSize=5):
+        self.walls = walls
+        self.cellSize = cellSize
+        self.photoImage = None
+        self.draw()
+
+    # Draws the image from walls again. Called after walls changed.
+    def draw(self):
+        rows, cols = self.walls.shape
+        cellSize = self.cellSize
+        pixels = np.empty((rows*cellSize + 1, cols*cellSize + 1, 3), np.uint8)
+        pixels[:, :] = BLACK
+        pixels[1:-1, 1:-1] = WHITE
+        # Outlines of walls next to each other overlap, so every outline is
+        # drawn before any inside.
+        cells = self.walls.nonzero()
+        for row, col in zip(*cells):
+            y, x = row*cellSize, col*cellSize
+            pixels[y:y+cellSize+1, x:x+cellSize+1] = BLACK
+        for row, col in zip(*cells):
+            y, x = row*cellSize, col*cellSize
+            pixels[y+1:y+cellSize, x+1:x+cellSize] = BROWN
+        self.image = Image.fromarray(pixels)
+        self.photoImage = None
+
+    # Returns the image as a PhotoImage, made again only after draw.
+    def getPhotoImage(self):
+        if self.photoImage == None:
+            self.photoImage = ImageTk.PhotoImage(self.image)
+        return self.photoImage
+
+# Returns MinimapImage, or None if it would be bigger than maxPixels.
+def makeMinimapImage(walls, cellSize=5, maxPixels=MAX_PIXELS):
+    rows, cols = walls.shape
+    if rows * cols * cellSize**2 > maxPixels: return None
+    return MinimapImage(walls, cellSize)
@@ -0,0 +1,74 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Path cache test
+# Checks hits, suffix reuse and which paths get evicted, counting the
+# searches the cache does on an open board.
+
+import pathfinding
+
+def test():
+    board = [["-"] * 10 for i in range(10)]
+    searches = []
+    def findPath(start, end):
+        searches.append((start, end))
+        return pathfinding.aStar(board, start, end, "#")
+    cache = pathfinding.PathCache(findPath, 2)
+
+    path = cache.getPath((0, 0), (0, 5))
+    assert(path == [(0, col) for col in range(6)])
+    path.append((9, 9))
+    assert(cache.getPath((0, 0), (0, 5)) == [(0, col) for col in range(6)])
+    assert(len(searches) == 1)
+
+    # Cells on a cached path get the rest of it without a search.
+    assert(cache.getPath((0, 3), (0, 5)) == [(0, 3), (0, 4), (0, 5)])
+    assert(len(searches) == 1)
+    assert(cache.getStats() == (2, 1, 1, 0))
+
+    # The suffix hit counts as using the path it came from, so the path added
+    # second is the one evicted when a third is added.
+    cache.getPath((5, 0), (5, 5))
+    cache.getPath((0, 1), (0, 5))
+    cache.getPath((9, 0), (9, 5))
+    assert(cache.getStats() == (3, 2, 3, 1))
+    cache.getPath((0, 2), (0, 5))
+    cache.getPath((5, 1), (5, 5))
+    assert(searches[-1] == ((5, 1), (5, 5)))
+    assert(cache.getStats() == (4, 3, 4, 2))
+
+    # Same end but a start that isn't on any cached path is a miss.
+    cache.getPath((1, 0), (0, 5))
+    assert(searches[-1] == ((1, 0), (0, 5)))
+
+    board[3][3] = "#"
+    cache.clear()
+    cache.getPath((3, 0), (3, 5))
+    assert(searches[-1] == ((3, 0), (3, 5)))
+    board[0][1] = board[1][0] = "#"
+    assert(cache.getPath((0, 0), (5, 5)) == False)
+    assert(cache.getPath((0, 0), (5, 5)) == False)
+    assert(searches.count(((0, 0), (5, 5))) == 1)
+
+    # Paths that stop short of the end are reused up to their last cell, and
+    # don't take cells over from whole paths.
+    def findPart(start, end):
+        searches.append((start, end))
+        path = pathfinding.aStar(board, start, end, "#")[2]
+        if start[1] == 0: return True, None, path[:4], None
+        return True, None, path, None
+    board[0][1] = board[1][0] = "-"
+    cache = pathfinding.PathCache(findPart)
+    searches.clear()
+    assert(cache.getPath((5, 0), (0, 5)) == [(5, 0), (4, 0), (3, 0), (2, 0)])
+    assert(cache.getPath((3, 0), (0, 5)) == [(3, 0), (2, 0)])
+    assert(cache.getPath((2, 0), (0, 5)) == [(2, 0), (1, 0), (0, 0), (0, 1)])
+    assert(searches == [((5, 0), (0, 5)), ((2, 0), (0, 5))])
+    cache.getPath((6, 1), (6, 5))
+    assert(cache.getPath((6, 0), (6, 5)) == [(6, 0), (6, 1), (6, 2), (6, 3)])
+    assert(cache.getPath((6, 2), (6, 5)) == [(6, 2), (6, 3), (6, 4), (6, 5)])
+    print("passed")
+
+test()
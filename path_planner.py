@@ -0,0 +1,159 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Runs enemy path planning on a background thread so an expensive replan
+# doesn't block the Tkinter event loop. The game submits requests, keeps
+# using its old paths, and picks up finished paths on a later timerFired.
+# Also has a scheduler that spreads replans over several ticks.
+
+# CITATION: Referenced threading docs https://docs.python.org/3/library/threading.html
+
+# CITATION: Referenced queue docs https://docs.python.org/3/library/queue.html
+
+import threading, queue, time
+import pathfinding, dstar_lite
+
+class BackgroundPlanner(object):
+    # The worker gets its own copy of board, so the game can keep changing
+    # the original without the worker ever seeing half of a change. If
+    # incremental is True each key keeps a D* Lite planner; otherwise one flow
+    # field per goal is shared by every request.
+    def __init__(self, board, obstacle="o", incremental=False):
+        self.board = tuple(tuple(row) for row in board)
+        self.obstacle = obstacle
+        self.incremental = incremental
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+
+        # Only used by the worker thread.
+        self.planners = dict()
+        self.flowField = None
+
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Asks for a path from start to goal. key identifies who the path is for
+    # (for example an Enemy), and a newer request for the same key replaces
+    # one that hasn't been planned yet.
+    def submit(self, key, start, goal):
+        self.requests.put((key, start, goal))
+
+    # Throws away key's planner and any request for it that hasn't been
+    # planned yet, for example when an enemy dies.
+    def forget(self, key):
+        self.requests.put((key, None, None))
+
+    # Returns list of (key, path) for every path finished since the last call.
+    # path is a list of cells from start to goal, or False if there isn't one.
+    def getResults(self):
+        results = []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    # Stops the worker thread once it finishes what it's doing. The worker
+    # throws away its planners on the way out.
+    def stop(self):
+        self.running = False
+        self.requests.put(None)
+
+    # Main loop of the worker thread.
+    def run(self):
+        while self.running:
+            request = self.requests.get()
+            # Only the newest request for each key matters.
+            latest = dict()
+            while request != None:
+                key, start, goal = request
+                latest.pop(key, None)
+                if start == None:
+                    self.planners.pop(key, None)
+                else:
+                    latest[key] = (start, goal)
+                try:
+                    request = self.requests.get_nowait()
+                except queue.Empty:
+                    request = None
+            for key in latest:
+                if not self.running: break
+                start, goal = latest[key]
+                self.results.put((key, self.plan(key, start, goal)))
+        self.planners = dict()
+        self.flowField = None
+
+    # Plans one path on the worker thread.
+    def plan(self, key, start, goal):
+        if self.incremental:
+            if key not in self.planners:
+                self.planners[key] = dstar_lite.DStarLite(self.board, start,
+                                                          goal, self.obstacle)
+            else:
+                self.planners[key].update(start, goal)
+            return self.planners[key].getPath()
+        if self.flowField == None or self.flowField.target != goal:
+            self.flowField = pathfinding.FlowField(self.board, goal,
+                                                   self.obstacle)
+        return self.flowField.getPath(start)
+
+# Queues replans and runs as many as fit in a time budget each tick, most
+# important first. Whatever doesn't fit waits for the next tick.
+class ReplanScheduler(object):
+    # budget is in milliseconds per tick.
+    def __init__(self, budget=5):
+        self.budget = budget
+        self.pending = []
+        self.queued = set([])
+
+        # Stats for tuning the budget.
+        self.lastTime = 0
+        self.totalTime = 0
+        self.maxTime = 0
+        self.lastProcessed = 0
+        self.maxQueueDepth = 0
+        self.ticks = 0
+
+    # Queues key for replanning unless it is already waiting.
+    def add(self, key):
+        if key not in self.queued:
+            self.queued.add(key)
+            self.pending.append(key)
+            self.maxQueueDepth = max(self.maxQueueDepth, len(self.pending))
+
+    def getQueueDepth(self):
+        return len(self.pending)
+
+    # Calls replan(key) for queued keys in order of priority(key) (lowest
+    # first) until the budget runs out. At least one key is always replanned
+    # so the queue can't stall.
+    def run(self, replan, priority):
+        startTime = time.perf_counter()
+        self.pending.sort(key=priority)
+        processed = 0
+        while processed < len(self.pending):
+            key = self.pending[processed]
+            processed += 1
+            self.queued.discard(key)
+            replan(key)
+            if (time.perf_counter() - startTime) * 1000 >= self.budget:
+                break
+        self.pending = self.pending[processed:]
+
+        self.lastTime = (time.perf_counter() - startTime) * 1000
+        self.totalTime += self.lastTime
+        self.maxTime = max(self.maxTime, self.lastTime)
+        self.lastProcessed = processed
+        self.ticks += 1
+
+    # Returns (queue depth, ms spent last tick, replans done last tick,
+    # average ms per tick, most ms spent in one tick, deepest the queue has
+    # been).
+    def getStats(self):
+        if self.ticks == 0: averageTime = 0
+        else: averageTime = self.totalTime / self.ticks
+        return (len(self.pending), self.lastTime, self.lastProcessed,
+                averageTime, self.maxTime, self.maxQueueDepth)
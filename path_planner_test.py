@@ -0,0 +1,78 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Background planner test
+# Checks paths planned on BackgroundPlanner's thread are as short as A*'s,
+# and that the worker lets go of planners for keys that are forgotten and
+# of all of them when it stops.
+
+import random, time
+import pathfinding, path_planner
+
+# Returns map with walls around the edge and some random walls inside.
+def setup(rows=15, cols=20):
+    board = [["-"] * cols for i in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            if (row == 0 or col == 0 or row == rows-1 or col == cols-1 or
+                random.random() < .25):
+                board[row][col] = "#"
+    return board
+
+# Waits for the worker to finish a path for every key in keys and returns
+# dict of {key: path}.
+def waitForResults(planner, keys):
+    results = dict()
+    endTime = time.time() + 10
+    while not set(keys) <= set(results) and time.time() < endTime:
+        for key, path in planner.getResults():
+            results[key] = path
+        time.sleep(.001)
+    assert(set(keys) <= set(results))
+    return results
+
+# Checks path is as short as A*'s between the same cells.
+def checkPath(board, path, start, goal):
+    result = pathfinding.aStar(board, start, goal, "#")
+    if not result:
+        assert(path == False)
+        return
+    assert(path[0] == start and path[-1] == goal)
+    assert(len(path) == len(result[2]))
+
+def test():
+    random.seed(112)
+    board = setup()
+    cells = [(row, col) for row in range(len(board))
+             for col in range(len(board[0])) if board[row][col] != "#"]
+    for incremental in [False, True]:
+        planner = path_planner.BackgroundPlanner(board, "#", incremental)
+        goal = random.choice(cells)
+        starts = dict()
+        for key in range(8):
+            starts[key] = random.choice(cells)
+            planner.submit(key, starts[key], goal)
+        results = waitForResults(planner, starts.keys())
+        for key in starts:
+            checkPath(board, results[key], starts[key], goal)
+        if incremental:
+            assert(set(planner.planners) == set(starts))
+
+        # Requests are handled in order, so once a later request is planned
+        # the forgotten keys are gone.
+        planner.submit(0, starts[0], goal)
+        planner.forget(0)
+        planner.forget(1)
+        planner.submit(2, starts[2], goal)
+        results = waitForResults(planner, [2])
+        assert(0 not in planner.planners and 1 not in planner.planners)
+
+        planner.stop()
+        planner.thread.join(10)
+        assert(not planner.thread.is_alive())
+        assert(planner.planners == dict() and planner.flowField == None)
+    print("passed")
+
+test()
@@ -0,0 +1,233 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Pathfinding shared by the game (term_project.py), tp.py and dijkstras_test.py.
+
+# CITATION: I referenced algorithm explanation at
+# https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
+
+# CITATION: Referenced A* explanation at https://en.wikipedia.org/wiki/A*_search_algorithm
+
+# CITATION: Referenced heapq docs https://docs.python.org/3/library/heapq.html
+
+# CITATION: Referenced OrderedDict docs for LRU cache
+# https://docs.python.org/3/library/collections.html#ordereddict-examples-and-recipes
+
+# CITATION: Referenced flow field explanation at
+# https://www.redblobgames.com/pathfinding/tower-defense/
+
+import heapq
+from collections import deque, OrderedDict
+
+# Up, left, right, down (same order the original visitCell checked them in).
+DIRECTIONS = [(-1, 0), (0, -1), (0, 1), (1, 0)]
+
+# Returns True if the cell is on the board and is not an obstacle.
+def isOpen(board, row, col, obstacle="o"):
+    return (0 <= row < len(board) and 0 <= col < len(board[0]) and
+            board[row][col] != obstacle)
+
+# Heuristic for A*. Enemies only move horizontally or vertically, so the
+# Manhattan distance never overestimates the real distance.
+def manhattan(cell, end):
+    return abs(cell[0] - end[0]) + abs(cell[1] - end[1])
+
+# Dijkstra's algorithm using a binary heap. Takes a 2d list board and a start
+# tuple and end tuple (row, col). If heuristic is given, the search becomes A*.
+# Returns (True, distances, path, paths), or False if there is no path.
+# distances holds the distance from start (-1 if not reached) and paths holds
+# the (drow, dcol) step from each reached cell back towards start.
+def findPath(board, start, end, obstacle="o", heuristic=None):
+    rows, cols = len(board), len(board[0])
+    distances = [[-1] * cols for i in range(rows)]
+    paths = [[0] * cols for i in range(rows)]
+    if not isOpen(board, start[0], start[1], obstacle): return False
+    if not isOpen(board, end[0], end[1], obstacle): return False
+
+    distances[start[0]][start[1]] = 0
+    if heuristic == None: priority = 0
+    else: priority = heuristic(start, end)
+    toVisit = [(priority, start)]
+    visited = set([])
+
+    while len(toVisit) > 0:
+        priority, current = heapq.heappop(toVisit)
+        if current in visited: continue
+        visited.add(current)
+        if current == end:
+            return True, distances, getPath(paths, start, end), paths
+
+        row, col = current
+        newDistance = distances[row][col] + 1
+        for drow, dcol in DIRECTIONS:
+            newRow, newCol = row + drow, col + dcol
+            if not isOpen(board, newRow, newCol, obstacle): continue
+            if (distances[newRow][newCol] == -1 or
+                distances[newRow][newCol] > newDistance):
+                distances[newRow][newCol] = newDistance
+                paths[newRow][newCol] = (-drow, -dcol)
+                if heuristic == None: priority = newDistance
+                else: priority = newDistance + heuristic((newRow, newCol), end)
+                heapq.heappush(toVisit, (priority, (newRow, newCol)))
+    return False
+
+# A* search with the Manhattan heuristic. Same return value as findPath.
+def aStar(board, start, end, obstacle="o"):
+    return findPath(board, start, end, obstacle, manhattan)
+
+# Creates path from start to end by following the steps in paths backwards
+# from end.
+def getPath(paths, start, end):
+    path = [end]
+    row, col = end
+    while (row, col) != start:
+        drow, dcol = paths[row][col]
+        row += drow
+        col += dcol
+        path.append((row, col))
+    path.reverse()
+    return path
+
+# Distance/direction field over the whole board towards a single target cell.
+# Built with one breadth-first search outwards from target, so every cell can
+# look up its next step towards target without searching again.
+class FlowField(object):
+    def __init__(self, board, target, obstacle="o"):
+        self.board = board
+        self.target = target
+        self.obstacle = obstacle
+        rows, cols = len(board), len(board[0])
+        self.distances = [[-1] * cols for i in range(rows)]
+        self.steps = [[0] * cols for i in range(rows)]
+        if isOpen(board, target[0], target[1], obstacle):
+            self.fill()
+
+    # Breadth-first search from target. Every step costs 1, so a queue gives
+    # the same distances as Dijkstra's algorithm in O(V).
+    def fill(self):
+        board, distances, steps = self.board, self.distances, self.steps
+        row, col = self.target
+        distances[row][col] = 0
+        toVisit = deque([self.target])
+        while len(toVisit) > 0:
+            row, col = toVisit.popleft()
+            newDistance = distances[row][col] + 1
+            for drow, dcol in DIRECTIONS:
+                newRow, newCol = row + drow, col + dcol
+                if (isOpen(board, newRow, newCol, self.obstacle) and
+                    distances[newRow][newCol] == -1):
+                    distances[newRow][newCol] = newDistance
+                    steps[newRow][newCol] = (-drow, -dcol)
+                    toVisit.append((newRow, newCol))
+
+    # Returns distance from cell to target, or -1 if target can't be reached.
+    def getDistance(self, cell):
+        row, col = cell
+        if not (0 <= row < len(self.board) and 0 <= col < len(self.board[0])):
+            return -1
+        return self.distances[row][col]
+
+    # Returns the next cell on the way from cell to target, or None if cell is
+    # the target or can't reach it.
+    def getNextCell(self, cell):
+        if self.getDistance(cell) <= 0: return None
+        drow, dcol = self.steps[cell[0]][cell[1]]
+        return (cell[0] + drow, cell[1] + dcol)
+
+    # Returns the full path from start to target, or False if there isn't one.
+    def getPath(self, start):
+        if self.getDistance(start) == -1: return False
+        path = [start]
+        nextCell = self.getNextCell(start)
+        while nextCell != None:
+            path.append(nextCell)
+            nextCell = self.getNextCell(nextCell)
+        return path
+
+# Least-recently-used cache of paths in front of a pathfinding function.
+# findPath takes (start, end) and returns the same thing as findPath above.
+# The rest of a path to end from any cell on it is also a path to end (and a
+# shortest one if the path was), so a cached path that goes through start is
+# reused from start onwards. findPath may also return just the first part of
+# the way to end. Then every cell on it but the last is reused the same way,
+# and the last one gets searched from again. Cells on a whole path keep using
+# it even if a part of a path through them is found later, so an enemy that
+# got onto a whole path doesn't get led back off it.
+class PathCache(object):
+    def __init__(self, findPath, maxSize=256):
+        self.findPath = findPath
+        self.maxSize = maxSize
+        self.paths = OrderedDict()
+        # Maps (cell, end) to the key of a cached path to end through cell.
+        self.suffixes = dict()
+        self.hits = 0
+        self.suffixHits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Returns a path from start to end (a new list every time, so callers can
+    # change it), or False if there isn't one.
+    def getPath(self, start, end):
+        key = (start, end)
+        if key in self.paths:
+            self.hits += 1
+            self.paths.move_to_end(key)
+            return self.copyPath(self.paths[key])
+
+        # Suffixes aren't stored again; the path they come from counts as
+        # used instead.
+        if key in self.suffixes:
+            self.hits += 1
+            self.suffixHits += 1
+            fullKey = self.suffixes[key]
+            self.paths.move_to_end(fullKey)
+            fullPath = self.paths[fullKey]
+            return fullPath[fullPath.index(start):]
+
+        self.misses += 1
+        result = self.findPath(start, end)
+        if result: path = result[2]
+        else: path = False
+        self.store(key, path)
+        return self.copyPath(path)
+
+    def copyPath(self, path):
+        if path == False: return False
+        return list(path)
+
+    def store(self, key, path):
+        self.paths[key] = path
+        isPart = self.isPart(key, path)
+        for cell in self.getSuffixCells(key, path):
+            oldKey = self.suffixes.get((cell, key[1]))
+            if (not isPart or oldKey == None or
+                self.isPart(oldKey, self.paths[oldKey])):
+                self.suffixes[(cell, key[1])] = key
+        if len(self.paths) > self.maxSize:
+            oldKey, oldPath = self.paths.popitem(last=False)
+            self.evictions += 1
+            for cell in self.getSuffixCells(oldKey, oldPath):
+                if self.suffixes.get((cell, oldKey[1])) == oldKey:
+                    del self.suffixes[(cell, oldKey[1])]
+
+    # Returns True if path, stored for key, stops before key's end.
+    def isPart(self, key, path):
+        return path != False and path[-1] != key[1]
+
+    # Returns the cells of the path stored for key that can be reused as the
+    # start of a path to key's end.
+    def getSuffixCells(self, key, path):
+        if path == False: return []
+        if self.isPart(key, path): return path[:-1]
+        return path
+
+    # Throws away every cached path. Call whenever the board changes.
+    def clear(self):
+        self.paths.clear()
+        self.suffixes.clear()
+
+    # Returns (hits, suffixHits, misses, evictions).
+    def getStats(self):
+        return self.hits, self.suffixHits, self.misses, self.evictions
@@ -0,0 +1,193 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Every projectile in the game kept in NumPy arrays (one array per value)
+# instead of one object each, so moving them and checking what they hit is a
+# few array operations per tick however many there are. Slots of removed
+# projectiles go on a free list and get reused.
+
+# CITATION: Referenced NumPy docs https://numpy.org/doc/stable/reference/index.html
+
+import math
+import numpy as np
+
+# Pixels a projectile moves per tick at full speed.
+SPEED = 15
+
+class ProjectilePool(object):
+    def __init__(self, capacity=256):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        # Velocity in pixels per tick at full speed.
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.r = np.zeros(capacity)
+        self.harmful = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Free slots, lowest last so they're used first.
+        self.free = list(range(capacity - 1, -1, -1))
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # Doubles the number of slots.
+    def grow(self):
+        capacity = len(self.x)
+        for name in ["x", "y", "vx", "vy", "r", "harmful", "alive"]:
+            values = getattr(self, name)
+            setattr(self, name, np.concatenate([values, np.zeros_like(values)]))
+        self.free = list(range(2*capacity - 1, capacity - 1, -1)) + self.free
+
+    # Adds projectile at (x, y) heading towards (dx, dy) and returns its slot.
+    # harmful projectiles hurt the player, the others hurt enemies.
+    def add(self, x, y, dx, dy, r, harmful, speed=SPEED):
+        if len(self.free) == 0: self.grow()
+        i = self.free.pop()
+        mag = (dx**2 + dy**2)**.5
+        if mag != 0: a = 1/mag
+        else: a = 1
+        self.x[i], self.y[i] = x, y
+        self.vx[i], self.vy[i] = a*dx*speed, a*dy*speed
+        self.r[i] = r
+        self.harmful[i] = harmful
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    # Removes projectiles in the array of slots. Slots that are already free
+    # are skipped.
+    def remove(self, slots):
+        slots = np.unique(slots)
+        slots = slots[self.alive[slots]]
+        self.alive[slots] = False
+        self.vx[slots] = 0
+        self.vy[slots] = 0
+        self.free.extend(slots.tolist())
+        self.count -= len(slots)
+
+    def clear(self):
+        self.remove(self.getLive())
+
+    # Returns number of projectiles with the given harmful flag.
+    def getCount(self, harmful):
+        return int(np.count_nonzero(self.alive & (self.harmful == harmful)))
+
+    # Returns array of slots of every projectile.
+    def getLive(self):
+        return np.nonzero(self.alive)[0]
+
+    # Returns the fastest speed of any projectile in pixels per tick.
+    def getMaxSpeed(self):
+        if self.count == 0: return 0
+        return float(np.sqrt(self.vx**2 + self.vy**2).max())
+
+    # Moves every projectile. Free slots have no velocity so they stay put.
+    def move(self, timeScale):
+        self.x += self.vx * timeScale
+        self.y += self.vy * timeScale
+
+    # Returns array of slots of projectiles with the given harmful flag that
+    # touch the circle of radius r around (x, y).
+    def findHits(self, x, y, r, harmful):
+        slots = np.nonzero(self.alive & (self.harmful == harmful))[0]
+        dx = self.x[slots] - x
+        dy = self.y[slots] - y
+        return slots[dx**2 + dy**2 <= (self.r[slots] + r)**2]
+
+    # Finds projectiles with the given harmful flag that touch items of
+    # spatialHash (a collision.SpatialHash of objects with x, y and r). Items
+    # are only tested against projectiles in their own cell and the cells
+    # around it. Returns (hits, candidates), where hits is a list of
+    # (item, array of slots that touch it) and candidates is how many
+    # projectile-item pairs were tested.
+    def findHitsIn(self, spatialHash, harmful):
+        slots = np.nonzero(self.alive & (self.harmful == harmful))[0]
+        if len(slots) == 0 or len(spatialHash.cells) == 0: return [], 0
+        cellSize = spatialHash.cellSize
+        rows = np.floor(self.y[slots] / cellSize).astype(int)
+        cols = np.floor(self.x[slots] / cellSize).astype(int)
+        # A hit can be at most this many cells away.
+        size = int((self.r[slots].max() + spatialHash.maxR) // cellSize) + 1
+
+        # Sorted by cell, each row of neighboring cells is one run of keys.
+        minCol, maxCol = cols.min(), cols.max()
+        width = maxCol - minCol + 1
+        keys = rows * width + (cols - minCol)
+        order = np.argsort(keys, kind="stable")
+        slots, keys = slots[order], keys[order]
+
+        # Look up the runs for every cell of the hash at once.
+        cells = list(spatialHash.cells.keys())
+        cellRows = np.array([cell[0] for cell in cells])
+        cellCols = np.array([cell[1] for cell in cells])
+        startCols = np.maximum(cellCols - size, minCol) - minCol
+        endCols = np.minimum(cellCols + size, maxCol) - minCol
+        drows = np.arange(-size, size + 1)
+        starts = (cellRows[:, None] + drows) * width
+        left = np.searchsorted(keys, starts + startCols[:, None], "left")
+        right = np.searchsorted(keys, starts + endCols[:, None], "right")
+        right = np.maximum(right, left)
+        counts = (right - left).sum(axis=1)
+
+        hits = []
+        candidates = 0
+        for i in np.nonzero(counts)[0]:
+            items = spatialHash.cells[cells[i]]
+            nearby = np.concatenate([slots[left[i, j]:right[i, j]]
+                                     for j in range(len(drows))])
+            candidates += len(nearby) * len(items)
+            x, y, r = self.x[nearby], self.y[nearby], self.r[nearby]
+            for item in items:
+                touching = (x - item.x)**2 + (y - item.y)**2 <= (r + item.r)**2
+                if touching.any():
+                    hits.append((item, nearby[touching]))
+        return hits, candidates
+
+    # Returns array of slots of projectiles that touch a wall, with walls a
+    # 2d boolean array that is True for walls. Same test as
+    # Entity.collidesWithObstacle, but only the walls in the cells around
+    # each projectile are looked at. With a distance_field.DistanceField of
+    # walls, projectiles that are certainly clear of every wall aren't
+    # looked at either.
+    def findWallHits(self, walls, cellSize, distanceField=None):
+        slots = self.getLive()
+        if distanceField != None and len(slots) > 0:
+            distances = distanceField.getDistances(self.x[slots], self.y[slots])
+            slots = slots[distances - distanceField.error <= self.r[slots]]
+        if len(slots) == 0: return slots
+        x, y, r = self.x[slots], self.y[slots], self.r[slots]
+        squareR = cellSize/2
+        # collidesWithObstacle can be True up to this far from a wall's center.
+        reach = r.max() + squareR * 2**.5
+        size = math.ceil(reach / cellSize)
+        row = np.floor(y / cellSize).astype(int)
+        col = np.floor(x / cellSize).astype(int)
+        rows, cols = walls.shape
+
+        hit = np.zeros(len(slots), dtype=bool)
+        for drow in range(-size, size + 1):
+            for dcol in range(-size, size + 1):
+                wallRow, wallCol = row + drow, col + dcol
+                near = (~hit & (wallRow >= 0) & (wallRow < rows) &
+                        (wallCol >= 0) & (wallCol < cols))
+                near[near] = walls[wallRow[near], wallCol[near]]
+                if not near.any(): continue
+                squareX = (wallCol[near] + .5) * cellSize
+                squareY = (wallRow[near] + .5) * cellSize
+                hit[near] = collidesWithSquare(x[near], y[near], r[near],
+                                               squareX, squareY, squareR)
+        return slots[hit]
+
+# Entity.collidesWithObstacle for arrays of circles and squares.
+def collidesWithSquare(x, y, r, squareX, squareY, squareR):
+    dx = np.abs(squareX - x)
+    dy = np.abs(squareY - y)
+    distance = (dx**2 + dy**2)**.5
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.cos(np.arccos(np.where(dx > dy, dx, dy) / distance))
+        d = squareR / a
+    return ((distance < squareR) |
+            ((distance <= r + squareR * 2**.5) & (distance < d + r)))
@@ -0,0 +1,157 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Projectile pool test
+# Moves the same projectiles as ProjectilePool slots and as one Entity each,
+# the way the game used to keep them, and checks the pool finds the same
+# hits on the player, enemies and walls as looping over every object, and
+# removes exactly those. The pool starts small so it has to grow. Also
+# checks a distance field doesn't make findWallHits miss walls.
+
+import random, math
+import numpy as np
+import entities, collision, distance_field, projectile_pool
+
+CELL_SIZE = 50
+
+# Returns 2d boolean array with walls around the edge and some random walls
+# inside.
+def setup(rows=20, cols=20):
+    walls = np.zeros((rows, cols), dtype=bool)
+    for row in range(rows):
+        for col in range(cols):
+            walls[row, col] = (row == 0 or col == 0 or row == rows-1 or
+                               col == cols-1 or random.random() < .15)
+    return walls
+
+# Adds a random projectile to the pool and returns it as an Entity with the
+# same position, heading and speed.
+def addProjectile(pool, walls):
+    rows, cols = walls.shape
+    x = random.uniform(0, cols * CELL_SIZE)
+    y = random.uniform(0, rows * CELL_SIZE)
+    dx, dy = random.uniform(-1, 1), random.uniform(-1, 1)
+    r = random.choice([5, 10])
+    harmful = random.random() < .5
+    slot = pool.add(x, y, dx, dy, r, harmful)
+    projectile = entities.Entity(x, y, r)
+    projectile.dx, projectile.dy = dx, dy
+    projectile.speedScale = projectile_pool.SPEED
+    return slot, projectile, harmful
+
+# Old GameMode hit checks: every projectile against the player or every
+# enemy, and against every wall. Returns (player hits, set of (enemy, slot)
+# pairs, wall hits), the hits as sets of slots.
+def findHitsOld(projectiles, player, enemies, walls):
+    playerHits = set([])
+    enemyHits = set([])
+    wallHits = set([])
+    for slot, (p, harmful) in projectiles.items():
+        if harmful:
+            if (p.x-player.x)**2 + (p.y-player.y)**2 <= (p.r + player.r)**2:
+                playerHits.add(slot)
+        else:
+            for e in enemies:
+                if (p.x-e.x)**2 + (p.y-e.y)**2 <= (p.r + e.r)**2:
+                    enemyHits.add((e, slot))
+        for row, col in zip(*np.nonzero(walls)):
+            if p.collidesWithObstacle((col+.5)*CELL_SIZE, (row+.5)*CELL_SIZE,
+                                      CELL_SIZE/2):
+                wallHits.add(slot)
+    return playerHits, enemyHits, wallHits
+
+# Same as findHitsOld with the pool.
+def findHitsNew(pool, player, enemies, walls):
+    playerHits = pool.findHits(player.x, player.y, player.r, True)
+    enemyHash = collision.SpatialHash(CELL_SIZE)
+    for e in enemies:
+        enemyHash.add(e, e.x, e.y, e.r)
+    enemyHits, candidates = pool.findHitsIn(enemyHash, False)
+    assert(candidates <= pool.getCount(False) * len(enemies))
+    pairs = set([(e, slot) for e, slots in enemyHits for slot in slots])
+    assert(len(pairs) == sum([len(slots) for e, slots in enemyHits]))
+    wallHits = pool.findWallHits(walls, CELL_SIZE)
+    return (set(playerHits.tolist()), pairs, set(wallHits.tolist()))
+
+# Returns the exact distance from (x, y) to the nearest wall, up to
+# distance_field.MAX_DISTANCE cells.
+def getExactDistance(walls, x, y):
+    rows, cols = np.nonzero(walls)
+    dx = np.maximum(np.maximum(cols*CELL_SIZE - x, x - (cols+1)*CELL_SIZE), 0)
+    dy = np.maximum(np.maximum(rows*CELL_SIZE - y, y - (rows+1)*CELL_SIZE), 0)
+    return min(np.sqrt(dx**2 + dy**2).min(),
+               distance_field.MAX_DISTANCE * CELL_SIZE)
+
+def test():
+    random.seed(112)
+    walls = setup()
+    rows, cols = walls.shape
+    pool = projectile_pool.ProjectilePool(8)
+    projectiles = dict()
+    player = entities.Entity(cols/2 * CELL_SIZE, rows/2 * CELL_SIZE, 20)
+    enemies = [entities.Entity(random.uniform(0, cols * CELL_SIZE),
+                               random.uniform(0, rows * CELL_SIZE), 20)
+               for i in range(30)]
+    grown = False
+    for tick in range(20):
+        for i in range(20):
+            slot, projectile, harmful = addProjectile(pool, walls)
+            assert(slot not in projectiles)
+            projectiles[slot] = (projectile, harmful)
+        grown = grown or len(pool.x) > 8
+        pool.move(1)
+        for p, harmful in projectiles.values():
+            p.move(1)
+        for slot, (p, harmful) in projectiles.items():
+            assert(pool.x[slot] == p.x and pool.y[slot] == p.y)
+
+        old = findHitsOld(projectiles, player, enemies, walls)
+        new = findHitsNew(pool, player, enemies, walls)
+        assert(old == new)
+
+        # Everything that hit something is removed, and nothing else.
+        removed = old[0] | set([slot for e, slot in old[1]]) | old[2]
+        pool.remove(np.array(sorted(removed), dtype=int))
+        for slot in removed:
+            del projectiles[slot]
+        assert(set(pool.getLive().tolist()) == set(projectiles))
+        assert(len(pool) == len(projectiles))
+    assert(grown)
+
+    # Skipping projectiles the distance field says are clear of every wall
+    # doesn't lose any hits, even around wall corners where the field is
+    # furthest off (up to spacing * sqrt(2)), and with few samples per cell.
+    for resolution in [distance_field.RESOLUTION, 2]:
+        field = distance_field.DistanceField(walls, CELL_SIZE, resolution)
+        field.build()
+        pool = projectile_pool.ProjectilePool()
+        projectiles = dict()
+        skipped = 0
+        for row, col in random.sample(list(zip(*np.nonzero(walls))), 30):
+            for cornerRow, cornerCol in [(row, col), (row, col+1),
+                                         (row+1, col), (row+1, col+1)]:
+                for i in range(4):
+                    r = random.choice([5, 10])
+                    angle = random.uniform(0, 2 * math.pi)
+                    distance = random.uniform(0, r + 2 * field.error)
+                    x = cornerCol * CELL_SIZE + distance * math.cos(angle)
+                    y = cornerRow * CELL_SIZE + distance * math.sin(angle)
+                    slot = pool.add(x, y, 0, 0, r, False)
+                    projectiles[slot] = (entities.Entity(x, y, r), False)
+                    distance = field.getDistance(x, y)
+                    exact = getExactDistance(walls, x, y)
+                    # Off the board the field reads its edge instead.
+                    if (exact > 0 and 0 <= x <= cols * CELL_SIZE and
+                        0 <= y <= rows * CELL_SIZE):
+                        assert(abs(distance - exact) <= field.error)
+                    if distance - field.error > r:
+                        skipped += 1
+        wallHits = findHitsOld(projectiles, player, [], walls)[2]
+        assert(set(pool.findWallHits(walls, CELL_SIZE, field).tolist()) ==
+               wallHits)
+        assert(0 < skipped < len(projectiles) - len(wallHits))
+    print("passed")
+
+test()
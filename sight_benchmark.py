@@ -0,0 +1,105 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Line of sight benchmark
+# Times the two ways the game can check whether enemies see the player when
+# the level has no visibility table, for different numbers of enemies:
+# Enemy.canSeePlayer looking up each enemy's cell in the player's field of
+# view, and isInFieldOfViewBatch looking up all of them at once. Prints where
+# the batch starts winning, which is what GameMode.batchSightSize is set
+# from. Also times exact rays one at a time against canSeeBatch.
+
+import random, time
+import numpy as np
+import visibility, entities
+
+# Returns a size x size board with walls around the edge and some random
+# walls inside.
+def makeBoard(size, wallChance=.15):
+    board = [[""] * size for i in range(size)]
+    for row in range(size):
+        for col in range(size):
+            if (row == 0 or col == 0 or row == size-1 or col == size-1 or
+                random.random() < wallChance):
+                board[row][col] = "o"
+    return board
+
+# The parts of GameMode that Enemy.canSeePlayer uses, for a level without a
+# visibility table.
+class SightApp(object):
+    def __init__(self, board, player, cellSize):
+        self.visibilityTable = None
+        self.cellSize = cellSize
+        self.player = entities.Player(player[0], player[1], entities.Pistol())
+        self.fieldOfView = visibility.getFieldOfView(board,
+                                                     self.getCell(*player))
+        self.fieldOfViewMask = visibility.getFieldOfViewMask(self.fieldOfView,
+                                                             len(board),
+                                                             len(board[0]))
+
+    def getCell(self, x, y):
+        return (int(y//self.cellSize), int(x//self.cellSize))
+
+# Returns average seconds per call of f over repeats calls.
+def timeIt(f, repeats):
+    startTime = time.perf_counter()
+    for i in range(repeats):
+        f()
+    return (time.perf_counter() - startTime) / repeats
+
+# Prints ms per call of scalar and batch for each number of enemies, and
+# returns the first number where batch is faster.
+def compare(board, player, cellSize, repeats, makeCalls):
+    crossover = None
+    for count in [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]:
+        enemies = [(random.uniform(cellSize, (len(board)-1) * cellSize),
+                    random.uniform(cellSize, (len(board)-1) * cellSize))
+                   for i in range(count)]
+        scalar, batch = makeCalls(enemies)
+        assert(scalar() == batch())
+        scalarTime = timeIt(scalar, repeats) * 1000
+        batchTime = timeIt(batch, repeats) * 1000
+        print("%7d  %9.3f  %8.3f" % (count, scalarTime, batchTime))
+        if crossover == None and batchTime < scalarTime:
+            crossover = count
+    return crossover
+
+def benchmark(size=100, cellSize=50, repeats=20):
+    random.seed(112)
+    board = makeBoard(size)
+    walls = np.array([[cell == "o" for cell in row] for row in board])
+    player = (size/2 * cellSize, size/2 * cellSize)
+    app = SightApp(board, player, cellSize)
+
+    # What GameMode.getEnemySight does either way, starting from the enemies.
+    def fieldOfViewCalls(positions):
+        enemies = [entities.Enemy(x, y, entities.Pistol())
+                   for x, y in positions]
+        def scalar():
+            return [enemy.canSeePlayer(app) for enemy in enemies]
+        def batch():
+            points = [(enemy.x, enemy.y) for enemy in enemies]
+            return visibility.isInFieldOfViewBatch(app.fieldOfViewMask,
+                                                   points, cellSize).tolist()
+        return scalar, batch
+
+    def rayCalls(enemies):
+        def scalar():
+            return [visibility.canSee(board, enemy, player, cellSize)
+                    for enemy in enemies]
+        def batch():
+            return visibility.canSeeBatch(walls, enemies, player,
+                                          cellSize).tolist()
+        return scalar, batch
+
+    print("enemies  canSeePlayer ms  batch ms")
+    crossover = compare(board, player, cellSize, repeats, fieldOfViewCalls)
+    print("Field of view batch is faster from", crossover, "enemies")
+    print("enemies  raycast ms  canSeeBatch ms")
+    rayCrossover = compare(board, player, cellSize, repeats, rayCalls)
+    print("canSeeBatch is faster than raycast from", rayCrossover, "enemies")
+    return crossover
+
+benchmark()
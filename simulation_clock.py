@@ -0,0 +1,64 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Fixed timestep clock for the game. The timer doesn't fire exactly every
+# timerDelay (drawing a frame delays the next one), so instead of doing one
+# game tick per timerFired, the clock measures how much real time passed and
+# says how many ticks of stepTime fit in it. Leftover time is carried over to
+# the next frame. If frames get so slow that more than maxSteps ticks are
+# owed, the rest are dropped and the game slows down instead of spending
+# every frame catching up.
+
+# CITATION: Referenced "Fix Your Timestep!" by Glenn Fiedler at
+# https://gafferongames.com/post/fix_your_timestep/
+
+import time
+
+class SimulationClock(object):
+    # stepTime is in seconds.
+    def __init__(self, stepTime, maxSteps=4):
+        self.stepTime = stepTime
+        self.maxSteps = maxSteps
+        self.accumulator = 0
+        self.lastTime = None
+
+        # Stats, see getStats.
+        self.lastSteps = 0
+        self.totalSteps = 0
+        self.frames = 0
+        self.droppedTime = 0
+
+    # Forgets the time since the last advance, so the next one does a single
+    # step. Used when the game comes back from being paused.
+    def reset(self):
+        self.accumulator = 0
+        self.lastTime = None
+
+    # Returns how many steps to run for the time since the last call. now is
+    # the time in seconds, from time.perf_counter if not given.
+    def advance(self, now=None):
+        if now == None: now = time.perf_counter()
+        if self.lastTime == None: self.lastTime = now - self.stepTime
+        self.accumulator += now - self.lastTime
+        self.lastTime = now
+        steps = int(self.accumulator // self.stepTime)
+        if steps > self.maxSteps:
+            self.droppedTime += (steps - self.maxSteps) * self.stepTime
+            steps = self.maxSteps
+            self.accumulator = self.accumulator % self.stepTime
+        else:
+            self.accumulator -= steps * self.stepTime
+
+        self.lastSteps = steps
+        self.totalSteps += steps
+        self.frames += 1
+        return steps
+
+    # Returns (steps last frame, average steps per frame, seconds of game
+    # time dropped because frames were too slow).
+    def getStats(self):
+        if self.frames == 0: averageSteps = 0
+        else: averageSteps = self.totalSteps / self.frames
+        return (self.lastSteps, averageSteps, self.droppedTime)
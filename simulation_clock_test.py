@@ -0,0 +1,50 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Simulation clock test
+# Feeds SimulationClock made up frame times and checks it runs one step per
+# stepTime of real time, carries leftover time between frames, drops time
+# past maxSteps and starts over after a reset. Times are multiples of 1/8 so
+# they add up exactly.
+
+import simulation_clock
+
+def test():
+    clock = simulation_clock.SimulationClock(.25)
+
+    # The first frame does one step, then steps follow the time that passed.
+    assert(clock.advance(10) == 1)
+    assert(clock.advance(10.125) == 0)
+    assert(clock.advance(10.5) == 2)
+    assert(clock.advance(10.75) == 1)
+
+    # Uneven frames add up to one step per stepTime overall.
+    now, steps = 10.75, 0
+    for i in range(40):
+        now += [.125, .375, .5, .25][i % 4]
+        steps += clock.advance(now)
+    assert(steps == (now - 10.75) / .25)
+    assert(clock.getStats()[0] == 1 and clock.getStats()[2] == 0)
+
+    # A long frame runs at most maxSteps steps and drops the rest, keeping
+    # only the part of a step that was left over.
+    assert(clock.advance(now + 10.125) == 4)
+    lastSteps, averageSteps, droppedTime = clock.getStats()
+    assert(lastSteps == 4 and droppedTime == 10 - 4 * .25)
+    assert(clock.advance(now + 10.25) == 1)
+
+    # After a reset the time in between doesn't count.
+    clock.reset()
+    assert(clock.advance(now + 100) == 1)
+    assert(clock.advance(now + 100.25) == 1)
+    assert(clock.getStats()[2] == droppedTime)
+
+    clock = simulation_clock.SimulationClock(.25, 2)
+    clock.advance(0)
+    assert(clock.advance(1) == 2)
+    assert(clock.getStats() == (2, 1.5, .5))
+    print("passed")
+
+test()
@@ -23,306 +23,25 @@
 # CITATION: Referenced simpleaudio docs https://simpleaudio.readthedocs.io/en/latest/
 
 import math, time, json
-import level_generator
-from PIL import Image
-import simpleaudio as sa
+import level_generator, pathfinding, distance_table
+import hierarchical_pathfinding, path_planner, tile_board, visibility
+import collision, projectile_pool, entities, distance_field
+import simulation_clock, level_image, canvas_items, assets
+import numpy as np
 
 # CITATION: Tkinter graphics wrapper from CMU 15-112 https://www.cs.cmu.edu/~112/index.html
 from cmu_112_graphics import *
 
-# Parent class of Person and Projectile classes.
-class Entity(object):
-    def __init__(self, x, y, r):
-        self.x = x
-        self.y = y
-        self.dx = 0
-        self.dy = 0
-        self.r = r
-        self.speedScale = 0
-
-    # Moves entity in direction specified by dx and dy, scaled by timeScale and 
-    # the speed of the entity (speedScale).
-    def move(self, timeScale):
-        mag = (self.dx**2 + self.dy**2)**.5
-        if mag != 0: a = 1/mag
-        else: a = 1
-        self.x += a*self.dx*self.speedScale*timeScale
-        self.y += a*self.dy*self.speedScale*timeScale
-
-    # Similar to the move method, except it returns (dx, dy) instead of actually
-    # the move.
-    def getMove(self, timeScale):
-        mag = (self.dx**2 + self.dy**2)**.5
-        if mag != 0: a = 1/mag
-        else: a = 1
-        return (a*self.dx*self.speedScale*timeScale,a*self.dy*self.speedScale*timeScale)
-
-    # Checks if entity collides with square at given location.
-    def checkObstacleCollision(self, squareX, squareY, squareR):
-        xLeft = squareX - (self.x + self.r)
-        xRight = (self.x - self.r) - (2 * squareR + squareX)
-        yTop = squareY - (self.y + self.r)
-        yBottom = (self.y - self.r) - (2 * squareR + squareY)
-        
-        minDistance = min(abs(xLeft), abs(xRight), abs(yTop), abs(yBottom))
-
-        if abs(xLeft) == minDistance:
-            return xLeft < 0
-        elif abs(xRight) == minDistance:
-            return xRight < 0
-        elif abs(yTop) == minDistance:
-            return yTop < 0
-        elif abs(yBottom) == minDistance:
-            return yBottom < 0
-
-    # Collision detection for circular entity and square obstacle.
-    # squareX and squareY should be center of square.
-    def collidesWithObstacle(self, squareX, squareY, squareR):
-        r = ((squareX-self.x)**2 + (squareY-self.y)**2)**.5
-        if r < squareR: return True
-        elif r > self.r + squareR*(2)**.5: return False
-
-        if abs(squareX - self.x) > abs(squareY - self.y):
-            a = math.cos(math.acos(abs(squareX-self.x)/r))
-        else:
-            a = math.cos(math.acos(abs(squareY-self.y)/r))
-        d = squareR/a
-        return r < d + self.r
-
-    # Collision detection for square entity and square obstacle.
-    # Returns (True/False, sideOfCollision).
-    def rectCollidesWithObstacle(self, playerX, playerY, squareX, squareY, squareR):
-        xCollides = False
-        yCollides = False
-        if playerX < squareX:
-            if squareX - playerX < squareR + self.r:
-                # return (True, "left")
-                xCollides = True
-        elif playerX > squareX:
-            if playerX - squareX < squareR + self.r:
-                # return (True, "right")
-                xCollides = True
-
-        if playerY < squareY:
-            if squareY - playerY < squareR + self.r:
-                # return (True, "top")
-                yCollides = True
-        elif playerY > squareY:
-            if playerY - squareY < squareR + self.r:
-                # return (True, "bottom")
-                yCollides = True
-
-        return (xCollides and yCollides, None)
-
-# Parent class of Enemy and Player
-class Person(Entity):
-    def __init__(self, x, y, r, weapon):
-        super().__init__(x, y, r)
-        self.weapon = weapon
-
-# Class to represent the player.
-class Player(Person):
-    def __init__(self, x, y, weapon):
-        super().__init__(x, y, 20, weapon)
-        self.startX = x
-        self.startY = y
-        self.speedScale = 10
-        self.row = -1
-        self.col = -1
-
-    # Moves player, and updates paths for enemies.
-    # FIX: only check for new paths when player changes cells.
-    def move(self, timeScale, app):
-        super().move(timeScale)
-        newRow, newCol = app.getCell(self.x, self.y)
-        if newRow != self.row or newCol != self.col:
-            app.calculateEnemyPaths()
-            self.row, self.col = newRow, newCol
-
-# Class to represent enemies.
-class Enemy(Person):
-    def __init__(self, x, y, weapon):
-        super().__init__(x, y, 20, weapon)
-        self.triggered = False
-        self.speedScale = 10*.75
-        self.foundPlayer = False
-        self.seesPlayer = False
-
-    # Move function for Enemy class.
-    # Moves entity in direction specified by dx and dy, scaled by timeScale and 
-    # the speed of the entity (speedScale).
-    # Assumes enemy will only be moving horizontally or vertically.
-    def move(self, timeScale, app):
-        if self.foundPlayer: return
-        if self.triggered:
-            self.followPath()
-        mag = (self.dx**2 + self.dy**2)**.5
-        if mag != 0: a = 1/mag
-        else: a = 1
-        dx = a*self.dx*self.speedScale*timeScale
-        dy = a*self.dy*self.speedScale*timeScale
-
-        if len(self.path) < 2: 
-            self.x += dx
-            self.y += dy
-            return
-
-        # Ensure enemy doesn't move beyond center of next square on path
-        targetX, targetY = app.getCoords(self.path[1][0], self.path[1][1])
-        if (dx != 0 and (self.x <= targetX <= self.x + dx or 
-            self.x >= targetX >= self.x +dx)):
-            self.x = targetX
-            self.path.pop(0)
-            self.followPath()
-        elif (dy != 0 and (self.y <= targetY <= self.y + dy or 
-            self.y >= targetY >= self.y + dy)):
-            self.y = targetY
-            self.path.pop(0)
-            self.followPath()
-        else:
-            self.x += dx
-            self.y += dy
-    
-    # Find path to player.
-    def findPlayer(self, app):
-        row, col = app.getCell(self.x, self.y)
-        playerRow, playerCol = app.getCell(app.player.x, app.player.y)
-        if (row, col) == (playerRow, playerCol):
-            return
-        result = app.findPath((row, col), (playerRow, playerCol))
-        self.path = result[2]
-        return result
-
-    # Sets the enemy's dx and dy to follow path.
-    def followPath(self):
-        if len(self.path) < 2:
-            self.foundPlayer = True
-            self.dx, self.dy = 0, 0
-        else:
-            self.dx = self.path[1][1] - self.path[0][1]
-            self.dy = self.path[1][0] - self.path[0][0]
-
-    # Function to check whether enemy has a line of sight to player.
-    # ex and ey represent enemy coords, px and py represent player coords.
-    # (x1, y1) and (x2, y2) are opposite corners of the given cell.
-    def canSeePlayer(self, app):
-        for row, col in app.obstaclesTest:
-            squareX, squareY = app.getCoords(row, col)
-            x1, y1 = squareX - app.cellSize/2, squareY - app.cellSize/2
-            x2, y2 = squareX + app.cellSize/2, squareY + app.cellSize/2
-            ex, ey = self.x, self.y
-            px, py = app.player.x, app.player.y
-            dx, dy = px - ex, py - ey
-
-            if dx == 0:
-                if (x1 < px < x2) and ((py < (y1+y2)/2 < ey) or (py > (y1+y2)/2) > ey):
-                    return False
-            elif dy == 0:
-                if (y1 < py < y2) and ((px < (x1+x2)/2 < ex) or (px > (x1+x2)/2) > ex):
-                    return False
-            
-            # CHECK THIS CONDITIONAL
-            elif ((y1 < ey + (x1-ex)*(dy/dx) < y2) or 
-                (y1 < ey + (x2-ex)*(dy/dx) < y2) or 
-                (x1 < ex + (y1-ey)*(dx/dy) < x2) or 
-                (x1 < ex + (y1-ey)*(dx/dy) < x2)) and (
-                (py < (y1+y2)/2 < ey) or (py > (y1+y2)/2 > ey) or 
-                (px < (x1+x2)/2 < ex) or (px > (x1+x2)/2) > ex):
-                # print(row, col)
-                # print((y1 < ey + (x1-ex)*(dy/dx) < y2),(y1 < ey + (x2-ex)*(dy/dx) < y2),
-                #         (x1 < ex + (y1-ey)*(dx/dy) < x2), (x1 < ex + (y1-ey)*(dx/dy) < x2))
-                # print(y1, ey + (x1-ex)*(dy/dx), y2)
-                # print(y1, ey + (x2-ex)*(dy/dx), y2)
-                # print(x1, ex + (y1-ey)*(dx/dy), x2)
-                # print(x1, ex + (y1-ey)*(dx/dy), x2)
-                return False
-        return True
-
-    # Function called to shoot weapon at player.
-    # FIX: Make firing weapons general/object-oriented.
-    def fireAtPlayer(self, app):
-        if self.weapon.fire(app):
-            if self.weapon.name == "shotgun":
-                self.weapon.createBullets(app,(self.x,self.y),(app.player.x,app.player.y),True)
-            else:
-                dx = app.player.x - self.x
-                dy = app.player.y - self.y
-                bullet = Projectile(self.x, self.y, dx, dy, 10, True)
-                app.projectiles.append(bullet)
-            
-
-# Class to represent projectiles.
-class Projectile(Entity):
-    def __init__(self, x, y, dx, dy, r, harmful):
-        super().__init__(x, y, r)
-        self.dx = dx
-        self.dy = dy
-        self.harmful = harmful
-        self.speedScale = 15
-
-# Parent class of all weapons.
-class Weapon(object):
-    def __init__(self, name, reloadTime, ammo):
-        self.name = name
-        self.reloadTime = reloadTime
-        self.ammo = ammo
-        self.lastFired = -reloadTime
-
-    # Fires weapon and returns True if successful and False otherwise.
-    def fire(self, app):
-        if app.timeCounter >= self.lastFired + self.reloadTime and self.ammo > 0:
-            self.ammo -= 1
-            self.lastFired = app.timeCounter
-            # app.playFiringSound()
-            app.playSound(app.shootSlow, app.shootFast, False)
-            return True
-        else:
-            return False
-
-# Subclass of Weapon to represent pistol.
-class Pistol(Weapon):
-    def __init__(self):
-        super().__init__("pistol", 10, 6)
-
-# Subclass of Weapon to represent machine gun.
-class MachineGun(Weapon):
-    def __init__(self):
-        super().__init__("machineGun", 5, 30)
-
-# Subclass of Weapon to represent shotgun.
-class Shotgun(Weapon):
-    def __init__(self):
-        super().__init__("shotgun", 20, 6)
-
-    # Adds bullets from shot to list of projectiles.
-    # Takes tuples of (x, y).
-    def createBullets(self, app, fromCoords, toCoords, harmful):
-        x1, y1 = fromCoords
-        x2, y2 = toCoords
-        dx, dy = x2 - x1, y2 - y1
-        r = (dx**2 + dy**2)**.5
-
-        angle1 = math.acos(dx/r)
-        if dx < 0 and dy < 0: angle1 += 2*(math.pi-angle1)
-        elif dx > 0 and dy < 0: angle1 = -angle1 + math.pi*2
-        angle2 = angle1 + math.pi/8
-        angle3 = angle1 - math.pi/8
-
-        dx2, dy2 = r*math.cos(angle2), r*math.sin(angle2)
-        dx3, dy3 = r*math.cos(angle3), r*math.sin(angle3)
-
-        bullet1 = Projectile(x1, y1, dx, dy, 5, harmful)
-        bullet2 = Projectile(x1, y1, dx2, dy2, 5, harmful)
-        bullet3 = Projectile(x1, y1, dx3, dy3, 5, harmful)
-
-        app.projectiles.append(bullet1)
-        app.projectiles.append(bullet2)
-        app.projectiles.append(bullet3)
-
 # Main class for game.
 class GameMode(Mode):
+    # Made in initializePathfinding when planning in the background.
+    backgroundPlanner = None
+    # Made in initializePathfinding, once the game has started.
+    replanScheduler = None
+
     def appStarted(self):
-        self.player = Player(self.width/2, self.height/2, Pistol())
+        self.player = entities.Player(self.width/2, self.height/2,
+                                      entities.Pistol())
         self.difficulty = self.app.difficulty
         self.levelPath = self.app.levelPath
 
@@ -331,7 +50,33 @@ class GameMode(Mode):
             self.board = level_generator.makeLevel(self.app.difficulty)
         else:
             self.loadLevel()
+        self.tileBoard = tile_board.TileBoard.fromList(self.board)
         self.cellSize = 50
+        self.initializePathfinding()
+        # Which cells can see each other, so enemies checking for the player
+        # is mostly a bit test. None on boards too big for it.
+        self.visibilityTable = visibility.makeVisibilityTable(self.board, "o")
+        # Without a visibility table, at least this many enemies look up their
+        # cells in the player's field of view all at once instead of one at a
+        # time. Both give the same answers. sight_benchmark.py has the batch
+        # faster from 64 to 128 enemies.
+        self.batchSightSize = 128
+        self.wallMask = self.tileBoard.getWallMask()
+        # How far points are from walls, so movement and projectiles far from
+        # any wall skip the collision checks. None on boards too big for it.
+        self.distanceField = distance_field.makeDistanceField(self.wallMask,
+                                                              self.cellSize)
+        # Cells the player can see, recomputed when the player changes cell.
+        # Used by enemies when there is no visibility table, and for the fog
+        # and the minimap.
+        self.fieldOfView = set([])
+        self.fieldOfViewMask = None
+        self.fieldOfViewCell = None
+        self.showFog = False
+        # Canvas items are kept between frames and only moved or changed
+        # (see canvas_items.py). Set to False to redraw everything each frame.
+        self.retainCanvas = True
+        self.canvasItems = canvas_items.CanvasItems()
 
         self.isSlow = True
         self.maxTimeScale = 1
@@ -340,6 +85,13 @@ class GameMode(Mode):
         self.timeScaleStep = .1
         self.timeCounter = 0
         self.enemiesKilled = 0
+        # Game ticks run at one per timerDelay of real time, however long
+        # frames take to draw.
+        self.clock = simulation_clock.SimulationClock(self.app.timerDelay/1000)
+        self.isOver = False
+        # Projectiles move at most this far between checks for walls, so
+        # they can't pass through one.
+        self.maxProjectileStep = self.cellSize/2
 
         self.timePerSprite = 3
         self.spriteTimer = 0
@@ -349,75 +101,82 @@ class GameMode(Mode):
         self.weapons = []
 
         self.initializeSprites()
+        # Background and walls drawn once, None on boards too big for it.
+        self.levelImage = level_image.makeLevelImage(self.wallMask,
+                                                     self.cellSize, self.wall)
+        # Minimap walls drawn once, with a block this many pixels wide per
+        # cell.
+        self.minimapCellSize = 5
+        self.minimapImage = level_image.makeMinimapImage(self.wallMask,
+                                                         self.minimapCellSize)
         self.enemies = []    
         self.initializeSounds()
 
         # Find spawn, initialize obstacles, enemies, weapons.
-        for row in range(len(self.board)):
-            for col in range(len(self.board[0])):
-                if self.board[row][col] == "":
-                    pass
-                elif self.board[row][col][0] == "p":
-                    self.player.x, self.player.y = self.getCoords(row, col)
-                    content = self.board[row][col].split(",")
-                    if len(content) > 1:
-                        self.player.weapon = self.makeWeapon(content[1])
-                elif self.board[row][col] == "o":
-                    self.obstacles.add((row, col))
-                elif self.board[row][col][0] == "e":
-                    x, y = self.getCoords(row, col)
-                    weaponName = self.board[row][col].split(",")[1]
-                    weapon = self.makeWeapon(weaponName)
-                    self.enemies.append(Enemy(x, y, weapon))
-                elif self.board[row][col][0] == "w":
-                    weaponName = self.board[row][col].split(",")[1]
-                    weapon = self.makeWeapon(weaponName)
-                    self.weapons.append((row, col, weapon))
+        self.obstacles = set(self.tileBoard.findTiles(tile_board.WALL))
+        for row, col, weaponName in self.tileBoard.getSpawns(tile_board.PLAYER):
+            self.player.x, self.player.y = self.getCoords(row, col)
+            if weaponName != None:
+                self.player.weapon = self.makeWeapon(weaponName)
+        for row, col, weaponName in self.tileBoard.getSpawns(tile_board.ENEMY):
+            x, y = self.getCoords(row, col)
+            weapon = self.makeWeapon(weaponName)
+            self.enemies.append(entities.Enemy(x, y, weapon))
+        for row, col, weaponName in self.tileBoard.getSpawns(tile_board.WEAPON):
+            weapon = self.makeWeapon(weaponName)
+            self.weapons.append((row, col, weapon))
 
         self.obstaclesTest = sorted(list(self.obstacles))[:]
+        # Player collisions check walls in the order self.obstacles is in.
+        self.obstacleOrder = self.getObstacleOrder()
         self.movePlayer(1)
 
         # TEST CODE FOR ENEMY PATHING
         for enemy in self.enemies:
             enemy.triggered = True
-            enemy.findPlayer(self)[2]
+            enemy.findPlayer(self)
 
-        self.projectiles = []
+        self.projectiles = projectile_pool.ProjectilePool()
+        # Collision stats, see getCollisionStats.
+        self.lastEnemyHits = 0
+        self.lastCandidates = 0
+        self.lastPairs = 0
+        self.totalCandidates = 0
+        self.totalPairs = 0
         self.testStuff()
 
-    # Called for each frame of the game; moves entities, checks collisions.
+    # Called for each frame of the game. Runs as many ticks as the clock
+    # says are due, stopping early if the game ends.
     def timerFired(self):
+        for i in range(self.clock.advance()):
+            self.step()
+            if self.isOver: break
+
+    # Coming back from the pause menu shouldn't count the time paused.
+    def modeActivated(self):
+        self.clock.reset()
+
+    # One tick of the game; moves entities, checks collisions.
+    def step(self):
+        self.applyPathResults()
         self.timeCounter += self.timeScale
         # print(self.player.weapon.name)
 
         # self.player.move(self.timeScale, self)
         self.movePlayer()
+        self.replanScheduler.run(self.replanEnemy, self.getReplanPriority)
 
         self.moveProjectiles(self.timeScale)
         self.moveEnemies()
         self.doEnemyAttacks()
 
-        # Checking for player-obstacle collisions.
-        for (row, col) in self.obstacles:
-            # if self.player.collidesWithObstacle((col+.5)*self.cellSize,
-            #                                     (row+.5)*self.cellSize,
-            #                                     self.cellSize/2):
-            #     dx, dy = self.player.dx, self.player.dy
-            #     self.player.dx *= -1
-            #     self.player.dy *= -1
-            #     self.player.move(self.timeScale, self)
-            #     self.player.dx, self.player.dy = dx, dy
-    
-            for projectile in self.projectiles:
-                if projectile.collidesWithObstacle((col+.5)*self.cellSize,
-                                                    (row+.5)*self.cellSize,
-                                                    self.cellSize/2):
-                    self.projectiles.remove(projectile)
-
+        self.checkProjectileWallCollisions()
         self.checkProjectileCollisions()
 
         if len(self.enemies) == 0:
             self.updateStats(False)
+            self.stopPlanning()
+            self.isOver = True
             self.app.setActiveMode(self.app.endMode)
 
         # FIX: % calculation if enemy and player have different amounts of sprites.
@@ -450,11 +209,13 @@ class GameMode(Mode):
             self.player.dx += 1
         elif event.key == "r":
             # MyApp(400, 400)
-            app = MyModalApp(width=400, height=400)
+            self.app.restart()
         elif event.key == "e":
             self.pickupWeapon()
         elif event.key == "p":
             self.app.setActiveMode(self.app.pauseMode)
+        elif event.key == "f":
+            self.showFog = not self.showFog
 
     # Works with keyPressed for movement.
     def keyReleased(self, event):
@@ -483,8 +244,7 @@ class GameMode(Mode):
         dy = (clickY-self.player.y)
 
         if self.player.weapon.name == "pistol" or self.player.weapon.name == "machineGun":
-            bullet = Projectile(self.player.x, self.player.y, dx, dy, 10, False)
-            self.projectiles.append(bullet)
+            self.projectiles.add(self.player.x, self.player.y, dx, dy, 10, False)
         elif self.player.weapon.name == "shotgun":
             self.player.weapon.createBullets(self,(self.player.x,self.player.y),
                                             (clickX,clickY), False)
@@ -496,41 +256,100 @@ class GameMode(Mode):
         r = self.player.r
         self.drawBoard(canvas)
         self.drawEnemies(canvas)
-        canvas.create_image(x, y, image=self.playerSprites[self.spriteCounter].cachedPhotoImage)
+        self.drawItem(canvas, ("player",), "image", x, y,
+                      image=self.playerSprites[self.spriteCounter].cachedPhotoImage)
         self.drawProjectiles(canvas)
         self.drawPlayerWeapon(canvas)
         self.drawWeapons(canvas)
         self.drawMinimap(canvas)
+        if self.retainCanvas:
+            self.canvasItems.finish(canvas)
+
+    # Draws canvas item of the given kind ("oval", "image", ...), like
+    # canvas.create_<kind>. With a retained canvas, the item drawn with the
+    # same key last frame is moved or changed instead. key[0] is the layer.
+    def drawItem(self, canvas, key, kind, *coords, **options):
+        if self.retainCanvas:
+            self.canvasItems.draw(canvas, key, kind, coords, options)
+        else:
+            getattr(canvas, "create_" + kind)(*coords, **options)
+
+    # Called when the canvas was cleared, so the kept items are gone.
+    def canvasCleared(self):
+        self.canvasItems.clear()
 
     # Function to draw obstancles from board.
+    # The part of the level image on screen is drawn as one image. Without a
+    # level image, only cells on screen are looked at.
     def drawBoard(self, canvas):
-        canvas.create_rectangle(0,0,self.width,self.height,fill="grey")
-        for row in range(len(self.board)):
-            for col in range(len(self.board[0])):
-                x = col * self.cellSize - (self.player.x - self.width/2)
-                y = row * self.cellSize - (self.player.y - self.height/2)
-                if self.board[row][col] == "o":
-                    # If cell is offscreen, do not draw.
-                    if not (x + self.cellSize < 0 or x > self.width or
-                        y + self.cellSize < 0 or y > self.height):
-                        canvas.create_image(x+self.cellSize/2,y+self.cellSize/2,
-                                        image=self.wall.cachedPhotoImage)
-                    
-    # Move every projectile in game.
+        left = self.player.x - self.width/2
+        top = self.player.y - self.height/2
+        startRow = math.ceil(top/self.cellSize - 1)
+        endRow = math.floor((top + self.height)/self.cellSize) + 1
+        startCol = math.ceil(left/self.cellSize - 1)
+        endCol = math.floor((left + self.width)/self.cellSize) + 1
+        if self.levelImage != None:
+            image = self.levelImage.getPhotoImage(left, top, self.width,
+                                                  self.height)
+            self.drawItem(canvas, ("board",), "image", 0, 0, image=image,
+                          anchor="nw")
+        else:
+            self.drawItem(canvas, ("board",), "rectangle", 0, 0, self.width,
+                          self.height, fill="grey")
+            for row, col in self.tileBoard.findTiles(tile_board.WALL, startRow,
+                                                     endRow, startCol, endCol):
+                x = col * self.cellSize - left
+                y = row * self.cellSize - top
+                self.drawItem(canvas, ("walls", row, col), "image",
+                              x+self.cellSize/2, y+self.cellSize/2,
+                              image=self.wall.cachedPhotoImage)
+        if self.showFog:
+            self.drawFog(canvas, startRow, endRow, startCol, endCol)
+
+    # Shades cells on screen that the player can't see.
+    def drawFog(self, canvas, startRow, endRow, startCol, endCol):
+        left = self.player.x - self.width/2
+        top = self.player.y - self.height/2
+        for row in range(max(0, startRow), min(len(self.board), endRow)):
+            for col in range(max(0, startCol), min(len(self.board[0]), endCol)):
+                if (row, col) not in self.fieldOfView:
+                    x = col * self.cellSize - left
+                    y = row * self.cellSize - top
+                    self.drawItem(canvas, ("fog", row, col), "rectangle",
+                                  x, y, x+self.cellSize, y+self.cellSize,
+                                  fill="black", stipple="gray50", width=0)
+
+    # Move every projectile in game. Fast projectiles move in a few smaller
+    # steps with a check for walls between each.
     def moveProjectiles(self, timeScale):
-        for projectile in self.projectiles:
-            projectile.move(timeScale)
+        distance = self.projectiles.getMaxSpeed() * timeScale
+        steps = max(1, math.ceil(distance / self.maxProjectileStep))
+        for i in range(steps - 1):
+            self.projectiles.move(timeScale/steps)
+            self.checkProjectileWallCollisions()
+        self.projectiles.move(timeScale/steps)
+
+    # Removes every projectile that hit a wall. Projectiles are only checked
+    # against walls in the cells around them.
+    def checkProjectileWallCollisions(self):
+        self.projectiles.remove(self.projectiles.findWallHits(self.wallMask,
+                                            self.cellSize, self.distanceField))
 
     # Draw projectiles.
     def drawProjectiles(self, canvas,):
-        for p in self.projectiles:
-            if p.harmful: color = "red"
+        pool = self.projectiles
+        slots = pool.getLive()
+        xs = pool.x[slots] - (self.player.x - self.width/2)
+        ys = pool.y[slots] - (self.player.y - self.height/2)
+        rs = pool.r[slots]
+        onScreen = ~((xs + rs < 0) | (xs - rs > self.width) |
+                     (ys + rs < 0) | (ys - rs > self.height))
+        for i in np.nonzero(onScreen)[0]:
+            if pool.harmful[slots[i]]: color = "red"
             else: color = "blue"
-            x = p.x - (self.player.x - self.width/2)
-            y = p.y - (self.player.y - self.height/2)
-            if not (x + p.r < 0 or x - p.r > self.width or
-                    y + p.r < 0 or y - p.r > self.height):
-                canvas.create_oval(x-p.r, y-p.r, x+p.r, y+p.r, fill=color)
+            x, y, r = xs[i], ys[i], rs[i]
+            self.drawItem(canvas, ("projectiles", int(slots[i])), "oval",
+                          x-r, y-r, x+r, y+r, fill=color)
                 # angle = math.atan2(-p.dy,p.dx)*360/(2*math.pi)
                 # print(angle)
                 # bullet = self.bullet.rotate(angle)
@@ -546,50 +365,33 @@ class GameMode(Mode):
 
         # Initialize player and enemy sprites.
         for i in range(3):
-            playerSprite = self.loadImage("img/player"+str(i+1)+".gif")
-            playerSprite = self.scaleImage(playerSprite, self.player.r*2/playerSprite.size[0])
-            playerSprite.cachedPhotoImage = ImageTk.PhotoImage(playerSprite)
+            playerSprite = assets.getImageWithWidth("img/player"+str(i+1)+".gif", self.player.r*2)
             self.playerSprites.append(playerSprite)
 
             # Using player radius
-            enemySprite = self.loadImage("img/enemy"+str(i+1)+".gif")
-            enemySprite = self.scaleImage(enemySprite, self.player.r*2/enemySprite.size[0])
-            enemySprite.cachedPhotoImage = ImageTk.PhotoImage(enemySprite)
+            enemySprite = assets.getImageWithWidth("img/enemy"+str(i+1)+".gif", self.player.r*2)
             self.enemySprites.append(enemySprite)
 
         # Initialize map tiles.
-        floor = self.loadImage("img/floor.png")
-        floor = self.scaleImage(floor, self.cellSize/floor.size[0])
-        floor.cachedPhotoImage = ImageTk.PhotoImage(floor)
-        self.floor = floor
-
-        wall = self.loadImage("img/wall.png")
-        wall = self.scaleImage(wall, self.cellSize/wall.size[0])
-        wall.cachedPhotoImage = ImageTk.PhotoImage(wall)
-        self.wall = wall
+        self.floor = assets.getImageWithWidth("img/floor.png", self.cellSize)
+        self.wall = assets.getImageWithWidth("img/wall.png", self.cellSize)
 
         # FIX: Add scaling to weapon sprites.
         # Initialize weapon sprites.
-        pistol = self.loadImage("img/pistol.gif")
-        pistol = self.scaleImage(pistol, 1.5)
-        pistol.cachedPhotoImage = ImageTk.PhotoImage(pistol)
+        pistol = assets.getImage("img/pistol.gif", 1.5)
         self.pistol = pistol
 
-        machinegun = self.loadImage("img/machinegun.gif")
-        machinegun = self.scaleImage(machinegun, 1.5)
-        machinegun.cachedPhotoImage = ImageTk.PhotoImage(machinegun)
+        machinegun = assets.getImage("img/machinegun.gif", 1.5)
         self.machinegun = machinegun
 
-        shotgun = self.loadImage("img/shotgun.gif")
-        shotgun = self.scaleImage(shotgun, 1.5)
-        shotgun.cachedPhotoImage = ImageTk.PhotoImage(shotgun)
+        shotgun = assets.getImage("img/shotgun.gif", 1.5)
         self.shotgun = shotgun
 
         self.weaponSprites = {"pistol":pistol, "machineGun":machinegun, "shotgun": shotgun}
 
         # self.bullet = self.loadImage("img/bullet3.gif")
         # self.bullet = self.scaleImage(self.bullet, 1)
-        self.bullet = Image.open("img/bullet3.gif")
+        self.bullet = assets.loadImage("img/bullet3.gif")
 
     # Draws enemies to screen.
     def drawEnemies(self, canvas):
@@ -598,86 +400,129 @@ class GameMode(Mode):
             x += self.width/2 - self.player.x
             y += self.height/2 - self.player.y
             # canvas.create_oval(x-r, y-r, x+r, y+r, fill="red")
-            canvas.create_image(x, y, image=self.enemySprites[self.spriteCounter].cachedPhotoImage)
+            self.drawItem(canvas, ("enemies", enemy), "image", x, y,
+                          image=self.enemySprites[self.spriteCounter].cachedPhotoImage)
 
-    # Wrapper function for dijkstras pathfinding algorithm. Takes a start tuple
-    # and end tuple (row, col).
-    # CITATION: I referenced algorithm explanation at 
-    # https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
+    # Wrapper function for pathfinding algorithm. Takes a start tuple
+    # and end tuple (row, col). Searches with A* from the pathfinding module,
+    # so distances and paths are filled in. Enemies don't use this; they step
+    # along with the pathfinder, their planner or the flow field.
     def findPath(self, start, end):
-        board = self.board
-        distances = [[-1] * len(board[0]) for i in range(len(board))]
-        distances[start[0]][start[1]] = 0
-        paths = [[0] * len(board[0]) for i in range(len(board))]
-
-        unvisited = set([])
-        for i in range(len(distances)):
-            for j in range(len(distances[0])):
-                if board[i][j] != "o":
-                    unvisited.add((i, j))
-        current = start
-        
-        while True:
-            result = self.doStep(distances, paths, unvisited, end)
-            if result or result == False: break
-        if not result: return False
-        return result, distances, self.getPath(paths, start, end), paths
-
-    # Helper funtion for pathfinding algorithm.
-    # Determines current cell, then visits cell.
-    def doStep(self, distances, paths, unvisited, end):
-        board = self.board
-
-        # Determine current cell.
-        shortest = None
-        shortestDistance = -1
-        for row, col in unvisited:
-            if distances[row][col] != -1:
-                if shortest == None or distances[row][col] < shortestDistance:
-                    shortest = (row, col)
-                    shortestDistance = distances[row][col]
-        current = shortest
-        if current == None: return False
-
-        self.visitCell(distances, paths, unvisited, current)
-        if end not in unvisited: return True
-        elif len(unvisited) == 0: return False
-
-    # Helper function for pathfinding algorithm.
-    # Marks all neighbors of a given cell with distances from the start.
-    def visitCell(self, distances, paths, unvisited, current):
-        board = self.board
-        # Check up, down, left right
-        row, col = current
-        for drow in (-1, 0, 1):
-            for dcol in (-1, 0, 1):
-                newRow, newCol = row + drow, col + dcol
-                if (abs(drow) + abs(dcol) == 1 and 0 <= newRow < len(board) and
-                    0 <= newCol < len(board[0])):
-                    if ((distances[newRow][newCol] == -1 or 
-                        distances[newRow][newCol] > distances[row][col] + 1) and
-                        board[newRow][newCol] != "#"):
-
-                        distances[newRow][newCol] = distances[row][col] + 1
-                        paths[newRow][newCol] = (-drow, -dcol)
-                        
-        unvisited.remove(current)
-
-    # CHECK FOR DIAGONAL ISSUE
-    # ALSO CHECK FOR ISSUE WHERE START AND END ARE ADJACENT/SAME.
-    # Helper function for pathfinding algorithm.
-    # Creates path from end to start using results of pathfinding algorithm.
-    def getPath(self, paths, start, end):
-        path = [end]
-        row, col = end
-        while True:
-            drow = paths[row][col][0]
-            dcol = paths[row][col][1]
-            row += drow
-            col += dcol
-            path = [(row, col)] + path
-            if start == (row, col): 
-                return path
+        return pathfinding.aStar(self.board, start, end, "o")
+
+    # Picks how enemies find the player based on the size of the board.
+    # self.pathfinder is either a distance table or a hierarchical pathfinder
+    # (both have getNextCell, getPathStart and findPath), or None.
+    def initializePathfinding(self):
+        area = len(self.board) * len(self.board[0])
+        self.incrementalPathArea = 2500
+        self.hierarchicalPathArea = 10000
+
+        # Walls never move, so distances between every pair of cells are
+        # computed once. Custom levels keep their tables on disk between runs.
+        if self.difficulty > 0: cacheDir = None
+        else: cacheDir = "levels/cache"
+        self.pathfinder = distance_table.makeDistanceTable(self.board, "o",
+                                                           cacheDir)
+
+        # Boards too big for a distance table search over cluster entrances.
+        if self.pathfinder == None and area >= self.hierarchicalPathArea:
+            self.pathfinder = hierarchical_pathfinding.HierarchicalPathfinder(
+                                                            self.board, "o")
+
+        # Boards in between replan each enemy's path incrementally instead of
+        # rebuilding the shared flow field every cell change.
+        self.useIncrementalPaths = (self.pathfinder == None and
+                                    area >= self.incrementalPathArea)
+
+        # Enemy replans are queued and run within this many milliseconds per
+        # tick, closest/visible/triggered enemies first.
+        self.aiBudget = 5
+        self.replanScheduler = path_planner.ReplanScheduler(self.aiBudget)
+
+        # Boards that replan incrementally plan paths on a background thread
+        # instead of in the replan scheduler, which takes most of the
+        # replanning out of the tick. Boards with a pathfinder don't, since
+        # its lookups are already quick.
+        self.planInBackground = self.useIncrementalPaths
+        if self.planInBackground and self.pathfinder == None:
+            self.backgroundPlanner = path_planner.BackgroundPlanner(self.board,
+                                        "o", self.useIncrementalPaths)
+
+    # Gives enemies the paths the background planner finished since the last
+    # tick. Paths start where the enemy was when it asked, so the part the
+    # enemy has already walked past is cut off. If the enemy has left the new
+    # path entirely, it keeps its old one and asks again.
+    def applyPathResults(self):
+        if self.backgroundPlanner == None: return
+        playerCell = self.getCell(self.player.x, self.player.y)
+        for enemy, path in self.backgroundPlanner.getResults():
+            if enemy not in self.enemies or not path: continue
+            cell = self.getCell(enemy.x, enemy.y)
+            if cell in path:
+                enemy.path = path[path.index(cell):]
+                enemy.foundPlayer = False
+            else:
+                self.backgroundPlanner.submit(enemy, cell, playerCell)
+
+    # Stops the background planner's thread when the game is over or left.
+    def stopPlanning(self):
+        if self.backgroundPlanner != None:
+            self.backgroundPlanner.stop()
+
+    # Returns dict of obstacle cell to its place in self.obstacles.
+    def getObstacleOrder(self):
+        order = dict()
+        for cell in self.obstacles:
+            order[cell] = len(order)
+        return order
+
+    # Changes a cell of the board during a game and updates everything that
+    # was built from it.
+    def setCell(self, row, col, contents):
+        self.board[row][col] = contents
+        self.boardChanged(row, col)
+
+    # Call after changing a cell of the board during a game. Cells that
+    # stay open (like a weapon being picked up) only change the tile board.
+    # When a wall is added or removed, the hierarchical pathfinder finds its
+    # entrances again and forgets its cached paths; a distance table and the
+    # visibility table assume walls never move, so they are thrown away.
+    def boardChanged(self, row, col):
+        self.tileBoard.setCell(row, col, self.board[row][col])
+        isWall = self.board[row][col] == "o"
+        if isWall == self.wallMask[row, col]: return
+        self.wallMask[row, col] = isWall
+        if self.distanceField != None:
+            self.distanceField.update(row, col)
+        if self.levelImage != None:
+            self.levelImage.setCell(row, col, isWall)
+        if self.minimapImage != None:
+            self.minimapImage.draw()
+        if isWall:
+            self.obstacles.add((row, col))
+        else:
+            self.obstacles.discard((row, col))
+        self.obstaclesTest = sorted(list(self.obstacles))[:]
+        self.obstacleOrder = self.getObstacleOrder()
+        if isinstance(self.pathfinder,
+                      hierarchical_pathfinding.HierarchicalPathfinder):
+            self.pathfinder.updateCell((row, col))
+        else:
+            self.pathfinder = None
+        self.visibilityTable = None
+        self.fieldOfViewCell = None
+        if self.backgroundPlanner != None:
+            self.backgroundPlanner.stop()
+            self.backgroundPlanner = path_planner.BackgroundPlanner(self.board,
+                                        "o", self.useIncrementalPaths)
+        for enemy in self.enemies:
+            if enemy.planner != None:
+                enemy.planner.updateCell((row, col))
+            # Paths found before the change may go through the cell.
+            enemy.path = [self.getCell(enemy.x, enemy.y)]
+            enemy.goal = None
+        self.calculateEnemyPaths()
 
     # Returns (x, y) for a given row and col (center of cell).
     def getCoords(self, row, col):
@@ -689,9 +534,11 @@ class GameMode(Mode):
 
     # Moves every enemy.
     def moveEnemies(self):
-        for enemy in self.enemies:
-            
-            seesPlayer = enemy.canSeePlayer(self)
+        self.updateFieldOfView()
+        sight = self.getEnemySight()
+        for i in range(len(self.enemies)):
+            enemy = self.enemies[i]
+            seesPlayer = sight[i]
             # print(seesPlayer)
             if enemy.triggered and not seesPlayer:
                 enemy.move(self.timeScale, self)
@@ -699,12 +546,88 @@ class GameMode(Mode):
             elif enemy.triggered and seesPlayer:
                 enemy.seesPlayer = seesPlayer
 
-    # Calculates path to player for every enemy.
+    # Returns list of whether each enemy can see the player, the same as
+    # Enemy.canSeePlayer.
+    def getEnemySight(self):
+        if (self.visibilityTable == None and
+            len(self.enemies) >= self.batchSightSize):
+            positions = [(enemy.x, enemy.y) for enemy in self.enemies]
+            return visibility.isInFieldOfViewBatch(self.fieldOfViewMask,
+                                                   positions,
+                                                   self.cellSize).tolist()
+        return [enemy.canSeePlayer(self) for enemy in self.enemies]
+
+    # Recomputes the cells the player can see if the player changed cell.
+    def updateFieldOfView(self):
+        playerCell = self.getCell(self.player.x, self.player.y)
+        if playerCell != self.fieldOfViewCell:
+            self.fieldOfViewCell = playerCell
+            self.fieldOfView = visibility.getFieldOfView(self.board,
+                                                         playerCell, None, "o")
+            self.fieldOfViewMask = visibility.getFieldOfViewMask(
+                self.fieldOfView, len(self.board), len(self.board[0]))
+
+    # Queues a new path to the player for every enemy. One flow field from
+    # the player's cell is shared by every enemy instead of searching per
+    # enemy, unless there is a pathfinder or enemies are replanning
+    # incrementally or in the background.
     def calculateEnemyPaths(self):
+        if (self.pathfinder == None and not self.useIncrementalPaths and
+            self.backgroundPlanner == None):
+            playerCell = self.getCell(self.player.x, self.player.y)
+            self.flowField = pathfinding.FlowField(self.board, playerCell, "o")
         for enemy in self.enemies:
+            self.replanScheduler.add(enemy)
+
+    # Called by the replan scheduler for each queued enemy.
+    def replanEnemy(self, enemy):
+        if enemy in self.enemies:
             enemy.foundPlayer = False
             enemy.findPlayer(self)
 
+    # Enemies that are triggered, can see the player, or are closest to the
+    # player get replanned first.
+    def getReplanPriority(self, enemy):
+        row, col = self.getCell(enemy.x, enemy.y)
+        playerRow, playerCol = self.getCell(self.player.x, self.player.y)
+        distance = abs(row - playerRow) + abs(col - playerCol)
+        return (not enemy.triggered, not enemy.seesPlayer, distance)
+
+    # Returns (cells expanded by the last update, total cells expanded) summed
+    # over every enemy's incremental planner.
+    def getReplanStats(self):
+        lastExpanded = 0
+        totalExpanded = 0
+        for enemy in self.enemies:
+            if enemy.planner != None:
+                lastExpanded += enemy.planner.expanded
+                totalExpanded += enemy.planner.totalExpanded
+        return lastExpanded, totalExpanded
+
+    # Prints how much of the AI budget replanning enemies used, how many
+    # collision checks the spatial hash saved, how far frames fell behind
+    # the simulation clock and how much the retained canvas saved, for tuning
+    # them. Called when an app that isn't in production mode stops.
+    def printStats(self):
+        if self.replanScheduler == None: return
+        (depth, lastTime, lastProcessed, averageTime, maxTime,
+         maxDepth) = self.replanScheduler.getStats()
+        lastExpanded, totalExpanded = self.getReplanStats()
+        print(f"replans: {averageTime:.2f} ms per tick on average and "
+              f"{maxTime:.2f} ms at most (budget {self.aiBudget} ms), "
+              f"{maxDepth} deepest queue, {totalExpanded} cells expanded")
+        (enemyHits, candidates, pairs, totalCandidates,
+         totalPairs) = self.getCollisionStats()
+        print(f"collisions: {totalCandidates} projectile-enemy pairs tested "
+              f"out of {totalPairs} without the spatial hash")
+        lastSteps, averageSteps, droppedTime = self.clock.getStats()
+        print(f"clock: {averageSteps:.2f} ticks per frame on average, "
+              f"{droppedTime:.2f} s of game time dropped")
+        if self.retainCanvas:
+            items, calls, kept = self.canvasItems.getStats()
+            print(f"canvas: {items} items kept, {calls} canvas calls and "
+                  f"{kept} items untouched in the last frame")
+
     # Miscellaneous testing function.
     def testStuff(self):
         assert(self.getCoords(1, 2) == (125.0, 75.0))
@@ -718,22 +641,50 @@ class GameMode(Mode):
 
     # FIX: splashscreen for player death
     # Check if projectiles collide with player or enemy.
+    # Projectiles that hit something are removed once everything is checked,
+    # so one projectile can hit every enemy it touches. Enemies go in a
+    # spatial hash each tick so projectiles are only tested against enemies
+    # in the cells around them.
     def checkProjectileCollisions(self):
-        for p in self.projectiles:
-            if p.harmful:
-                if (p.x-self.player.x)**2 + (p.y-self.player.y)**2 <= (p.r + self.player.r)**2:
-                    self.updateStats(True)
-                    self.app.setActiveMode(self.app.deathMode)
-                    self.projectiles.remove(p)
-                    self.playSound(self.hitSlow,self.hitFast,True)
-            else:
-                for e in self.enemies:
-                    if (p.x-e.x)**2 + (p.y-e.y)**2 <= (p.r + e.r)**2:
-                        if p in self.projectiles:
-                            self.projectiles.remove(p)
-                        self.enemies.remove(e)
-                        self.enemiesKilled += 1
-                        self.playSound(self.hitSlow,self.hitFast,False)
+        hits = [self.projectiles.findHits(self.player.x, self.player.y,
+                                          self.player.r, True)]
+        if len(hits[0]) > 0:
+            self.updateStats(True)
+            self.stopPlanning()
+            self.isOver = True
+            self.app.setActiveMode(self.app.deathMode)
+            self.playSound(self.hitSlow,self.hitFast,True)
+
+        enemyHash = collision.SpatialHash(self.cellSize)
+        for e in self.enemies:
+            enemyHash.add(e, e.x, e.y, e.r)
+        enemyHits, candidates = self.projectiles.findHitsIn(enemyHash, False)
+        pairs = self.projectiles.getCount(False) * len(self.enemies)
+        killed = set([])
+        for e, slots in enemyHits:
+            hits.append(slots)
+            killed.add(e)
+        if len(killed) > 0:
+            self.enemies = [e for e in self.enemies if e not in killed]
+            for e in killed:
+                if self.backgroundPlanner != None:
+                    self.backgroundPlanner.forget(e)
+                self.enemiesKilled += 1
+                self.playSound(self.hitSlow,self.hitFast,False)
+        self.projectiles.remove(np.concatenate(hits))
+
+        self.lastEnemyHits = len(killed)
+        self.lastCandidates = candidates
+        self.lastPairs = pairs
+        self.totalCandidates += candidates
+        self.totalPairs += pairs
+
+    # Returns (enemies hit last tick, projectile-enemy pairs tested last tick,
+    # pairs there would have been without the spatial hash, and the same two
+    # totals over the game).
+    def getCollisionStats(self):
+        return (self.lastEnemyHits, self.lastCandidates, self.lastPairs,
+                self.totalCandidates, self.totalPairs)
 
     # Draw player's weapon in bottom right corner, as well as reload bar/remaining shots.
     def drawPlayerWeapon(self, canvas):
@@ -741,23 +692,27 @@ class GameMode(Mode):
         x2 = self.width
         y1 = self.height * 8 / 10
         y2 = self.height
-        canvas.create_rectangle(x1,y1,x2,y2,fill="white",outline="black")
-        canvas.create_image((x1+x2)/2,(y1+y2)/2,image=self.weaponSprites[self.player.weapon.name].cachedPhotoImage)
+        self.drawItem(canvas, ("hud", "box"), "rectangle", x1, y1, x2, y2,
+                      fill="white", outline="black")
+        self.drawItem(canvas, ("hud", "weapon"), "image", (x1+x2)/2, (y1+y2)/2,
+                      image=self.weaponSprites[self.player.weapon.name].cachedPhotoImage)
         fractionReloaded = min(1, (self.timeCounter-self.player.weapon.lastFired)/self.player.weapon.reloadTime)
         reloadX = fractionReloaded*(x2-x1)+x1
         if self.player.weapon.ammo > 0:
-            canvas.create_rectangle(x1,self.height-10,reloadX,self.height,fill="green")
+            self.drawItem(canvas, ("hud", "reload"), "rectangle", x1,
+                          self.height-10, reloadX, self.height, fill="green")
         else:
-            canvas.create_rectangle(x1,self.height-10,x2,self.height,fill="red")
+            self.drawItem(canvas, ("hud", "reload"), "rectangle", x1,
+                          self.height-10, x2, self.height, fill="red")
 
     # Returns new weapon for given name.
     def makeWeapon(self, weaponName):
         if weaponName == "pistol":
-            weapon = Pistol()
+            weapon = entities.Pistol()
         elif weaponName == "machineGun":
-            weapon = MachineGun()
+            weapon = entities.MachineGun()
         elif weaponName == "shotgun":
-            weapon = Shotgun()
+            weapon = entities.Shotgun()
         return weapon
 
     # Draws weapons on map.
@@ -766,7 +721,8 @@ class GameMode(Mode):
             row, col, weapon = entry
             x, y = self.getCoords(row, col)
             x, y = x + (self.width/2 - self.player.x), y + (self.height/2 - self.player.y)
-            canvas.create_image(x, y, image=self.weaponSprites[weapon.name].cachedPhotoImage)
+            self.drawItem(canvas, ("weapons", weapon), "image", x, y,
+                          image=self.weaponSprites[weapon.name].cachedPhotoImage)
 
     # Pick up weapon under player (if there is one).
     def pickupWeapon(self):
@@ -775,6 +731,7 @@ class GameMode(Mode):
             if prow == entry[0] and pcol == entry[1]:
                 self.player.weapon = entry[2]
                 self.weapons.remove(entry)
+                self.setCell(prow, pcol, "")
 
     # Update statistics save file with deaths, kills, wins, etc.
     def updateStats(self, died):
@@ -808,24 +765,14 @@ class GameMode(Mode):
         dx, dy = self.player.getMove(self.timeScale)
         dx += initializer
         dy += initializer
-        newdx, newdy = dx, dy
-        for (row, col) in self.obstacles:
-            obX, obY = self.getCoords(row, col)
-            result1 = self.player.rectCollidesWithObstacle(pX+dx,pY,obX,obY,self.cellSize/2)
-            result2 = self.player.rectCollidesWithObstacle(pX,pY+dy,obX,obY,self.cellSize/2)
-            
-            # If collision, move player as close to wall as possible.
-            if result1[0]:
-                if dx > 0:
-                    dx = min(dx,(obX-self.cellSize/2)-(pX+pR))
-                else:
-                    dx = max(dx,(obX+self.cellSize/2)-(pX-pR))
-            elif result2[0]:
-                if dy > 0:
-                    dy = min(dy,(obY-self.cellSize/2)-(pY+pR))
-                else:
-                    dy = max(dy,(obY+self.cellSize/2)-(pY-pR))
-                
+        # If collision, move player as close to wall as possible. Only the
+        # walls around the player are checked, and none at all if the
+        # distance field says the whole move is clear of walls.
+        reach = pR*2**.5 + max(abs(dx), abs(dy))
+        if self.distanceField == None or not self.distanceField.isClear(pX, pY,
+                                                                        reach):
+            dx, dy = collision.slide(self.board, pX, pY, pR, dx, dy,
+                                     self.cellSize, self.obstacleOrder)
         self.player.x += dx
         self.player.y += dy
 
@@ -846,10 +793,10 @@ class GameMode(Mode):
 
     # Sets up sound effects for later use.
     def initializeSounds(self):
-        self.hitFast = sa.WaveObject.from_wave_file("sound/hit_fast.wav")
-        self.hitSlow = sa.WaveObject.from_wave_file("sound/hit_slow.wav")
-        self.shootFast = sa.WaveObject.from_wave_file("sound/shoot_fast.wav")
-        self.shootSlow = sa.WaveObject.from_wave_file("sound/shoot_slow.wav")
+        self.hitFast = assets.getSound("sound/hit_fast.wav")
+        self.hitSlow = assets.getSound("sound/hit_slow.wav")
+        self.shootFast = assets.getSound("sound/shoot_fast.wav")
+        self.shootSlow = assets.getSound("sound/shoot_slow.wav")
 
     # Loads user-created level.
     def loadLevel(self):
@@ -862,22 +809,42 @@ class GameMode(Mode):
                     newLine.append(cell)
                 self.board.append(newLine)
 
-    # Draws minimap to canvas.
+    # Draws minimap to canvas. The box and walls are drawn as one image when
+    # there is a minimap image.
     def drawMinimap(self, canvas):
-        cellSize = 5
+        cellSize = self.minimapCellSize
         width = cellSize * len(self.board[0])
         height = cellSize * len(self.board)
-        canvas.create_rectangle(self.width-width-cellSize,0+cellSize,self.width-cellSize,height+cellSize,fill="white",outline="black")
+        if self.minimapImage != None:
+            self.drawItem(canvas, ("minimap",), "image",
+                          self.width-width-cellSize, 0+cellSize,
+                          image=self.minimapImage.getPhotoImage(), anchor="nw")
+        else:
+            self.drawItem(canvas, ("minimap", "box"), "rectangle",
+                          self.width-width-cellSize, 0+cellSize,
+                          self.width-cellSize, height+cellSize,
+                          fill="white", outline="black")
+            for row, col in self.tileBoard.findTiles(tile_board.WALL):
+                x1 = self.width-width+col*cellSize-cellSize
+                y1 = row*cellSize+cellSize
+                self.drawItem(canvas, ("minimap", row, col), "rectangle",
+                              x1, y1, x1+cellSize, y1+cellSize, fill="brown")
 
         prow, pcol = self.getCell(self.player.x, self.player.y)
-        for row in range(len(self.board)):
-            for col in range(len(self.board[0])):
+        if not self.tileBoard.isWall(prow, pcol):
+            x1 = self.width-width+pcol*cellSize-cellSize
+            y1 = prow*cellSize+cellSize
+            self.drawItem(canvas, ("minimapMarkers", "player"), "rectangle",
+                          x1, y1, x1+cellSize, y1+cellSize, fill="blue")
+
+        # Only enemies the player can see are shown.
+        for enemy in self.enemies:
+            row, col = self.getCell(enemy.x, enemy.y)
+            if (row, col) in self.fieldOfView:
                 x1 = self.width-width+col*cellSize-cellSize
                 y1 = row*cellSize+cellSize
-                if self.board[row][col] == "o":
-                    canvas.create_rectangle(x1,y1,x1+cellSize,y1+cellSize,fill="brown")
-                elif row == prow and col == pcol:
-                    canvas.create_rectangle(x1,y1,x1+cellSize,y1+cellSize,fill="blue")
+                self.drawItem(canvas, ("minimapMarkers", enemy), "rectangle",
+                              x1, y1, x1+cellSize, y1+cellSize, fill="red")
         
 # Gets stats to display on stats menu.
 def getStats():
@@ -1101,9 +1068,15 @@ class EditorMode(Mode):
             r = self.cellSize/2
             canvas.create_rectangle(x-r,y-r,x+r,y+r,fill="orange")
 
-        # Loop through and draw every cell.
-        for row in range(len(self.board)):
-            for col in range(len(self.board[0])):
+        # Loop through and draw every cell on screen.
+        left = self.centerX - self.width/2
+        top = self.centerY - self.height/2
+        startRow = max(0, math.floor(top/self.cellSize))
+        endRow = min(len(self.board), math.floor((top + self.height)/self.cellSize) + 1)
+        startCol = max(0, math.floor(left/self.cellSize))
+        endCol = min(len(self.board[0]), math.floor((left + self.width)/self.cellSize) + 1)
+        for row in range(startRow, endRow):
+            for col in range(startCol, endCol):
                 x, y = self.getCoords(row, col)
                 x += self.width/2 - self.centerX
                 y += self.height/2 - self.centerY
@@ -1136,36 +1109,20 @@ class EditorMode(Mode):
     # https://www.cs.cmu.edu/~112/notes/notes-animations-part2.html#imageMethods
     def initializeSprites(self):
         # Initialize player and enemy sprites.
-        playerSprite = self.loadImage("img/player1.gif")
-        playerSprite = self.scaleImage(playerSprite, self.spriteR*2/playerSprite.size[0])
-        playerSprite.cachedPhotoImage = ImageTk.PhotoImage(playerSprite)
-        self.playerSprite = playerSprite
-
-        enemySprite = self.loadImage("img/enemy1.gif")
-        enemySprite = self.scaleImage(enemySprite, self.spriteR*2/enemySprite.size[0])
-        enemySprite.cachedPhotoImage = ImageTk.PhotoImage(enemySprite)
-        self.enemySprite = enemySprite
+        self.playerSprite = assets.getImageWithWidth("img/player1.gif", self.spriteR*2)
+        self.enemySprite = assets.getImageWithWidth("img/enemy1.gif", self.spriteR*2)
 
         # Initialize map tiles.
-        wall = self.loadImage("img/wall.png")
-        wall = self.scaleImage(wall, .8*self.cellSize/wall.size[0])
-        wall.cachedPhotoImage = ImageTk.PhotoImage(wall)
-        self.wall = wall
+        self.wall = assets.getImageWithWidth("img/wall.png", .8*self.cellSize)
 
         # Initialize weapon sprites.
-        pistol = self.loadImage("img/pistol.gif")
-        pistol = self.scaleImage(pistol, 1.5)
-        pistol.cachedPhotoImage = ImageTk.PhotoImage(pistol)
+        pistol = assets.getImage("img/pistol.gif", 1.5)
         self.pistol = pistol
 
-        machinegun = self.loadImage("img/machinegun.gif")
-        machinegun = self.scaleImage(machinegun, 1.5)
-        machinegun.cachedPhotoImage = ImageTk.PhotoImage(machinegun)
+        machinegun = assets.getImage("img/machinegun.gif", 1.5)
         self.machinegun = machinegun
 
-        shotgun = self.loadImage("img/shotgun.gif")
-        shotgun = self.scaleImage(shotgun, 1.5)
-        shotgun.cachedPhotoImage = ImageTk.PhotoImage(shotgun)
+        shotgun = assets.getImage("img/shotgun.gif", 1.5)
         self.shotgun = shotgun
 
         self.weaponSprites = {"pistol":pistol, "machineGun":machinegun, "shotgun": shotgun}
@@ -1185,9 +1142,7 @@ class StartMode(Mode):
         self.stats = Button(2*self.width/3,self.height/2,3*self.width/3,self.height/2+50,
                             "STATS","white","black")
 
-        self.title = self.loadImage("img/title.png")
-        self.title = self.scaleImage(self.title, self.width/self.title.size[0])
-        self.title.cachedPhotoImage = ImageTk.PhotoImage(self.title)
+        self.title = assets.getImageWithWidth("img/title.png", self.width)
         
         self.editor = Button(0,self.height/2+70,self.width/3,self.height/2+50+70,
                         "EDITOR","white","black")
@@ -1197,7 +1152,7 @@ class StartMode(Mode):
         canvas.create_rectangle(0,0,self.width,self.height,fill="grey")
         for button in self.buttons:
             button.drawButton(canvas)
-        canvas.create_image(self.width/2,self.title.size[1]/2,image=ImageTk.PhotoImage(self.title))
+        canvas.create_image(self.width/2,self.title.size[1]/2,image=self.title.cachedPhotoImage)
 
     def mousePressed(self, event):
         x, y = event.x, event.y
@@ -1231,7 +1186,7 @@ class DeathMode(Mode):
     def mousePressed(self, event):
         x, y = event.x, event.y
         if self.back.inButton(x, y):
-            app = MyModalApp(width=400, height=400)
+            self.app.restart()
 
     def mouseMoved(self, event):
         for button in self.buttons:
@@ -1255,7 +1210,7 @@ class EndMode(Mode):
         x, y = event.x, event.y
         if self.back.inButton(x, y):
             # self.app.setActiveMode(self.app.startMode)
-            app = MyModalApp(width=400, height=400)
+            self.app.restart()
 
     def mouseMoved(self, event):
         for button in self.buttons:
@@ -1271,6 +1226,7 @@ class HelpMode(Mode):
         Click to fire weapon
         Use e to pick up a new weapon
         Use p to pause and unpause
+        Use f to shade what you can't see
         Time moves slowly when you stand still
         Kill all enemies to win
         '''
@@ -1444,6 +1400,8 @@ class ConfigMode(Mode):
                            "OK","white","black")
         self.rows = 15
         self.cols = 15
+        self.minSize = 10
+        self.maxSize = 200
         self.rowsSelected = True
         self.buttons = [self.ok]
 
@@ -1471,14 +1429,14 @@ class ConfigMode(Mode):
     def keyPressed(self, event):
         if event.key == "Left":
             if self.rowsSelected:
-                self.rows = min(30, max(10,self.rows-1))
+                self.rows = min(self.maxSize, max(self.minSize,self.rows-1))
             else:
-                self.cols = min(30, max(10,self.cols-1))
+                self.cols = min(self.maxSize, max(self.minSize,self.cols-1))
         elif event.key == "Right":
             if self.rowsSelected:
-                self.rows = min(30, max(10,self.rows+1))
+                self.rows = min(self.maxSize, max(self.minSize,self.rows+1))
             else:
-                self.cols = min(30, max(10,self.cols+1))
+                self.cols = min(self.maxSize, max(self.minSize,self.cols+1))
         elif event.key == "Up" or event.key == "Down":
             self.rowsSelected = not self.rowsSelected
 
@@ -1514,6 +1472,25 @@ class MyModalApp(ModalApp):
         app.cols = 15
         app.levelPath = "levels/test.txt"
 
+    # Goes back to the start screen in a new app, in production mode only if
+    # this one is. The game's background planner is stopped first, since its
+    # thread would otherwise wait for requests forever.
+    def restart(app):
+        app.gameMode.stopPlanning()
+        MyModalApp(width=400, height=400, production=app._production)
+
+    # Stops the background planner. Apps made with production=False also print
+    # how long drawing frames took and how much of that the MVC checks and
+    # draw logging cost.
+    def appStopped(app):
+        super().appStopped()
+        app.gameMode.stopPlanning()
+        if app._production: return
+        redraws, redrawTime, checkTime, loggedCalls = app.getRedrawStats()
+        print(f"{redraws} redraws, {redrawTime:.2f} ms each, "
+              f"{checkTime:.2f} ms of MVC checks, {loggedCalls:.0f} logged calls")
+        app.gameMode.printStats()
+
 # Represents button for splash screens.
 class Button(object):
     def __init__(self, x1, y1, x2, y2, text, fill, outline):
@@ -1543,4 +1520,4 @@ class Button(object):
                                 outline=self.outline)
         canvas.create_text((self.x2+self.x1)/2, (self.y2+self.y1)/2, text=self.text)
 
-app = MyModalApp(width=400, height=400)
\ No newline at end of file
+app = MyModalApp(width=400, height=400, production=True)
\ No newline at end of file
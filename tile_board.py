@@ -0,0 +1,116 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Compact board stored as a 2d NumPy array of tile numbers instead of a 2d
+# list of strings. Weapons for spawns are kept in a dictionary on the side
+# since only a few cells have one. A 1000x1000 board takes about 1 MB.
+
+# CITATION: Referenced NumPy docs https://numpy.org/doc/stable/reference/index.html
+
+import numpy as np
+
+# Tile numbers.
+EMPTY = 0
+WALL = 1
+PLAYER = 2
+ENEMY = 3
+WEAPON = 4
+
+# First letter of the text format for each tile.
+TILE_LETTERS = {PLAYER: "p", ENEMY: "e", WEAPON: "w"}
+LETTER_TILES = {"p": PLAYER, "e": ENEMY, "w": WEAPON}
+
+class TileBoard(object):
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.tiles = np.zeros((rows, cols), dtype=np.uint8)
+        # Maps (row, col) to weapon name for player, enemy and weapon cells.
+        self.weapons = dict()
+
+    # Makes TileBoard from a 2d list of strings like "", "o" and "e,pistol".
+    @staticmethod
+    def fromList(board):
+        tileBoard = TileBoard(len(board), len(board[0]))
+        for row in range(len(board)):
+            for col in range(len(board[0])):
+                tileBoard.setCell(row, col, board[row][col])
+        return tileBoard
+
+    # Makes TileBoard from the level file format (cells split by "|").
+    @staticmethod
+    def fromText(levelData):
+        board = []
+        for line in levelData.splitlines():
+            board.append(line.split("|"))
+        return TileBoard.fromList(board)
+
+    # Returns the board as a 2d list of strings.
+    def toList(self):
+        board = []
+        for row in range(self.rows):
+            board.append([self.getCell(row, col) for col in range(self.cols)])
+        return board
+
+    # Returns the board in the level file format.
+    def toText(self):
+        levelData = ""
+        for row in self.toList():
+            levelData += "|".join(row) + "\n"
+        return levelData
+
+    # Sets a cell from its string form.
+    def setCell(self, row, col, contents):
+        self.weapons.pop((row, col), None)
+        if contents == "o":
+            self.tiles[row, col] = WALL
+        elif contents == "" or contents[0] not in LETTER_TILES:
+            self.tiles[row, col] = EMPTY
+        else:
+            self.tiles[row, col] = LETTER_TILES[contents[0]]
+            content = contents.split(",")
+            if len(content) > 1:
+                self.weapons[(row, col)] = content[1]
+
+    # Returns a cell in its string form.
+    def getCell(self, row, col):
+        tile = self.tiles[row, col]
+        if tile == WALL: return "o"
+        elif tile == EMPTY: return ""
+        contents = TILE_LETTERS[tile]
+        if (row, col) in self.weapons:
+            contents += "," + self.weapons[(row, col)]
+        return contents
+
+    def getTile(self, row, col):
+        return self.tiles[row, col]
+
+    def getWeapon(self, row, col):
+        return self.weapons.get((row, col))
+
+    def isWall(self, row, col):
+        return self.tiles[row, col] == WALL
+
+    # Returns 2d boolean array that is True for walls.
+    def getWallMask(self):
+        return self.tiles == WALL
+
+    # Returns list of (row, col) for every cell with the given tile.
+    # Only rows startRow to endRow and cols startCol to endCol are checked
+    # if they are given.
+    def findTiles(self, tile, startRow=0, endRow=None, startCol=0, endCol=None):
+        if endRow == None: endRow = self.rows
+        if endCol == None: endCol = self.cols
+        startRow, startCol = max(0, startRow), max(0, startCol)
+        cells = np.argwhere(self.tiles[startRow:endRow, startCol:endCol] == tile)
+        return [(int(row) + startRow, int(col) + startCol) for row, col in cells]
+
+    # Returns list of (row, col, weaponName) for every cell with the given
+    # tile (PLAYER, ENEMY or WEAPON).
+    def getSpawns(self, tile):
+        spawns = []
+        for row, col in self.findTiles(tile):
+            spawns.append((row, col, self.weapons.get((row, col))))
+        return spawns
@@ -0,0 +1,83 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Tile board test
+# Checks boards turned into a TileBoard and back come out the same, in both
+# the list and the level file format, and that spawns and their weapons are
+# found.
+
+import random
+import tile_board
+
+WEAPONS = ["pistol", "machinegun", "shotgun"]
+
+# Returns map with walls around the edge, some random walls inside, a player
+# and enemies and weapons, some of them without a weapon name.
+def setup(rows=12, cols=17):
+    board = [[""] * cols for i in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            if row == 0 or col == 0 or row == rows-1 or col == cols-1:
+                board[row][col] = "o"
+            elif random.random() < .2:
+                board[row][col] = "o"
+            elif random.random() < .1:
+                board[row][col] = "e," + random.choice(WEAPONS)
+            elif random.random() < .1:
+                board[row][col] = "w," + random.choice(WEAPONS)
+    board[1][1] = "p,pistol"
+    board[1][2] = "e"
+    board[2][1] = "w"
+    return board
+
+# Returns list of (row, col, weaponName) for cells of board that start with
+# letter, in the order getSpawns returns them.
+def getSpawns(board, letter):
+    spawns = []
+    for row in range(len(board)):
+        for col in range(len(board[0])):
+            content = board[row][col].split(",")
+            if content[0] == letter:
+                if len(content) > 1: spawns.append((row, col, content[1]))
+                else: spawns.append((row, col, None))
+    return spawns
+
+def test():
+    random.seed(112)
+    board = setup()
+    tileBoard = tile_board.TileBoard.fromList(board)
+    assert(tileBoard.toList() == board)
+    levelData = tileBoard.toText()
+    assert(levelData == "".join(["|".join(row) + "\n" for row in board]))
+    assert(tile_board.TileBoard.fromText(levelData).toList() == board)
+
+    for tile in [tile_board.PLAYER, tile_board.ENEMY, tile_board.WEAPON]:
+        letter = tile_board.TILE_LETTERS[tile]
+        assert(tileBoard.getSpawns(tile) == getSpawns(board, letter))
+    assert(tileBoard.getSpawns(tile_board.PLAYER) == [(1, 1, "pistol")])
+    assert((2, 1, None) in tileBoard.getSpawns(tile_board.WEAPON))
+    weapons = tileBoard.getSpawns(tile_board.WEAPON)
+    assert(len([spawn for spawn in weapons if spawn[2] != None]) > 0)
+
+    # A weapon picked up or replaced leaves no weapon name behind.
+    row, col, weaponName = weapons[-1]
+    tileBoard.setCell(row, col, "")
+    assert(tileBoard.getCell(row, col) == "")
+    assert(tileBoard.getWeapon(row, col) == None)
+    tileBoard.setCell(1, 1, "o")
+    assert(tileBoard.getSpawns(tile_board.PLAYER) == [])
+    assert(tileBoard.getWeapon(1, 1) == None and tileBoard.isWall(1, 1))
+    board[row][col] = ""
+    board[1][1] = "o"
+    assert(tile_board.TileBoard.fromText(tileBoard.toText()).toList() ==
+           board)
+
+    # The saved test level loads back the same too.
+    with open("levels/test.txt") as levelFile:
+        levelData = levelFile.read()
+    assert(tile_board.TileBoard.fromText(levelData).toText() == levelData)
+    print("passed")
+
+test()
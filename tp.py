@@ -7,7 +7,7 @@
 # CITATION: Tileset from https://askariot.itch.io/game-tileset?download
 
 import math, time
-import level_generator
+import level_generator, pathfinding
 
 # CITATION: Tkinter graphics wrapper from CMU 15-112 https://www.cs.cmu.edu/~112/index.html
 from cmu_112_graphics import *
@@ -447,84 +447,10 @@ class MyApp(App):
             # canvas.create_oval(x-r, y-r, x+r, y+r, fill="red")
             canvas.create_image(x, y, image=self.enemySprite.cachedPhotoImage)
 
-    # Wrapper function for dijkstras pathfinding algorithm. Takes a start tuple
-    # and end tuple (row, col).
-    # CITATION: I referenced algorithm explanation at 
-    # https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
+    # Wrapper function for pathfinding algorithm. Takes a start tuple
+    # and end tuple (row, col). Uses A* from the pathfinding module.
     def findPath(self, start, end):
-        board = self.board
-        distances = [[-1] * len(board[0]) for i in range(len(board))]
-        distances[start[0]][start[1]] = 0
-        paths = [[0] * len(board[0]) for i in range(len(board))]
-
-        unvisited = set([])
-        for i in range(len(distances)):
-            for j in range(len(distances[0])):
-                if board[i][j] != "o":
-                    unvisited.add((i, j))
-        current = start
-        
-        while True:
-            result = self.doStep(distances, paths, unvisited, end)
-            if result or result == False: break
-        if not result: return False
-        return result, distances, self.getPath(paths, start, end), paths
-
-    # Helper funtion for pathfinding algorithm.
-    # Determines current cell, then visits cell.
-    def doStep(self, distances, paths, unvisited, end):
-        board = self.board
-
-        # Determine current cell.
-        shortest = None
-        shortestDistance = -1
-        for row, col in unvisited:
-            if distances[row][col] != -1:
-                if shortest == None or distances[row][col] < shortestDistance:
-                    shortest = (row, col)
-                    shortestDistance = distances[row][col]
-        current = shortest
-        if current == None: return False
-
-        self.visitCell(distances, paths, unvisited, current)
-        if end not in unvisited: return True
-        elif len(unvisited) == 0: return False
-
-    # Helper function for pathfinding algorithm.
-    # Marks all neighbors of a given cell with distances from the start.
-    def visitCell(self, distances, paths, unvisited, current):
-        board = self.board
-        # Check up, down, left right
-        row, col = current
-        for drow in (-1, 0, 1):
-            for dcol in (-1, 0, 1):
-                newRow, newCol = row + drow, col + dcol
-                if (abs(drow) + abs(dcol) == 1 and 0 <= newRow < len(board) and
-                    0 <= newCol < len(board[0])):
-                    if ((distances[newRow][newCol] == -1 or 
-                        distances[newRow][newCol] > distances[row][col] + 1) and
-                        board[newRow][newCol] != "#"):
-
-                        distances[newRow][newCol] = distances[row][col] + 1
-                        paths[newRow][newCol] = (-drow, -dcol)
-                        
-        unvisited.remove(current)
-
-    # CHECK FOR DIAGONAL ISSUE
-    # ALSO CHECK FOR ISSUE WHERE START AND END ARE ADJACENT/SAME.
-    # Helper function for pathfinding algorithm.
-    # Creates path from end to start using results of pathfinding algorithm.
-    def getPath(self, paths, start, end):
-        path = [end]
-        row, col = end
-        while True:
-            drow = paths[row][col][0]
-            dcol = paths[row][col][1]
-            row += drow
-            col += dcol
-            path = [(row, col)] + path
-            if start == (row, col): 
-                return path
+        return pathfinding.aStar(self.board, start, end, "o")
 
     # Returns (x, y) for a given row and col (center of cell).
     def getCoords(self, row, col):
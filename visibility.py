@@ -0,0 +1,443 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Line of sight on the board, used for enemies seeing the player. Works
+# straight from the board so the cost depends on how far apart two points
+# are, not on how many walls the level has.
+
+# CITATION: Referenced "A Fast Voxel Traversal Algorithm for Ray Tracing" by
+# Amanatides and Woo at http://www.cse.yorku.ca/~amana/research/grid.pdf
+
+# CITATION: Referenced NumPy docs https://numpy.org/doc/stable/reference/index.html
+
+# CITATION: Referenced recursive shadowcasting from RogueBasin at
+# http://www.roguebasin.com/index.php?title=FOV_using_recursive_shadowcasting
+
+import math, time
+import numpy as np
+
+# Returns True if (row, col) blocks sight. Cells off the board block too.
+def isBlocking(board, row, col, obstacle="o"):
+    if not (0 <= row < len(board) and 0 <= col < len(board[0])): return True
+    return board[row][col] == obstacle
+
+# Cells of board as a flat list, for walk: cell (row, col) is at index
+# (row + 1) * cols + col + 1 with cols two more than the board has, so the
+# cells just off each edge have an index too. Looking one up says whether it
+# blocks sight.
+class BoardCells(object):
+    def __init__(self, board, obstacle="o"):
+        self.board = board
+        self.obstacle = obstacle
+        self.cols = len(board[0]) + 2
+
+    def __getitem__(self, i):
+        row, col = divmod(i, self.cols)
+        return isBlocking(self.board, row - 1, col - 1, self.obstacle)
+
+    # Returns (row, col) of the cell at index i.
+    def getCell(self, i):
+        row, col = divmod(i, self.cols)
+        return (row - 1, col - 1)
+
+# Walks every cell the segment from start to end passes through, in order,
+# and returns (row, col) of the first one that blocks sight, or None if
+# nothing does. start and end are (x, y) in pixels and cellSize converts them
+# to cells. If the segment goes exactly through the corner between cells, it
+# is blocked if either of the cells beside the corner blocks.
+def raycast(board, start, end, cellSize=1, obstacle="o"):
+    x0, y0 = start[0]/cellSize, start[1]/cellSize
+    x1, y1 = end[0]/cellSize, end[1]/cellSize
+    row, col = math.floor(y0), math.floor(x0)
+    if isBlocking(board, row, col, obstacle): return (row, col)
+
+    # Rays leave the board at most one cell past it, where they're blocked,
+    # so an end further out than that is never reached.
+    cells = BoardCells(board, obstacle)
+    ray = startWalk(cells.cols, x0, y0, x1, y1, cells.cols + 1)
+    endRow, endCol = math.floor(y1), math.floor(x1)
+    if not (-1 <= endRow <= len(board) and -1 <= endCol <= len(board[0])):
+        ray = (-1,) + ray[1:]
+    i = walk(cells, *ray)
+    if i == None: return None
+    return cells.getCell(i)
+
+# Returns True if nothing blocks sight between start and end.
+def canSee(board, start, end, cellSize=1, obstacle="o"):
+    return raycast(board, start, end, cellSize, obstacle) == None
+
+# canSeeBatch finishes the last this many rays one at a time.
+SCALAR_RAYS = 8
+
+# Returns True for each (row, col) in the arrays rows and cols that blocks
+# sight on the 2d boolean array walls. Cells off the board block too.
+def isBlockingBatch(walls, rows, cols):
+    onBoard = ((rows >= 0) & (rows < walls.shape[0]) &
+               (cols >= 0) & (cols < walls.shape[1]))
+    if onBoard.all(): return walls[rows, cols]
+    blocking = ~onBoard
+    blocking[onBoard] = walls[rows[onBoard], cols[onBoard]]
+    return blocking
+
+# Same as canSee from every point in starts (an array of (x, y) in pixels) to
+# end, with walls a 2d boolean array that is True for walls (for example
+# TileBoard.getWallMask). Returns a boolean array with one entry per start.
+# Every ray takes its next step at the same time, and rays that are done are
+# dropped, so each step only works on the rays still going.
+def canSeeBatch(walls, starts, end, cellSize=1):
+    starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+    x1, y1 = end[0]/cellSize, end[1]/cellSize
+    endRow, endCol = math.floor(y1), math.floor(x1)
+    rows, cols = walls.shape
+    # Rays to a point off the board can go anywhere, so they're cast one by
+    # one. walls works as a board whose obstacle is True.
+    if not (0 <= endRow < rows and 0 <= endCol < cols):
+        return np.array([canSee(walls, start, end, cellSize, True)
+                         for start in starts], dtype=bool)
+    x0, y0 = starts[:, 0] / cellSize, starts[:, 1] / cellSize
+    row, col = np.floor(y0).astype(int), np.floor(x0).astype(int)
+    dx, dy = x1 - x0, y1 - y0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tDeltaX = np.where(dx != 0, 1/np.abs(dx), np.inf)
+        tDeltaY = np.where(dy != 0, 1/np.abs(dy), np.inf)
+        tMaxX = np.where(dx > 0, (col + 1 - x0) * tDeltaX,
+                         np.where(dx < 0, (x0 - col) * tDeltaX, np.inf))
+        tMaxY = np.where(dy > 0, (row + 1 - y0) * tDeltaY,
+                         np.where(dy < 0, (y0 - row) * tDeltaY, np.inf))
+
+    visible = ~isBlockingBatch(walls, row, col)
+    steps = np.abs(endRow - row) + np.abs(endCol - col)
+    rays = np.nonzero(visible & (steps > 0))[0]
+    if len(rays) == 0: return visible
+
+    # Rays start and end on the board, and can step at most one cell past
+    # it, so with a border of walls added cells can be looked up by flat
+    # index without bounds checks.
+    cols += 2
+    walls = np.pad(walls, 1, constant_values=True).ravel()
+    endCell = (endRow + 1) * cols + endCol + 1
+    # One row per value so dropping finished rays is two indexing operations.
+    rayInts = np.stack([rays, (row[rays] + 1) * cols + col[rays] + 1,
+                        steps[rays], np.sign(dx[rays]).astype(int),
+                        np.sign(dy[rays]).astype(int) * cols])
+    rayFloats = np.stack([tMaxX[rays], tMaxY[rays],
+                          tDeltaX[rays], tDeltaY[rays]])
+    while True:
+        rays, cell, steps, stepCol, stepRow = rayInts
+        tMaxX, tMaxY, tDeltaX, tDeltaY = rayFloats
+        # Most rays hit a wall within a few cells. The few long ones left are
+        # quicker to finish one at a time than to keep stepping together.
+        if len(rays) <= SCALAR_RAYS:
+            for ray in zip(*rayInts.tolist(), *rayFloats.tolist()):
+                visible[ray[0]] = walk(walls, endCell, *ray[1:]) == None
+            break
+        moveX = tMaxX <= tMaxY
+        moveY = tMaxY <= tMaxX
+        corner = moveX & moveY
+        # Going exactly through a corner is blocked by either side cell.
+        if corner.any():
+            blocked = np.zeros(len(rays), dtype=bool)
+            blocked[corner] = (walls[cell[corner] + stepCol[corner]] |
+                               walls[cell[corner] + stepRow[corner]])
+        else:
+            blocked = False
+
+        cell += stepCol * moveX + stepRow * moveY
+        tMaxX += np.where(moveX, tDeltaX, 0)
+        tMaxY += np.where(moveY, tDeltaY, 0)
+        steps -= 1 + corner
+        blocked = blocked | walls[cell]
+        visible[rays[blocked]] = False
+
+        going = ~blocked & (steps > 0) & (cell != endCell)
+        if not going.all():
+            rayInts = rayInts[:, going]
+            rayFloats = rayFloats[:, going]
+    return visible
+
+# Returns a 2d boolean array with rows x cols cells that is True for the
+# (row, col) cells in fieldOfView (a set from getFieldOfView).
+def getFieldOfViewMask(fieldOfView, rows, cols):
+    mask = np.zeros((rows, cols), dtype=bool)
+    if len(fieldOfView) > 0:
+        cells = np.array(list(fieldOfView))
+        mask[cells[:, 0], cells[:, 1]] = True
+    return mask
+
+# Same as checking whether the cell of each point in points (an array of
+# (x, y) in pixels) is in a field of view, with mask from getFieldOfViewMask.
+# Points off the board aren't in it. Returns a boolean array with one entry
+# per point.
+def isInFieldOfViewBatch(mask, points, cellSize=1):
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    rows = np.floor(points[:, 1] / cellSize).astype(int)
+    cols = np.floor(points[:, 0] / cellSize).astype(int)
+    onBoard = ((rows >= 0) & (rows < mask.shape[0]) &
+               (cols >= 0) & (cols < mask.shape[1]))
+    if onBoard.all(): return mask[rows, cols]
+    inView = np.zeros(len(points), dtype=bool)
+    inView[onBoard] = mask[rows[onBoard], cols[onBoard]]
+    return inView
+
+# Tables bigger than this (in bytes) aren't built. Two bits per pair of open
+# cells, so this fits about 2900 open cells.
+MAX_BYTES = 1024 * 1024
+
+# Tables that would take longer than this many seconds to build when the
+# level loads aren't used either, which is most levels over 350 open cells.
+# Without a table the game uses the player's field of view instead.
+MAX_TIME = 1
+
+# How far from a cell's center the side rays start, in cells. A hair under
+# half a cell so they start inside the cell's corner instead of on the lines
+# between cells, where the cell a ray starts in depends on which way it goes.
+SIDE_OFFSET = 0.5 - 1e-9
+
+# Returns (end, i, steps, stepCol, stepRow, tMaxX, tMaxY, tDeltaX, tDeltaY)
+# for walking from (x0, y0) to (x1, y1), given in cells, over a flat list of
+# cells with cols columns where cell (0, 0) is at index offset.
+def startWalk(cols, x0, y0, x1, y1, offset=0):
+    row, col = math.floor(y0), math.floor(x0)
+    endRow, endCol = math.floor(y1), math.floor(x1)
+    dx, dy = x1 - x0, y1 - y0
+    if dx > 0:
+        stepCol, tDeltaX = 1, 1/dx
+        tMaxX = (col + 1 - x0) * tDeltaX
+    elif dx < 0:
+        stepCol, tDeltaX = -1, -1/dx
+        tMaxX = (x0 - col) * tDeltaX
+    else:
+        stepCol, tDeltaX, tMaxX = 0, math.inf, math.inf
+    if dy > 0:
+        stepRow, tDeltaY = cols, 1/dy
+        tMaxY = (row + 1 - y0) * tDeltaY
+    elif dy < 0:
+        stepRow, tDeltaY = -cols, -1/dy
+        tMaxY = (y0 - row) * tDeltaY
+    else:
+        stepRow, tDeltaY, tMaxY = 0, math.inf, math.inf
+    # Each step moves one cell closer to the end cell.
+    return (endRow*cols + endCol + offset, row*cols + col + offset,
+            abs(endRow - row) + abs(endCol - col), stepCol, stepRow,
+            tMaxX, tMaxY, tDeltaX, tDeltaY)
+
+# Walks the cells a ray set up by startWalk passes through, starting after
+# flat index i with steps steps left, and returns the index of the first one
+# where walls[index] is true, or None if the ray gets to end. Used by
+# raycast, isClear and canSeeBatch.
+def walk(walls, end, i, steps, stepCol, stepRow, tMaxX, tMaxY, tDeltaX,
+         tDeltaY):
+    while steps > 0 and i != end:
+        if tMaxX < tMaxY:
+            i += stepCol
+            tMaxX += tDeltaX
+            steps -= 1
+        elif tMaxY < tMaxX:
+            i += stepRow
+            tMaxY += tDeltaY
+            steps -= 1
+        else:
+            if walls[i + stepCol]: return i + stepCol
+            if walls[i + stepRow]: return i + stepRow
+            i += stepCol + stepRow
+            tMaxX += tDeltaX
+            tMaxY += tDeltaY
+            steps -= 2
+        if walls[i]: return i
+    return None
+
+# Same as canSee, but between points given in cells, with walls a flat
+# bytearray (1 for walls) of a board with cols columns. Both points have to
+# be on the board. Only used to build VisibilityTable, where it's called a
+# lot, so it skips the bounds checks.
+def isClear(walls, cols, x0, y0, x1, y1):
+    return walk(walls, *startWalk(cols, x0, y0, x1, y1)) == None
+
+# Which open cells can see each other, worked out when a level loads since
+# walls don't move. Each open cell gets two bitsets (Python ints with bit j
+# for open cell j): visible, for cells it can see from anywhere in the cell,
+# and borderline, for cells that only part of it can see. Borderline pairs are
+# checked with an exact raycast. Only used once every cell has its bitsets,
+# so nothing is built during a game.
+class VisibilityTable(object):
+    def __init__(self, board, obstacle="o"):
+        self.board = board
+        self.obstacle = obstacle
+        self.rows, self.cols = len(board), len(board[0])
+        self.cells = []
+        self.index = dict()
+        self.walls = bytearray(self.rows * self.cols)
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if board[row][col] == obstacle:
+                    self.walls[row*self.cols + col] = 1
+                else:
+                    self.index[(row, col)] = len(self.cells)
+                    self.cells.append((row, col))
+        self.visible = [None] * len(self.cells)
+        self.borderline = [None] * len(self.cells)
+        self.rowsBuilt = 0
+
+    # Returns number of bytes the bitsets take up once every cell has them.
+    def getSize(self):
+        return len(self.cells)**2 * 2 // 8
+
+    # Returns True if some ray between the pair of cells disagrees with the
+    # center ray, whose result is clear. Two rays go corner to corner along
+    # the sides of the band the cells sweep out. Walls are whole cells, so a
+    # wall in the band that the center ray misses crosses one of the sides.
+    # If the center ray is blocked, the side rays have to be stopped by walls
+    # that touch each other inside the box around both cells too. Those walls
+    # then cross the band from side to side, so no ray gets between them.
+    def isBorderline(self, x0, y0, x1, y1, clear):
+        walls, cols = self.walls, self.cols
+        # Corner furthest to one side of the center ray, in both cells.
+        ox = -SIDE_OFFSET if y1 > y0 else SIDE_OFFSET
+        oy = -SIDE_OFFSET if x1 < x0 else SIDE_OFFSET
+        hits = set()
+        for side in (1, -1):
+            hit = walk(walls, *startWalk(cols, x0 + side*ox, y0 + side*oy,
+                                         x1 + side*ox, y1 + side*oy))
+            if (hit == None) != clear: return True
+            hits.add(hit)
+        if clear or len(hits) == 1: return False
+        return not self.areTouching(hits, int(min(y0, y1)), int(min(x0, x1)),
+                                    int(max(y0, y1)), int(max(x0, x1)))
+
+    # Returns True if the walls at the flat indices in hits all connect to
+    # each other through walls (touching at a side or a corner) between rows
+    # row0 and row1 and cols col0 and col1.
+    def areTouching(self, hits, row0, col0, row1, col1):
+        start = hits.pop()
+        seen = set([start])
+        queue = [start]
+        while queue and hits:
+            row, col = divmod(queue.pop(), self.cols)
+            for drow in (-1, 0, 1):
+                for dcol in (-1, 0, 1):
+                    if (row0 <= row + drow <= row1 and
+                        col0 <= col + dcol <= col1):
+                        i = (row + drow) * self.cols + col + dcol
+                        if self.walls[i] and i not in seen:
+                            seen.add(i)
+                            queue.append(i)
+                            hits.discard(i)
+        return len(hits) == 0
+
+    # Fills in the bitsets for open cell i. Bits for cells that already have
+    # theirs are copied from them, since seeing goes both ways.
+    def buildRow(self, i):
+        row0, col0 = self.cells[i]
+        x0, y0 = col0 + 0.5, row0 + 0.5
+        visible = 0
+        borderline = 0
+        for j in range(len(self.cells)):
+            if j == i:
+                visible |= 1 << j
+            elif self.visible[j] != None:
+                visible |= ((self.visible[j] >> i) & 1) << j
+                borderline |= ((self.borderline[j] >> i) & 1) << j
+            else:
+                row1, col1 = self.cells[j]
+                x1, y1 = col1 + 0.5, row1 + 0.5
+                clear = isClear(self.walls, self.cols, x0, y0, x1, y1)
+                if self.isBorderline(x0, y0, x1, y1, clear):
+                    borderline |= 1 << j
+                elif clear:
+                    visible |= 1 << j
+        self.visible[i] = visible
+        self.borderline[i] = borderline
+        self.rowsBuilt += 1
+
+    # Builds bitsets for every open cell. Returns False as soon as it looks
+    # like it'll take longer than maxTime seconds. Cell i only casts rays to
+    # the cells after it, so the time so far is scaled by the rays left.
+    def build(self, maxTime=None):
+        startTime = time.perf_counter()
+        n = len(self.cells)
+        rays = n * (n - 1) // 2
+        raysDone = 0
+        for i in range(n):
+            if self.visible[i] == None: self.buildRow(i)
+            raysDone += n - 1 - i
+            if maxTime != None and 0 < raysDone < rays:
+                spent = time.perf_counter() - startTime
+                if spent * rays / raysDone > maxTime: return False
+        return True
+
+    # Same as canSee, for points in pixels. Points in cells the table doesn't
+    # know (walls or off the board) are raycast.
+    def canSee(self, start, end, cellSize=1):
+        startCell = (int(start[1]//cellSize), int(start[0]//cellSize))
+        endCell = (int(end[1]//cellSize), int(end[0]//cellSize))
+        if startCell not in self.index or endCell not in self.index:
+            return canSee(self.board, start, end, cellSize, self.obstacle)
+        i, j = self.index[startCell], self.index[endCell]
+        if (self.borderline[i] >> j) & 1:
+            return canSee(self.board, start, end, cellSize, self.obstacle)
+        return (self.visible[i] >> j) & 1 == 1
+
+# Returns the visibility table for board, or None if it would be bigger than
+# maxBytes or take longer than about maxTime seconds to build.
+def makeVisibilityTable(board, obstacle="o", maxBytes=MAX_BYTES,
+                        maxTime=MAX_TIME):
+    table = VisibilityTable(board, obstacle)
+    if table.getSize() > maxBytes: return None
+    if not table.build(maxTime): return None
+    return table
+
+# Turns a position in one octant's (dx, dy) into a board (drow, dcol) for each
+# of the 8 octants around the origin.
+OCTANTS = [(1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)]
+
+# Returns set of (row, col) for every cell on the board that can be seen from
+# the center of origin's cell, walls included, within radius cells (or the
+# whole board if radius is None). Each cell is looked at about once, so the
+# cost only depends on how much can be seen.
+def getFieldOfView(board, origin, radius=None, obstacle="o"):
+    if radius == None: radius = max(len(board), len(board[0]))
+    visible = set([origin])
+    for octant in OCTANTS:
+        castLight(board, origin, 1, 1.0, 0.0, radius, octant, visible, obstacle)
+    return visible
+
+# Scans one octant outwards from origin, one row (depth) at a time, between
+# slopes start and end. Walls split the scan and the part past them is
+# scanned recursively with narrower slopes.
+def castLight(board, origin, depth, start, end, radius, octant, visible,
+              obstacle):
+    if start < end: return
+    xx, xy, yx, yy = octant
+    rows, cols = len(board), len(board[0])
+    for distance in range(depth, radius + 1):
+        dx, dy = -distance - 1, -distance
+        blocked = False
+        newStart = start
+        while dx <= 0:
+            dx += 1
+            leftSlope = (dx - 0.5) / (dy + 0.5)
+            rightSlope = (dx + 0.5) / (dy - 0.5)
+            if start < rightSlope: continue
+            elif end > leftSlope: break
+            row = origin[0] + dx*yx + dy*yy
+            col = origin[1] + dx*xx + dy*xy
+            onBoard = 0 <= row < rows and 0 <= col < cols
+            if onBoard and dx*dx + dy*dy <= radius*radius:
+                visible.add((row, col))
+            wall = not onBoard or board[row][col] == obstacle
+            if blocked:
+                if wall:
+                    newStart = rightSlope
+                else:
+                    blocked = False
+                    start = newStart
+            elif wall and distance < radius:
+                blocked = True
+                castLight(board, origin, distance + 1, start, leftSlope, radius,
+                          octant, visible, obstacle)
+                newStart = rightSlope
+        if blocked: break
@@ -0,0 +1,72 @@
+##########################
+### Author: Sam Banks  ###
+### Mentor: Ping-Ya Chao #
+##########################
+
+# Line of sight test
+
+import random
+import numpy as np
+import visibility
+
+# Returns map with a wall down the middle that has a gap in row 2.
+def setup():
+    board = [["-"] * 7 for i in range(5)]
+    for row in range(5):
+        if row != 2: board[row][3] = "#"
+    return board
+
+def test():
+    board = setup()
+    # Points are (x, y) in cells here, so cell (row, col) is around (col, row).
+    assert(visibility.raycast(board, (1.5, 0.5), (5.5, 0.5), 1, "#") == (0, 3))
+    assert(visibility.raycast(board, (0.5, 2.5), (6.5, 2.5), 1, "#") == None)
+    # Through the corner between two walls.
+    assert(visibility.raycast(board, (2.5, 0.5), (4.5, 2.5), 1, "#") == (0, 3))
+    assert(visibility.raycast(board, (0.5, 0.5), (8.5, 0.5), 1, "#") == (0, 3))
+
+    fieldOfView = visibility.getFieldOfView(board, (2, 0), None, "#")
+    assert((2, 6) in fieldOfView and (0, 6) not in fieldOfView)
+
+    # Checking every ray at once gives the same answers as one at a time.
+    random.seed(112)
+    board = [["#" if random.random() < .2 else "-" for col in range(20)]
+             for row in range(15)]
+    walls = np.array([[cell == "#" for cell in row] for row in board])
+    starts = [(random.uniform(0, 1000), random.uniform(0, 750))
+              for i in range(200)]
+    starts += [(50 * random.randint(0, 20), 50 * random.randint(0, 15))
+               for i in range(50)]
+    for end in starts[:20]:
+        batch = visibility.canSeeBatch(walls, starts, end, 50)
+        for i in range(len(starts)):
+            assert(batch[i] == visibility.canSee(board, starts[i], end, 50, "#"))
+
+    # Looking cells up in a field of view all at once gives the same answers
+    # as looking them up in the set, with points off the board not in it.
+    fieldOfView = visibility.getFieldOfView(board, (7, 10), None, "#")
+    mask = visibility.getFieldOfViewMask(fieldOfView, 15, 20)
+    points = starts + [(-10, 100), (100, -10), (1200, 100), (100, 800)]
+    inView = visibility.isInFieldOfViewBatch(mask, points, 50)
+    for i in range(len(points)):
+        cell = (int(points[i][1]//50), int(points[i][0]//50))
+        assert(inView[i] == (cell in fieldOfView))
+
+    # The visibility table agrees with the exact raycast both ways.
+    table = visibility.VisibilityTable(board, "#")
+    assert(table.build())
+    for start in starts:
+        for end in starts[:20]:
+            assert(table.canSee(start, end, 50) ==
+                   visibility.canSee(board, start, end, 50, "#"))
+    # The center ray from (1, 1) to (0, 5) hits the wall at (1, 4), but rays
+    # from near the cell's top right get over it.
+    board = [list(".#....#..##"), list("...##.....#")]
+    table = visibility.VisibilityTable(board, "#")
+    assert(table.build())
+    assert(table.canSee((1.5, 1.5), (5.5, 0.5)) == False)
+    assert(table.canSee((1.9, 1.1), (5.5, 0.5)) == True)
+    # Tables that can't be built in time aren't used.
+    assert(visibility.makeVisibilityTable(board, "#", maxTime=0) == None)
+
+test()